@@ -17,7 +17,7 @@ class ExcelSaver:
 
     def __init__(self, filepath: str, acc_params: list, snr_params: list, jit_params: list, lin_params: list,
                  num_x_nodes: int, num_y_nodes: int, acc_results=None, snr_results=None, jit_results=None,
-                 lin_results=None, sensor_data=None, conversion_function=None):
+                 lin_results=None, sensor_data=None, conversion_function=None, reset_latencies=None):
         """
         Saves the test data to an excel file.
         Object is disregarded after saving
@@ -35,6 +35,7 @@ class ExcelSaver:
         :param lin_results: linearity results from test manager
         :param sensor_data: sensor related data
         :param conversion_function: function used to convert from robot to screen coordinates
+        :param reset_latencies: seconds each touch controller reset took to come up
 
         :return: None
         """
@@ -76,7 +77,7 @@ class ExcelSaver:
             self.save_snr(book, snr_results, snr_params[5], snr_params[6], num_x_nodes, num_y_nodes)
 
         self.save_final_sheet(book, acc_params=acc_params, snr_params=snr_params, jit_params=jit_params,
-                              lin_params=lin_params, sensor_data=sensor_data)
+                              lin_params=lin_params, sensor_data=sensor_data, reset_latencies=reset_latencies)
 
         book.save(filepath)
 
@@ -1229,7 +1230,7 @@ class ExcelSaver:
         os.remove("lin_image.png")
 
     def save_final_sheet(self, book: xlwt.Workbook, acc_params: list, snr_params: list, jit_params: list,
-                         lin_params: list, sensor_data=None):
+                         lin_params: list, sensor_data=None, reset_latencies=None):
 
         if len(acc_params) != 7 or len(snr_params) != 7 or len(jit_params) != 7 or len(lin_params) != 6:
             raise Exception("Invalid data input into save function")
@@ -1354,6 +1355,24 @@ class ExcelSaver:
             final_sheet.row(row_num).write(uut_desc_col, "Touch Controller:", style=self.bold_style)
             final_sheet.row(row_num).write(uut_col, sensor_data[2])
 
+        # a touch controller that is slow to come up after a reset is worth spotting
+        if reset_latencies:
+            uut_desc_col = 4
+            final_sheet.col(uut_desc_col).width = 256 * 21
+            uut_col = 5
+            row_num = 6
+            final_sheet.row(row_num).write(uut_desc_col, "Controller Resets:", style=self.bold_style)
+            final_sheet.row(row_num).write(uut_col, len(reset_latencies))
+            row_num += 1
+            final_sheet.row(row_num).write(uut_desc_col, "Min Reset Time (ms):", style=self.bold_style)
+            final_sheet.row(row_num).write(uut_col, min(reset_latencies) * 1000)
+            row_num += 1
+            final_sheet.row(row_num).write(uut_desc_col, "Average Reset Time (ms):", style=self.bold_style)
+            final_sheet.row(row_num).write(uut_col, sum(reset_latencies) / len(reset_latencies) * 1000)
+            row_num += 1
+            final_sheet.row(row_num).write(uut_desc_col, "Max Reset Time (ms):", style=self.bold_style)
+            final_sheet.row(row_num).write(uut_col, max(reset_latencies) * 1000)
+
     def snr_print_table(self, start_row: int, start_col: int, core_pf: float, edge_pf: float,
                         core_snr_values: list, edge_snr_values: list, snr_sheet: xlwt.Worksheet, part_name=None,
                         test_iteration=None):
@@ -0,0 +1,331 @@
+import argparse
+import math
+import os
+import select
+import sys
+import threading
+import time
+
+from RobotController import MAX_X, MAX_Y, MAX_Z, MAX_SPEED_XY, MAX_SPEED_Z
+
+# acceleration (mm/sec^2) of the simulated robot's axes
+SIMULATED_ACCELERATION = 1500
+# point to point speed (mm/sec) the simulated robot starts with
+DEFAULT_SPEED = 100
+# seconds the simulated robot takes to answer a command
+RESPONSE_LATENCY = .004
+# seconds the simulated robot takes to start a move, after the move before it ends or after the command if it was idle
+START_DELAY = .01
+# seconds to send one character at 115200 baud (1 start bit, 8 data bits, 1 stop bit)
+CHARACTER_TIME = 10 / 115200
+# seconds the reader thread waits for a command before checking if it should stop
+POLL_INTERVAL = .05
+
+
+def axis_profile(distance: float, speed: float, acceleration: float) -> tuple:
+    """
+    speed profile of one axis moving a distance: it speeds up to its peak speed, holds it, and slows down at the same
+    rate. worked out here from the peak speed rather than taken from the RobotController's motion model, so the model
+    can be checked against it
+
+    :param distance: distance of the whole move (mm)
+    :param speed: top speed (mm/sec)
+    :param acceleration: acceleration (mm/sec^2)
+    :return: peak speed (mm/sec), seconds spent speeding up, and seconds the whole move takes
+    """
+    if distance <= 0:
+        return 0.0, 0.0, 0.0
+    peak = min(speed, math.sqrt(distance * acceleration))  # short moves never reach the top speed
+    ramp = peak / acceleration
+    # speeding up and slowing down cover peak * ramp between them, the rest is covered at the peak speed
+    return peak, ramp, 2 * ramp + (distance - peak * ramp) / peak
+
+
+def ramp_distance(elapsed: float, distance: float, speed: float, acceleration: float) -> float:
+    """
+    distance one axis has travelled partway through a move that accelerates up to a top speed and slows down again
+
+    :param elapsed: seconds since the move started
+    :param distance: distance of the whole move (mm)
+    :param speed: top speed (mm/sec)
+    :param acceleration: acceleration (mm/sec^2)
+    :return: distance travelled (mm)
+    """
+    peak, ramp, duration = axis_profile(distance, speed, acceleration)
+    if elapsed >= duration:
+        return distance
+    if elapsed < ramp:  # speeding up
+        return acceleration * elapsed ** 2 / 2
+    if elapsed > duration - ramp:  # slowing down
+        remaining = duration - elapsed
+        return distance - acceleration * remaining ** 2 / 2
+    return acceleration * ramp ** 2 / 2 + peak * (elapsed - ramp)
+
+
+def format_coordinate(value: float) -> str:
+    """
+    :param value: coordinate (mm)
+    :return: coordinate the way the Fisnar prints it (EX: 30 or 65.3985)
+    """
+    return format(round(value, 4), 'g')
+
+
+class FisnarSimulator:
+    """
+    stands in for a Fisnar F4300N on a pseudo-terminal so the RobotController can run without a robot.
+    answers MA, LA, MAR, LAR, HM, PA and SP the way the robot does, with every move carried out one after the other
+    at the point to point speed
+    """
+
+    def __init__(self, acceleration=SIMULATED_ACCELERATION, speed=DEFAULT_SPEED, latency=RESPONSE_LATENCY,
+                 position=(0.0, 0.0, 0.0), start_delay=START_DELAY):
+        """
+        creates a FisnarSimulator, call start() to open its port
+
+        :param acceleration: acceleration of the axes (mm/sec^2)
+        :param speed: point to point speed the robot starts with (mm/sec)
+        :param latency: seconds the robot takes to answer a command
+        :param position: (x, y, z) position the robot starts at
+        :param start_delay: seconds the robot takes to start each move
+        """
+        if not sys.platform.startswith('linux'):
+            raise EnvironmentError('The Fisnar simulator needs a Linux pseudo-terminal')
+        self.acceleration = acceleration
+        self.latency = latency
+        self.start_delay = start_delay
+        self.port = None  # name of the port to connect to, set by start()
+        self.commands = list()  # every command received, in order
+
+        self._speed = speed
+        self._lock = threading.Lock()
+        # moves the robot was sent: (start time, start position, goal, speed), the last one ends at the goal
+        self._moves = list()
+        self._position = tuple(float(value) for value in position)
+        self._master = None
+        self._slave = None
+        self._thread = None
+        self._stop = threading.Event()
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.stop()
+
+    def get_position(self, now=None) -> tuple:
+        """
+        :param now: monotonic time to get the position at, None for the current time
+        :return: (x, y, z) position of the robot
+        """
+        with self._lock:
+            return self._position_at(time.monotonic() if now is None else now)
+
+    def is_moving(self) -> bool:
+        """
+        :return: bool indicating if the robot still has moves to finish
+        """
+        with self._lock:
+            return bool(self._moves) and time.monotonic() < self._end_time()
+
+    def start(self) -> str:
+        """
+        opens the pseudo-terminal and starts answering commands on it
+
+        :return: name of the port to connect to (EX: /dev/pts/3)
+        """
+        import tty
+
+        self._master, self._slave = os.openpty()
+        tty.setraw(self._slave)  # pass \r\n through untouched
+        self.port = os.ttyname(self._slave)
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._serve, name="FisnarSimulator", daemon=True)
+        self._thread.start()
+        return self.port
+
+    def stop(self) -> None:
+        """
+        stops answering commands and closes the pseudo-terminal
+        :return: None
+        """
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        for fd in (self._master, self._slave):
+            if fd is not None:
+                os.close(fd)
+        self._master = self._slave = None
+
+    def _end_time(self) -> float:
+        """
+        :return: monotonic time the last move the robot was sent finishes
+        """
+        start_time, start, goal, speed = self._moves[-1]
+        return start_time + self._move_time(start, goal, speed)
+
+    def _handle(self, command: str) -> str:
+        """
+        carries out a command
+
+        :param command: command without its line ending (EX: MA 30,30,50)
+        :return: answer to send back
+        """
+        now = time.monotonic()
+        self.commands.append(command)
+        name, _, args = command.strip().partition(" ")
+        name = name.upper()
+        with self._lock:
+            if name == "PA":
+                x, y, z = self._position_at(now)
+                return format_coordinate(x) + "," + format_coordinate(y) + "," + format_coordinate(z) + "\r\nok\r\n"
+            elif name == "SP":
+                try:
+                    self._speed = float(args)
+                except ValueError:
+                    pass
+            elif name == "HM":
+                self._queue_move(now, (0.0, 0.0, 0.0))
+            elif name in ("MA", "LA", "MAR", "LAR"):
+                try:
+                    coordinates = [float(value) for value in args.split(",")]
+                except ValueError:
+                    coordinates = list()
+                if len(coordinates) == 3:
+                    if name.endswith("R"):  # relative to where the robot is after the moves it was already sent
+                        end = self._moves[-1][2] if self._moves else self._position
+                        coordinates = [end[i] + coordinates[i] for i in range(3)]
+                    goal = (min(max(coordinates[0], 0), MAX_X), min(max(coordinates[1], 0), MAX_Y),
+                            min(max(coordinates[2], 0), MAX_Z))
+                    self._queue_move(now, goal)
+        return "ok\r\n"
+
+    def _move_time(self, start: tuple, goal: tuple, speed: float) -> float:
+        """
+        :param start: (x, y, z) position the move starts at
+        :param goal: (x, y, z) position the move ends at
+        :param speed: point to point speed (mm/sec)
+        :return: seconds the move takes (the slower of the XY and Z axes)
+        """
+        distance_xy = math.hypot(goal[0] - start[0], goal[1] - start[1])
+        distance_z = abs(goal[2] - start[2])
+        return max(axis_profile(distance_xy, min(speed, MAX_SPEED_XY), self.acceleration)[2],
+                   axis_profile(distance_z, min(speed, MAX_SPEED_Z), self.acceleration)[2])
+
+    def _position_at(self, now: float) -> tuple:
+        """
+        finds where the robot is, dropping the moves it has finished
+
+        :param now: monotonic time
+        :return: (x, y, z) position of the robot
+        """
+        while self._moves:
+            start_time, start, goal, speed = self._moves[0]
+            if now >= start_time + self._move_time(start, goal, speed):
+                self._position = goal
+                self._moves.pop(0)
+                continue
+            # follow the slower axis' speed profile along the straight line between the positions
+            distance_xy = math.hypot(goal[0] - start[0], goal[1] - start[1])
+            distance_z = abs(goal[2] - start[2])
+            speed_xy = min(speed, MAX_SPEED_XY)
+            speed_z = min(speed, MAX_SPEED_Z)
+            if axis_profile(distance_xy, speed_xy, self.acceleration)[2] >= \
+                    axis_profile(distance_z, speed_z, self.acceleration)[2]:
+                distance, top_speed = distance_xy, speed_xy
+            else:
+                distance, top_speed = distance_z, speed_z
+            if now <= start_time or distance == 0:
+                return start
+            fraction = ramp_distance(now - start_time, distance, top_speed, self.acceleration) / distance
+            return tuple(start[i] + (goal[i] - start[i]) * fraction for i in range(3))
+        return self._position
+
+    def _queue_move(self, now: float, goal: tuple) -> None:
+        """
+        adds a move that starts the start delay after the moves the robot was already sent are finished
+
+        :param now: monotonic time the command was received
+        :param goal: (x, y, z) position the move ends at
+        :return: None
+        """
+        self._position_at(now)
+        if self._moves:
+            start_time, start = self._end_time(), self._moves[-1][2]
+        else:
+            start_time, start = now, self._position
+        self._moves.append((start_time + self.start_delay, start, goal, self._speed))
+
+    def _serve(self) -> None:
+        """
+        reads commands from the pseudo-terminal and answers them, runs on the simulator's thread
+        :return: None
+        """
+        pending = b''
+        while not self._stop.is_set():
+            readable, _, _ = select.select([self._master], [], [], POLL_INTERVAL)
+            if not readable:
+                continue
+            try:
+                pending += os.read(self._master, 1024)
+            except OSError:
+                return  # the port was closed
+            while b'\n' in pending:
+                line, pending = pending.split(b'\n', 1)
+                command = line.decode("utf-8", errors="ignore").strip()
+                if not command:
+                    continue
+                # the command has to arrive over the serial line before the robot can answer it
+                time.sleep(self.latency + len(line) * CHARACTER_TIME)
+                answer = self._handle(command)
+                time.sleep(len(answer) * CHARACTER_TIME)
+                os.write(self._master, answer.encode("utf-8"))
+
+
+def benchmark(num_points: int, touches: int) -> None:
+    """
+    times touching points with the RobotController against a FisnarSimulator and prints the results
+
+    :param num_points: number of points to touch
+    :param touches: touches per point
+    :return: None
+    """
+    from RobotController import RobotController
+
+    with FisnarSimulator() as simulator:
+        robot = RobotController(extra_ports=[simulator.port])
+        robot.set_speed_point_to_point(200)
+
+        start = time.perf_counter()
+        robot.move_home()
+        print("move_home".ljust(24) + (str(round((time.perf_counter() - start) * 1000, 1)) + " ms").rjust(12))
+
+        start = time.perf_counter()
+        for i in range(num_points):
+            x, y = 20 + 15 * (i % 8), 20 + 15 * (i // 8)
+            robot.move(x, y, 40, is_continuous=False)
+            robot.tap(x, y, 50, 40, count=touches)
+        elapsed = time.perf_counter() - start
+        print("tap".ljust(24) + (str(round(elapsed * 1000, 1)) + " ms").rjust(12) +
+              (str(len(simulator.commands)) + " commands").rjust(16))
+        print("calibrated acceleration: " + format(robot.get_motion_model().get_acceleration(), ".0f") +
+              " mm/sec^2 (simulated " + str(simulator.acceleration) + ")")
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="simulate a Fisnar F4300N on a pseudo-terminal")
+    parser.add_argument("--benchmark", action="store_true", help="time the RobotController against the simulator")
+    parser.add_argument("--points", type=int, default=16, help="points touched by the benchmark")
+    parser.add_argument("--touches", type=int, default=3, help="touches per point in the benchmark")
+    args = parser.parse_args()
+    if args.benchmark:
+        benchmark(args.points, args.touches)
+    else:
+        with FisnarSimulator() as sim:
+            print("simulated Fisnar F4300N on " + sim.port + " (Ctrl+C to stop)")
+            try:
+                while True:
+                    time.sleep(1)
+            except KeyboardInterrupt:
+                pass
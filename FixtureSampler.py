@@ -0,0 +1,176 @@
+import queue
+import threading
+import time
+
+from errors import *
+from TouchController import find_all_touch_controllers
+
+
+class FixtureSampler:
+    """
+    samples every touch controller in a multi-DUT fixture at the same time, with one worker thread per controller.
+    each fixture slot gets its own stream: a queue of (timestamp in ns, sample) tuples that ends with None
+    """
+
+    def __init__(self, touch_controllers: list, slots=None):
+        """
+        creates a FixtureSampler
+
+        :param touch_controllers: TouchControllers in the fixture (EX: from find_all_touch_controllers())
+        :param slots: dictionary with slot names as keys and (bus, port numbers) USB locations as values,
+                      None to number the slots 0, 1, 2... in USB location order
+        :raises: InvalidInput if no controller is plugged into a slot's location
+        """
+        controllers = sorted(touch_controllers, key=lambda tc: tc.get_usb_location())
+        if slots is None:
+            slots = {i: tc.get_usb_location() for i, tc in enumerate(controllers)}
+
+        by_location = {tc.get_usb_location(): tc for tc in controllers}
+        self._touch_controllers = dict()
+        for slot, location in slots.items():
+            location = (location[0], tuple(location[1]))
+            if location not in by_location:
+                raise InvalidInput("No touch controller is plugged into slot " + str(slot) +
+                                   " (bus " + str(location[0]) + ", ports " + str(location[1]) + ")")
+            self._touch_controllers[slot] = by_location[location]
+
+        self._streams = dict()
+        self._errors = dict()
+        self._threads = list()
+        self._stop = threading.Event()
+
+    @classmethod
+    def from_fixture(cls, slots=None, controller_name="Microchip ATMXT1066T2", known=None):
+        """
+        creates a FixtureSampler for every connected controller
+
+        :param slots: dictionary with slot names as keys and (bus, port numbers) USB locations as values
+        :param controller_name: name of the touch controller to look for
+        :param known: TouchControllers that are already connected (EX: the TestManager's), reused in their slots
+        :return: FixtureSampler
+        """
+        return cls(find_all_touch_controllers(controller_name, known), slots)
+
+    def collect(self) -> dict:
+        """
+        waits for every worker to finish and empties the streams
+
+        :return: dictionary with slot names as keys and lists of (timestamp in ns, sample) tuples as values
+        """
+        ret = dict()
+        for slot, stream in self._streams.items():
+            ret[slot] = list()
+            while True:
+                item = stream.get()
+                if item is None:
+                    break
+                ret[slot].append(item)
+        self._join()
+        return ret
+
+    def get_errors(self) -> dict:
+        """
+        :return: dictionary with slot names as keys and the errors that stopped their workers as values
+        """
+        return dict(self._errors)
+
+    def get_slots(self) -> list:
+        """
+        :return: list of slot names
+        """
+        return list(self._touch_controllers.keys())
+
+    def get_stream(self, slot):
+        """
+        :param slot: slot name
+        :return: queue of (timestamp in ns, sample) tuples, None is put in the queue when the worker finishes
+        """
+        return self._streams[slot]
+
+    def get_touch_controller(self, slot):
+        """
+        :param slot: slot name
+        :return: TouchController in the slot
+        """
+        return self._touch_controllers[slot]
+
+    def is_sampling(self) -> bool:
+        """
+        :return: bool indicating if any worker is still sampling
+        """
+        return any(thread.is_alive() for thread in self._threads)
+
+    def start(self, sample, iterations=0, interval=0.0) -> dict:
+        """
+        starts sampling every controller on its own worker thread
+
+        :param sample: function that takes a TouchController and returns a sample (EX: lambda tc: tc.get_delta_frame())
+        :param iterations: samples to take from each controller, 0 to sample until stop() is called
+        :param interval: seconds to wait between samples
+        :return: dictionary with slot names as keys and their streams as values
+        """
+        if self.is_sampling():
+            raise RuntimeError("The fixture is already being sampled.")
+        self._join()
+
+        self._stop.clear()
+        self._errors = dict()
+        self._streams = {slot: queue.Queue() for slot in self._touch_controllers}
+        for slot in self._touch_controllers:
+            thread = threading.Thread(target=self._sample_loop, args=(slot, sample, iterations, interval),
+                                      name="FixtureSampler " + str(slot), daemon=True)
+            self._threads.append(thread)
+            thread.start()
+        return dict(self._streams)
+
+    def start_delta_frames(self, iterations=0, interval=0.0) -> dict:
+        """
+        starts reading delta frames from every controller
+
+        :param iterations: frames to read from each controller, 0 to read until stop() is called
+        :param interval: seconds to wait between frames
+        :return: dictionary with slot names as keys and their streams as values
+        """
+        return self.start(lambda tc: tc.get_delta_frame(), iterations, interval)
+
+    def stop(self) -> None:
+        """
+        stops every worker and waits for them to finish
+        :return: None
+        """
+        self._stop.set()
+        self._join()
+
+    def _join(self) -> None:
+        """
+        waits for every worker thread to finish
+        :return: None
+        """
+        for thread in self._threads:
+            thread.join()
+        self._threads = list()
+
+    def _sample_loop(self, slot, sample, iterations: int, interval: float) -> None:
+        """
+        samples a controller until enough samples are taken or the sampler is stopped, runs on a worker thread
+
+        :param slot: slot name
+        :param sample: function that takes a TouchController and returns a sample
+        :param iterations: samples to take, 0 to sample until stopped
+        :param interval: seconds to wait between samples
+        :return: None
+        """
+        touch_controller = self._touch_controllers[slot]
+        stream = self._streams[slot]
+        count = 0
+        try:
+            while not self._stop.is_set() and (iterations == 0 or count < iterations):
+                data = sample(touch_controller)
+                stream.put((time.monotonic_ns(), data))
+                count += 1
+                if interval:
+                    self._stop.wait(interval)
+        except Exception as e:  # any error would otherwise end the thread silently
+            self._errors[slot] = e  # one failing sensor doesn't stop the rest of the fixture
+        finally:
+            stream.put(None)
@@ -236,6 +236,13 @@ class MainFrame(Frame):
         robot_menu.AppendSeparator()
         menu_parameters = robot_menu.Append(ID_PROPERTIES, "&Parameters for test", " Select parameters for tests")
         self.Bind(EVT_MENU, self.on_select_parameters, menu_parameters)
+        robot_menu.AppendSeparator()
+        menu_hover = robot_menu.Append(ID_ANY, "Set &hover clearance",
+                                       "Set how far above the part the finger lifts between touches")
+        self.Bind(EVT_MENU, self.on_set_hover_clearance, menu_hover)
+        menu_map_surface = robot_menu.Append(ID_ANY, "&Map part surface",
+                                             "Probe the height of the part's surface before touching it")
+        self.Bind(EVT_MENU, self.on_map_surface, menu_map_surface)
 
         # set up hardware menu
         hardware_menu = Menu()
@@ -247,6 +254,14 @@ class MainFrame(Frame):
                                                             "Select TouchController to read in data from the touch"
                                                             " screen.")
         self.Bind(EVT_MENU, self.on_change_touch_controller, menu_change_touch_controller)
+        hardware_menu.AppendSeparator()
+        menu_fixture_noise = hardware_menu.Append(ID_ANY, "Fixture &noise test",
+                                                  "Read the noise of every part in a multi-part fixture at once")
+        self.Bind(EVT_MENU, self.on_fixture_noise_test, menu_fixture_noise)
+        hardware_menu.AppendSeparator()
+        self._raw_rate_item = hardware_menu.AppendCheckItem(ID_ANY, "Ra&w-rate touch sampling",
+                                                            "Turn off the touch controller's power saving and "
+                                                            "filtering during the jitter and linearity tests")
 
         # prepare menuBar to be added to frame
         menubar = MenuBar()
@@ -447,7 +462,7 @@ class MainFrame(Frame):
         :param e: event causing this method to be called
         :return: None
         """
-        controllers = ["Microchip ATMXT1066T2"]  # add touch controller name to this list if new robot is used
+        controllers = list(TOUCH_DRIVERS)  # register a TouchDriver in TouchController to add a controller here
         dlg = SingleChoiceDialog(parent=self, message="Select Touch Controller", caption="Select Touch Controller:",
                                  choices=controllers)
         dlg.ShowModal()
@@ -461,6 +476,37 @@ class MainFrame(Frame):
         """
         self.Close(True)  # close the program
 
+    def on_fixture_noise_test(self, e) -> None:
+        """
+        reads the noise of every touch controller plugged into the fixture at the same time and lists it by slot
+        :param e: event causing this method to be called
+        :return: None
+        """
+        self.SetStatusText("Reading the noise of every part in the fixture...")
+        try:
+            with BusyCursor():
+                results = self.test_manager.fixture_noise_test()
+        except (errors.NoDeviceError, errors.InvalidInput, usb.USBError) as err:
+            dlg = MessageDialog(self, "Could not find the fixture's touch controllers.\n\n" + str(err),
+                                "Fixture Noise Test Failed")
+            dlg.ShowModal()
+            dlg.Destroy()
+            return
+
+        slots = self.test_manager.get_fixture_slots()
+        msg = ""
+        for slot, result in results.items():
+            bus, ports = slots[slot]
+            msg += "Slot " + str(slot) + " (bus " + str(bus) + ", ports " + str(ports) + "): "
+            if isinstance(result, Exception):
+                msg += "failed (" + str(result) + ")\n"
+            else:
+                msg += "noise " + str(result) + "\n"
+        self.SetStatusText("Fixture noise test done")
+        dlg = MessageDialog(self, msg, "Fixture Noise Test", OK)
+        dlg.ShowModal()
+        dlg.Destroy()
+
     def on_help(self, e) -> None:
         """
         lists potential problems and how to fix them
@@ -495,6 +541,39 @@ class MainFrame(Frame):
             dlg.ShowModal()
             dlg.Destroy()
 
+    def on_map_surface(self, e) -> None:
+        """
+        probes the surface of the oriented part so every touch after presses relative to it instead of the Z start
+        :param e: event causing this method to be called
+        :return: None
+        """
+        if not (self._dxf_is_uploaded and self._config_is_uploaded and self._robot_controller.is_oriented()):
+            dlg = MessageDialog(self, "Upload a DXF file and a configuration file and run the tests once to orient "
+                                      "the robot before mapping the part's surface.", "Cannot Map Surface")
+            dlg.ShowModal()
+            dlg.Destroy()
+            return
+
+        self.SetStatusText("Mapping the surface of the part...")
+        try:
+            with BusyCursor():
+                lowest, highest = self.test_manager.map_surface().get_range()
+        except TimeoutError:
+            dlg = MessageDialog(self, "TimeoutError occurred\n\nMake sure you are connected to the right COM Port.",
+                                "Unable to Communicate with the robot.")
+            dlg.ShowModal()
+            dlg.Destroy()
+            return
+        except errors.NoInputFromController as err:
+            self.SetStatusText("Surface not found, touching at the Z start")
+            dlg = MessageDialog(self, str(err) + "\n\nTouches will press down to the Z start.",
+                                "Surface Not Found")
+            dlg.ShowModal()
+            dlg.Destroy()
+            return
+
+        self.SetStatusText("Surface mapped between Z " + str(lowest) + " and Z " + str(highest))
+
     def on_move_robot(self, e, debug=False) -> None:
         """
         moves the robot based on the button pressed (top left of window)
@@ -684,9 +763,11 @@ class MainFrame(Frame):
                             if not run_failed:
                                 try:
                                     large_read = self._5x5_rb.GetValue() and not self._3x3_rb.GetValue()
+                                    raw_rate = self._raw_rate_item.IsChecked()
                                     tests_ran_successfully = self.test_manager.run_tests(tests, progress_dlg,
                                                                                          part_name=part_name,
-                                                                                         is_large_read=large_read)
+                                                                                         is_large_read=large_read,
+                                                                                         raw_rate=raw_rate)
                                     can_save = True
                                 except ImportError:
                                     run_failed = is_import_issue = True
@@ -748,6 +829,27 @@ class MainFrame(Frame):
             dlg.ShowModal()
             dlg.Destroy()
 
+    def on_set_hover_clearance(self, e):
+        """
+        sets how far above the part's mapped surface the finger is lifted between touches
+        :param e: event causing this method to be called
+        :return: None
+        """
+        dlg = TextEntryDialog(self, "Hover clearance above the surface (mm):", "Set Hover Clearance",
+                              str(self.test_manager.get_hover_clearance()))
+        if dlg.ShowModal() == ID_OK:
+            try:
+                clearance = float(dlg.GetValue())
+                if clearance <= 0:
+                    raise ValueError
+                self.test_manager.set_hover_clearance(clearance)
+                self.SetStatusText("Hover clearance set to " + str(clearance) + " mm")
+            except ValueError:
+                err_dlg = MessageDialog(self, "Hover clearance must be a positive number.", "Invalid Input")
+                err_dlg.ShowModal()
+                err_dlg.Destroy()
+        dlg.Destroy()
+
     def on_successful_config(self):
         """
         method called when a successful configuration is uploaded
@@ -0,0 +1,399 @@
+import argparse
+import array
+import threading
+import time
+
+import numpy as np
+import usb.core
+
+
+# the simulated controller's object table
+# (object type, address, size, instances, report IDs per instance)
+SIMULATED_OBJECTS = [(37, 0x0106, 130, 1, 0), (44, 0x0188, 1, 1, 0), (5, 0x0189, 11, 1, 0), (6, 0x0194, 6, 1, 1),
+                     (7, 0x019A, 4, 1, 0), (8, 0x019E, 15, 1, 0), (68, 0x0200, 10, 1, 1), (15, 0x0210, 10, 1, 1),
+                     (19, 0x0220, 10, 1, 1), (25, 0x0230, 10, 1, 1), (46, 0x0240, 10, 1, 1), (56, 0x0250, 10, 1, 1),
+                     (61, 0x0260, 5, 6, 1), (65, 0x0280, 10, 3, 1), (70, 0x02A0, 10, 20, 1), (72, 0x0370, 10, 1, 1),
+                     (80, 0x0380, 10, 1, 1), (93, 0x0390, 10, 1, 1), (97, 0x03A0, 10, 4, 1), (99, 0x03D0, 10, 4, 1),
+                     (100, 0x06FC, 60, 1, 18)]
+# family, variant, firmware version and build of the simulated controller
+SIMULATED_ID = [0xA6, 0x13, 0x10, 0xAA]
+MEMORY_SIZE = 0x0800
+RESPONSE_SIZE = 64
+# T7 IDLEACQINT, ACTVACQINT (ms between acquisitions, 0xFF is free run) and ACTV2IDLETO the device boots with
+SIMULATED_T7_CONFIG = [32, 10, 50]
+# T100 MOVFILTER, MOVSMOOTH, MOVPRED (1 byte each), MOVHYSTI and MOVHYSTN (2 bytes each) the device boots with
+SIMULATED_T100_MOVEMENT_CONFIG = [0x4E, 0xD2, 0x00, 0x06, 0x00, 0x02, 0x00]
+# delta added to the node under an injected touch
+TOUCH_DELTA = 300
+NOISE_MODELS = ('gaussian', 'uniform', 'none')
+# diagnostic modes written to the T6 object
+DELTA_MODE = 0x10
+REFERENCE_MODE = 0x11
+SIGNAL_MODE = 0x12
+
+
+def object_table_crc(data: bytes) -> int:
+    """
+    calculates the 24 bit CRC the maXTouch controller stores after its object table
+
+    :param data: information block and object table
+    :return: CRC of the data
+    """
+    crc = 0
+    if len(data) % 2:
+        data = bytes(data) + b'\x00'
+    for i in range(0, len(data), 2):
+        word = (data[i + 1] << 8) | data[i]
+        crc = (crc << 1) ^ word
+        if crc & 0x1000000:
+            crc ^= 0x80001B
+    return crc & 0xFFFFFF
+
+
+class SimulatedMaxTouchDevice:
+    """
+    stands in for the pyusb Device of a maXTouch controller so the TouchController can run without hardware.
+    implements the write(0x02, ...) / read(0x81, 64, ...) protocol for the information block, object table,
+    T5 messages, T6 reset and diagnostic commands, T37 paging, T44 message count and T100 ranges
+    """
+
+    def __init__(self, num_x_nodes=32, num_y_nodes=20, latency=0.0, noise=2.0, noise_model='gaussian',
+                 x_range=4095, y_range=2559, seed=0, bus=1, port_numbers=(1,), reset_time=0.0,
+                 timeout_rate=0.0):
+        """
+        creates a SimulatedMaxTouchDevice
+
+        :param num_x_nodes: number of nodes in the X direction
+        :param num_y_nodes: number of nodes in the Y direction
+        :param latency: seconds each USB transaction (a write and a read) takes
+        :param noise: size of the noise added to the deltas (standard deviation for gaussian, limit for uniform)
+        :param noise_model: 'gaussian', 'uniform' or 'none'
+        :param x_range: X range stored in the T100 object
+        :param y_range: Y range stored in the T100 object
+        :param seed: seed of the random numbers used for the baseline, references and noise
+        :param bus: USB bus number the device reports
+        :param port_numbers: USB port numbers the device reports
+        :param reset_time: seconds after a reset before the device sends its reset messages
+        :param timeout_rate: chance (0 to 1) of a read timing out, with its response arriving late
+        """
+        if noise_model not in NOISE_MODELS:
+            raise ValueError("noise_model must be one of " + str(NOISE_MODELS))
+        self.num_x_nodes = num_x_nodes
+        self.num_y_nodes = num_y_nodes
+        self.latency = latency
+        self.noise = noise
+        self.noise_model = noise_model
+        self.bus = bus
+        self.port_numbers = port_numbers
+        self.reset_time = reset_time
+        self.timeout_rate = timeout_rate
+        self.transactions = 0  # number of writes to the device (each write is followed by a read)
+
+        self._lock = threading.Lock()
+        self._random = np.random.RandomState(seed)
+        self._memory = bytearray(MEMORY_SIZE)
+        self._messages = list()
+        self._ready_time = 0.0  # messages are held back until this time while the device resets
+        self._response = bytes(RESPONSE_SIZE)
+        self._touch_node = None
+        self._held_touch = None  # (x, y, seconds between reports) of a touch held on the screen
+        self._next_report_time = 0.0
+        self._mode = 0
+        self._page = 0
+        self._frame = None
+        self._objects = dict()  # object type -> (address, size, first report ID)
+
+        report_id = 1
+        for obj_type, address, size, instances, num_ids in SIMULATED_OBJECTS:
+            self._objects[obj_type] = (address, size, report_id if num_ids else 0)
+            report_id += num_ids * instances
+
+        # information block, object table and CRC at the start of memory
+        info = bytes(SIMULATED_ID + [num_x_nodes, num_y_nodes, len(SIMULATED_OBJECTS)])
+        table = bytearray()
+        for obj_type, address, size, instances, num_ids in SIMULATED_OBJECTS:
+            table.extend([obj_type, address & 0xFF, address >> 8, size - 1, instances - 1, num_ids])
+        crc = object_table_crc(info + table)
+        block = info + table + crc.to_bytes(3, 'little')
+        self._memory[:len(block)] = block
+
+        t100 = self._objects[100][0]
+        self._memory[t100 + 13:t100 + 15] = x_range.to_bytes(2, 'little')
+        self._memory[t100 + 24:t100 + 26] = y_range.to_bytes(2, 'little')
+        self._memory[t100 + 44:t100 + 44 + len(SIMULATED_T100_MOVEMENT_CONFIG)] = SIMULATED_T100_MOVEMENT_CONFIG
+        t7 = self._objects[7][0]
+        self._memory[t7:t7 + len(SIMULATED_T7_CONFIG)] = SIMULATED_T7_CONFIG
+        self._nvm = bytes(self._memory)  # configuration a reset goes back to, like the controller's NVM
+
+        self.baseline = self._random.randint(-5, 5, (num_x_nodes, num_y_nodes))
+        self.references = self._random.randint(14000, 16000, (num_x_nodes, num_y_nodes))
+
+    def get_report_id(self, obj_type: int) -> int:
+        """
+        :param obj_type: object type (EX: 100 for T100)
+        :return: first report ID of the object
+        """
+        return self._objects[obj_type][2]
+
+    def hold_touch(self, x: int, y: int, report_rate=200.0) -> None:
+        """
+        holds a touch on the screen, which sends a MOVE message at the report rate until release_touch() is called
+
+        :param x: X coordinate of the touch
+        :param y: Y coordinate of the touch
+        :param report_rate: messages sent per second
+        :return: None
+        """
+        with self._lock:
+            self._held_touch = (x, y, 1 / report_rate)
+            self._next_report_time = time.monotonic()
+
+    def inject_touch(self, x: int, y: int, node=None, num_reports=5) -> None:
+        """
+        queues the T100 messages of a touch going down, moving and going up at a coordinate
+
+        :param x: X coordinate of the touch
+        :param y: Y coordinate of the touch
+        :param node: (x, y) node the touch raises the delta of, None to leave the deltas alone
+        :param num_reports: number of messages the touch creates
+        :return: None
+        """
+        touch_id = self._objects[100][2] + 2  # first two T100 report IDs are screen status and reserved
+        with self._lock:
+            for i in range(num_reports):
+                if i == 0:
+                    event = 4  # DOWN
+                elif i == num_reports - 1:
+                    event = 5  # UP
+                else:
+                    event = 1  # MOVE
+                self._messages.append([touch_id, 0x80 | event, x & 0xFF, x >> 8, y & 0xFF, y >> 8, 30, 12, 0, 0])
+            self._touch_node = node
+
+    def read(self, endpoint: int, size_or_buffer, timeout=None):
+        """
+        returns the response to the last write
+
+        :param endpoint: endpoint to read from (ignored)
+        :param size_or_buffer: number of bytes to read, or a buffer to read into
+        :param timeout: timeout (ms) (ignored)
+        :return: array of the response, or the number of bytes read into the buffer
+        """
+        if self.latency:
+            time.sleep(self.latency)
+        if self.timeout_rate and self._random.random_sample() < self.timeout_rate:
+            # the response stays queued, so it's returned by the next read
+            raise usb.core.USBTimeoutError("Operation timed out")
+        with self._lock:
+            response = self._response
+            self._response = bytes(RESPONSE_SIZE)
+        if isinstance(size_or_buffer, int):
+            return array.array('B', response[:size_or_buffer])
+        memoryview(size_or_buffer)[:len(response)] = response
+        return len(response)
+
+    def release_touch(self) -> None:
+        """
+        lifts the touch held by hold_touch()
+        :return: None
+        """
+        with self._lock:
+            self._held_touch = None
+
+    def set_configuration(self) -> None:
+        """
+        the simulated device only has one configuration
+        :return: None
+        """
+        pass
+
+    def write(self, endpoint: int, data, timeout=None) -> int:
+        """
+        handles a read or write command
+
+        :param endpoint: endpoint to write to (ignored)
+        :param data: command (EX: [0x51, NumWx, NumRx, address low byte, address high byte, data...])
+        :param timeout: timeout (ms) (ignored)
+        :return: number of bytes written
+        """
+        data = bytes(data)
+        num_wx = data[1]
+        num_rx = data[2]
+        address = data[3] | (data[4] << 8)
+        payload = data[5:3 + num_wx]
+        with self._lock:
+            self.transactions += 1
+            if payload:
+                for i, value in enumerate(payload):
+                    self._write_byte(address + i, value)
+                self._response = bytes([0x04]) + bytes(RESPONSE_SIZE - 1)
+            else:
+                ans = self._read_memory(address, num_rx)
+                self._response = bytes([0x00, num_rx]) + ans + bytes(RESPONSE_SIZE - 2 - len(ans))
+        return len(data)
+
+    def _capture_frame(self) -> None:
+        """
+        captures a new set of deltas, references or signals (depending on the diagnostic mode) for the T37 object
+        :return: None
+        """
+        if self._mode == REFERENCE_MODE:
+            self._frame = self.references.astype('<u2').tobytes()
+            return
+
+        if self.noise_model == 'gaussian':
+            noise = self._random.normal(0, self.noise, self.baseline.shape)
+        elif self.noise_model == 'uniform':
+            noise = self._random.uniform(-self.noise, self.noise, self.baseline.shape)
+        else:
+            noise = np.zeros(self.baseline.shape)
+        frame = self.baseline + noise
+        if self._touch_node is not None:
+            frame[self._touch_node] += TOUCH_DELTA
+        if self._mode == SIGNAL_MODE:
+            # a touch lowers the signal, the delta is how far the signal is below the reference
+            self._frame = np.clip(np.rint(self.references - frame), 0, 0xFFFF).astype('<u2').tobytes()
+        else:
+            self._frame = np.rint(frame).astype('<i2').tobytes()
+
+    def _read_memory(self, address: int, num_bytes: int) -> bytes:
+        """
+        reads the memory of the device, popping a message out of the queue for every read of the T5 object
+
+        :param address: address to start reading at
+        :param num_bytes: number of bytes to read
+        :return: bytes read
+        """
+        t44 = self._objects[44][0]
+        t5, t5_size, _ = self._objects[5]
+        ready = time.monotonic() >= self._ready_time
+        self._queue_held_touch_reports()
+        ans = bytearray()
+        index = address
+        while index < address + num_bytes:
+            if index == t44:
+                ans.append(min(len(self._messages), 255) if ready else 0)
+                index += 1
+            elif index == t5:
+                # reading past the end of a message continues with the next message
+                while index < address + num_bytes:
+                    length = min(t5_size - 1, address + num_bytes - index)
+                    if self._messages and ready:
+                        message = self._messages.pop(0)
+                    else:
+                        message = [0xFF] + [0] * (t5_size - 2)  # report ID 0xFF means there's no message
+                    ans.extend(bytes(message[:length]))
+                    index += length
+            else:
+                ans.append(self._memory[index])
+                index += 1
+        return bytes(ans)
+
+    def _queue_held_touch_reports(self) -> None:
+        """
+        queues the messages the held touch sent since the last time the messages were read
+        :return: None
+        """
+        if self._held_touch is None:
+            return
+        x, y, period = self._held_touch
+        active_interval = self._memory[self._objects[7][0] + 1]
+        if active_interval != 0xFF:  # outside of free run the touch is reported at most once per acquisition
+            period = max(period, active_interval / 1000)
+        touch_id = self._objects[100][2] + 2
+        now = time.monotonic()
+        while self._next_report_time <= now:
+            if len(self._messages) < 255:  # the controller's message buffer is full, the report is lost
+                self._messages.append([touch_id, 0x81, x & 0xFF, x >> 8, y & 0xFF, y >> 8, 30, 12, 0, 0])
+            self._next_report_time += period
+
+    def _update_t37(self) -> None:
+        """
+        updates the mode, page and data of the T37 object
+        :return: None
+        """
+        t37, t37_size, _ = self._objects[37]
+        page_size = t37_size - 2
+        data = bytearray(page_size)
+        if self._mode and self._frame is not None:
+            chunk = self._frame[self._page * page_size:(self._page + 1) * page_size]
+            data[:len(chunk)] = chunk
+        self._memory[t37] = self._mode
+        self._memory[t37 + 1] = self._page
+        self._memory[t37 + 2:t37 + t37_size] = data
+
+    def _write_byte(self, address: int, value: int) -> None:
+        """
+        writes a byte to the memory of the device and carries out any command it triggers
+
+        :param address: address to write to
+        :param value: value to write
+        :return: None
+        """
+        t6, _, t6_report_id = self._objects[6]
+        self._memory[address] = value
+        if address == t6 and value:  # reset
+            self._memory[:] = self._nvm  # changes that weren't backed up are lost
+            self._messages = [[t6_report_id, status] + [0] * 8 for status in (0x80, 0x10, 0x00)]
+            self._ready_time = time.monotonic() + self.reset_time
+            self._mode = 0
+            self._page = 0
+            self._memory[address] = 0
+            self._update_t37()
+        elif address == t6 + 5:  # diagnostic
+            if value == 0x01:
+                self._page += 1
+            elif value == 0x02:
+                self._page = max(self._page - 1, 0)
+            elif value == 0x00:
+                self._mode = 0
+                self._page = 0
+            else:
+                self._mode = value
+                self._page = 0
+                self._capture_frame()
+            self._memory[address] = 0
+            self._update_t37()
+
+
+def benchmark(latency: float, iterations: int, num_touches: int) -> None:
+    """
+    times the TouchController against a SimulatedMaxTouchDevice and prints the results
+
+    :param latency: seconds each simulated USB transaction takes
+    :param iterations: iterations of the SNR reads
+    :param num_touches: number of touches read by read_all_points
+    :return: None
+    """
+    from TouchController import TouchController
+
+    device = SimulatedMaxTouchDevice(latency=latency)
+
+    def run(name, function):
+        start_transactions = device.transactions
+        start = time.perf_counter()
+        ret = function()
+        elapsed = time.perf_counter() - start
+        print(name.ljust(24) + (str(round(elapsed * 1000, 2)) + " ms").rjust(12) +
+              (str(device.transactions - start_transactions) + " transactions").rjust(20))
+        return ret
+
+    touch_controller = run("constructor", lambda: TouchController(device=device))
+    touch_controller.update_number_of_nodes(device.num_x_nodes, device.num_y_nodes)
+    run("nine_point_read", lambda: touch_controller.nine_point_read(5, 5, iterations, 0))
+    run("twenty_five_point_read", lambda: touch_controller.twenty_five_point_read(5, 5, iterations, 0))
+    run("get_delta_frame", touch_controller.get_delta_frame)
+
+    for i in range(num_touches):
+        device.inject_touch(100 + i, 200 + i, num_reports=1)
+    points = run("read_all_points", touch_controller.read_all_points)
+    print(str(len(points)) + " of " + str(num_touches) + " touches read")
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="benchmark the TouchController against a simulated maXTouch")
+    parser.add_argument("--latency", type=float, default=0.0, help="seconds per USB transaction")
+    parser.add_argument("--iterations", type=int, default=10, help="iterations of the SNR reads")
+    parser.add_argument("--touches", type=int, default=100, help="touches read by read_all_points")
+    args = parser.parse_args()
+    benchmark(args.latency, args.iterations, args.touches)
@@ -7,10 +7,13 @@
 #                                         #
 ###########################################
 
+import os
 import sys
 import glob
+import json
 import time
 import math
+from concurrent.futures import ThreadPoolExecutor, as_completed
 
 import serial
 
@@ -34,6 +37,33 @@ MAX_Z = 100
 MAX_SPEED_XY = 800
 MAX_SPEED_Z = 320
 
+# seconds to wait for the robot to answer a position request
+# (the answer is read line by line, so this is only reached if the robot stops responding)
+POSITION_RESPONSE_TIMEOUT = 2
+# acknowledgement the robot sends after every command
+ACK = "ok"
+
+# seconds a port has to answer PA before it's decided there is no robot on it
+PORT_PROBE_TIMEOUT = .5
+# number of ports opened or probed at the same time
+PORT_PROBE_WORKERS = 32
+# file the port the robot was last found on is saved in, so it's tried first on the next launch.
+# kept next to this file so it's found no matter which directory the program is started from
+LAST_PORT_CACHE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "last_robot_port.json")
+
+# acceleration (mm/sec^2) the motion model starts with, and the limits of its calibration
+DEFAULT_ACCELERATION = 1000
+MIN_ACCELERATION = 100
+MAX_ACCELERATION = 20000
+# seconds between a move command being sent and the robot starting to move
+MOVE_OVERHEAD = .02
+# weight of each timed move in the motion model's acceleration
+CALIBRATION_WEIGHT = .2
+# fraction of the predicted move time wait_for_move sleeps before it starts polling the position
+PREDICTED_SLEEP_FRACTION = .9
+# number of timed moves kept in the move log
+MOVE_LOG_SIZE = 256
+
 
 def get_index_of_value(ls: list, val):
     """
@@ -53,9 +83,11 @@ def get_index_of_value(ls: list, val):
     return -1
 
 
-def serial_ports():
+def serial_ports(extra_ports=None):
     """ Gets a list of all potential serial ports
 
+        :param extra_ports:
+            ports to check before the system's ports (EX: the port of a FisnarSimulator)
         :raises EnvironmentError:
             On unsupported or unknown platforms
         :returns:
@@ -70,16 +102,101 @@ def serial_ports():
         ports = glob.glob('/dev/tty.*')
     else:
         raise EnvironmentError('Unsupported platform')
+    if extra_ports:
+        ports = list(extra_ports) + [port for port in ports if port not in extra_ports]
 
-    result = []
-    for port in ports:
+    def can_open(port):
         try:
             s = serial.Serial(port)
             s.close()
-            result.append(port)
+            return True
         except (OSError, serial.SerialException):
-            pass
-    return result
+            return False
+
+    # try the ports at the same time, opening a missing port can take a while on some platforms
+    with ThreadPoolExecutor(max_workers=PORT_PROBE_WORKERS) as pool:
+        openable = list(pool.map(can_open, ports))
+    return [port for port, is_openable in zip(ports, openable) if is_openable]
+
+
+def probe_robot_port(port: str, timeout=PORT_PROBE_TIMEOUT) -> bool:
+    """
+    checks if a Fisnar is on a port by asking it where it is (PA doesn't move the robot)
+    :param port: name of the port
+    :param timeout: seconds the robot has to answer
+    :return: bool indicating if coordinates came back
+    """
+    deadline = time.monotonic() + timeout
+    try:
+        with serial.Serial(port, baudrate=115200, timeout=timeout, write_timeout=timeout) as s:
+            s.reset_input_buffer()
+            s.write(bytes("PA\r\n", "utf-8"))
+            while time.monotonic() < deadline:
+                s.timeout = max(deadline - time.monotonic(), 0)
+                line = s.readline()
+                if not line:
+                    break
+                try:
+                    if len([float(value) for value in line.decode("utf-8", errors="ignore").split(",")]) == 3:
+                        return True
+                except ValueError:
+                    continue  # an ack, or a device that isn't a Fisnar
+    except (OSError, serial.SerialException):
+        pass
+    return False
+
+
+def load_last_port(filepath=LAST_PORT_CACHE):
+    """
+    :param filepath: path of the cache file
+    :return: name of the port the robot was last found on, None if it isn't known
+    """
+    try:
+        with open(filepath, 'r') as f:
+            return json.load(f).get("port")
+    except (OSError, ValueError, AttributeError):
+        return None
+
+
+def save_last_port(port: str, filepath=LAST_PORT_CACHE) -> None:
+    """
+    saves the port the robot was found on so it's tried first on the next launch
+    :param port: name of the port
+    :param filepath: path of the cache file
+    :return: None
+    """
+    try:
+        with open(filepath, 'w') as f:
+            json.dump({"port": port}, f)
+    except OSError:
+        pass  # the cache only speeds up startup, not being able to save it is fine
+
+
+def find_robot_port(ports: list, timeout=PORT_PROBE_TIMEOUT, cache_path=LAST_PORT_CACHE):
+    """
+    finds the port a Fisnar is on, trying the port it was last found on before probing the rest at the same time
+    :param ports: names of the ports to check (EX: from serial_ports())
+    :param timeout: seconds each port has to answer
+    :param cache_path: path of the file the last port is saved in
+    :return: name of the port the robot answered on, None if it wasn't found
+    """
+    last_port = load_last_port(cache_path)
+    if last_port in ports and probe_robot_port(last_port, timeout):
+        return last_port
+
+    others = [port for port in ports if port != last_port]
+    if not others:
+        return None
+    pool = ThreadPoolExecutor(max_workers=min(PORT_PROBE_WORKERS, len(others)))
+    try:
+        futures = {pool.submit(probe_robot_port, port, timeout): port for port in others}
+        for future in as_completed(futures):
+            if future.result():
+                save_last_port(futures[future], cache_path)
+                return futures[future]
+        return None
+    finally:
+        pool.shutdown(wait=False)  # don't wait for the ports that haven't answered to time out
 
 
 def validate_coordinates(x: float, y: float, z: float):
@@ -96,6 +213,106 @@ def validate_coordinates(x: float, y: float, z: float):
     return True
 
 
+def ramp_time(distance: float, speed: float, acceleration: float) -> float:
+    """
+    time for one axis to move a distance, accelerating up to a top speed and slowing down again
+    :param distance: distance to move (mm)
+    :param speed: top speed (mm/sec)
+    :param acceleration: acceleration (mm/sec^2)
+    :return: seconds the move takes
+    """
+    if distance * acceleration < speed ** 2:  # too short to reach top speed
+        return 2 * math.sqrt(distance / acceleration)
+    return distance / speed + speed / acceleration
+
+
+class MotionModel:
+    """
+    predicts how long a move takes from the robot's top speeds, the point to point speed and an acceleration
+    that is calibrated from the measured times of earlier moves
+    """
+
+    def __init__(self, acceleration=DEFAULT_ACCELERATION, overhead=MOVE_OVERHEAD):
+        """
+        creates a MotionModel
+        :param acceleration: starting acceleration (mm/sec^2)
+        :param overhead: seconds between a move command being sent and the robot starting to move
+        """
+        self._acceleration = acceleration
+        self._overhead = overhead
+        self._speed = None  # point to point speed, None until set_speed is called
+        self._move_log = list()
+
+    def get_acceleration(self) -> float:
+        """
+        :return: calibrated acceleration (mm/sec^2)
+        """
+        return self._acceleration
+
+    def get_move_log(self) -> list:
+        """
+        :return: list of (distance in mm, predicted seconds, measured seconds) tuples of the most recent moves
+        """
+        return list(self._move_log)
+
+    def predict(self, start: tuple, goal: tuple) -> float:
+        """
+        :param start: (x, y, z) position the move starts at
+        :param goal: (x, y, z) position the move ends at
+        :return: predicted seconds the move takes
+        """
+        return self._overhead + self._ramp_times(start, goal, self._acceleration)
+
+    def record(self, start: tuple, goal: tuple, measured: float, is_upper_bound=False) -> None:
+        """
+        logs a timed move and moves the acceleration towards the one that would have predicted it
+        :param start: (x, y, z) position the move started at
+        :param goal: (x, y, z) position the move ended at
+        :param measured: seconds the move took
+        :param is_upper_bound: bool indicating if the move only took at most the measured time (EX: the robot
+                               was already there the first time its position was read)
+        :return: None
+        """
+        predicted = self.predict(start, goal)
+        self._move_log.append((math.dist(start, goal), predicted, measured))
+        del self._move_log[:-MOVE_LOG_SIZE]
+        if is_upper_bound and measured >= predicted:
+            return  # the move may have been as fast as predicted, so there's nothing to correct
+
+        # the move time falls as the acceleration rises, so search for the acceleration matching the measurement
+        target = measured - self._overhead
+        if target <= 0 or self._ramp_times(start, goal, MAX_ACCELERATION) == 0:
+            return
+        low, high = MIN_ACCELERATION, MAX_ACCELERATION
+        for _ in range(20):
+            mid = math.sqrt(low * high)
+            if self._ramp_times(start, goal, mid) > target:
+                low = mid
+            else:
+                high = mid
+        self._acceleration += CALIBRATION_WEIGHT * (math.sqrt(low * high) - self._acceleration)
+
+    def set_speed(self, speed: float) -> None:
+        """
+        :param speed: point to point speed of the robot (mm/sec)
+        :return: None
+        """
+        self._speed = speed
+
+    def _ramp_times(self, start: tuple, goal: tuple, acceleration: float) -> float:
+        """
+        :param start: (x, y, z) position the move starts at
+        :param goal: (x, y, z) position the move ends at
+        :param acceleration: acceleration (mm/sec^2)
+        :return: seconds the slowest axis takes to finish the move
+        """
+        speed_xy = MAX_SPEED_XY if self._speed is None else min(self._speed, MAX_SPEED_XY)
+        speed_z = MAX_SPEED_Z if self._speed is None else min(self._speed, MAX_SPEED_Z)
+        distance_xy = math.hypot(goal[0] - start[0], goal[1] - start[1])
+        distance_z = abs(goal[2] - start[2])
+        return max(ramp_time(distance_xy, speed_xy, acceleration), ramp_time(distance_z, speed_z, acceleration))
+
+
 class RobotController:
     """
     Class for controlling the robot arm in 3D space.
@@ -103,9 +320,10 @@ class RobotController:
     abstracted to send specific messages out the serial port depending on the currently selected robot.
     """
 
-    def __init__(self):
+    def __init__(self, extra_ports=None):
         """
         constructor for a robotcontroller
+        :param extra_ports: ports to check before the system's ports (EX: the port of a FisnarSimulator)
         """
 
         self._current_robot = "Fisnar F4300N"
@@ -117,15 +335,21 @@ class RobotController:
         self._x_offset = 0
         self._z_start = 20
 
+        self._motion_model = MotionModel()
+        self._position = None  # (x, y, z) the robot is at once the moves it was sent end, None if it isn't known
+        self._busy_until = 0.0  # monotonic time the moves sent without waiting for them should be finished
+
         self._serial_port = serial.Serial(timeout=5)
         self._serial_port.baudrate = 115200
         self._serial_port.timeout = 1
-        self._valid_ports = serial_ports()
+        self._valid_ports = serial_ports(extra_ports)
 
         if self._valid_ports:
-            self._serial_port.port = self._valid_ports[0]
+            # use the port the robot answers on, or the first port if it didn't answer on any of them
+            robot_port = find_robot_port(self._valid_ports)
+            self._port_num = 0 if robot_port is None else self._valid_ports.index(robot_port)
+            self._serial_port.port = self._valid_ports[self._port_num]
             self._serial_port.open()  # open serial port
-            self._port_num = 0
 
     def set_robot(self, robot_name: str):
         """
@@ -156,6 +380,19 @@ class RobotController:
         """
         self._is_oriented = cal
 
+    def get_motion_model(self) -> MotionModel:
+        """
+        :return: model used to predict how long moves take (its move log holds predicted and measured times)
+        """
+        return self._motion_model
+
+    def get_position(self):
+        """
+        :return: (x, y, z) the robot is at once the moves it was sent end, None if it isn't known
+                 (unlike get_current_coords, this doesn't ask the robot)
+        """
+        return self._position
+
     def get_offsets(self):
         """
         :return: x offset, y offset
@@ -171,10 +408,15 @@ class RobotController:
     def set_com_port(self, port_idx):
         """
         sets the com port given the index of the com port
-        :param port_idx: index of the port in the list of valid ports
+        :param port_idx: index of the port in the list of valid ports, or the name of a port (EX: /dev/pts/3)
         :return: name of the new port being used
         """
+        if isinstance(port_idx, str):
+            if port_idx not in self._valid_ports:
+                self._valid_ports.append(port_idx)
+            port_idx = self._valid_ports.index(port_idx)
         self._serial_port.close()
+        self._position = None  # a different robot could be on the new port
         self._port_num = port_idx
         self._serial_port.port = self._valid_ports[self._port_num]
         self._serial_port.open()
@@ -238,22 +480,36 @@ class RobotController:
 
     def wait_for_move(self, goal_x: float, goal_y: float, goal_z: float, timeout=15):
         """
-        waits for a move by constantly reading the position of the robot while its moving
+        waits for a move by sleeping for most of the time the motion model predicts it takes,
+        then reading the position of the robot until it arrives
         :param goal_x: goal position's x coordinate
         :param goal_y: goal position's y coordinate
         :param goal_z: goal position's z coordinate
         :param timeout: timeout (ms) to wait before raising an exception
         :return: True if the move is completed
         """
+        start = self._position
+        self._position = None  # unknown until the move is confirmed
         # handle cases where the expected move is outside of the range of the robot
         if goal_x > MAX_X or goal_y > MAX_Y or goal_z > MAX_Z:
             return True
         elif goal_x < 0 or goal_y < 0 or goal_z < 0:
             return True
-        x, y, z = self.get_current_coords()  # get coordinates to check initially
+        goal = (goal_x, goal_y, goal_z)
         start_time = time.time_ns()
+        if start is not None:
+            # the robot finishes the moves it was already sent first, then can't be there any sooner than
+            # predicted, so don't ask it where it is until then
+            queued = max(self._busy_until - time.monotonic(), 0.0)
+            start_time += int(queued * 1e9)
+            time.sleep(queued + self._motion_model.predict(start, goal) * PREDICTED_SLEEP_FRACTION)
+        poll_start = time.time_ns()
+        x, y, z = self.get_current_coords()  # get coordinates to check initially
+        polls = 1
         # this while loop checks if the current coordinates are within a 2 mm range of the actual needed position
         while not goal_x - 1 < x < goal_x + 1 or not goal_y - 1 < y < goal_y + 1 or not goal_z - 1 < z < goal_z + 1:
+            poll_start = time.time_ns()
+            polls += 1
             try:
                 x, y, z = self.get_current_coords()
             except TypeError:
@@ -261,6 +517,12 @@ class RobotController:
             # handle timeouts where robot doesn't move in time
             if time.time_ns() - start_time > timeout * 1e9:
                 raise TimeoutError("Robot movement exceeded timeout of " + str(timeout) + " seconds.")
+        if start is not None:
+            # the robot read its position about halfway through the poll, not when the answer arrived
+            arrived = (poll_start + time.time_ns()) / 2
+            # a robot found at the goal by the first poll got there at some point during the sleep
+            self._motion_model.record(start, goal, (arrived - start_time) / 1e9, is_upper_bound=polls == 1)
+        self._position = goal
         return True
 
     ########################
@@ -321,6 +583,29 @@ class RobotController:
             self._set_speed_point_to_point_fisnar(speed)
         else:  # If you want more robots to be moved, add an elif statement here
             raise ValueError("Unknown robot being used: " + self._current_robot)
+        self._motion_model.set_speed(speed)
+
+    def tap(self, x: float, y: float, z_down: float, z_up: float, hold_s=0.0, count=1, between_s=0.0,
+            on_tap=None) -> list:
+        """
+        taps a point one or more times. the only positions confirmed are the finger being down on each tap (so the
+        hold time is right) and the finger being up at the end, every other move is sent without waiting for it.
+        a tap costs one confirmation instead of the three a hover, press and lift with move() cost
+        :param x: x coordinate
+        :param y: y coordinate
+        :param z_down: z coordinate of the finger touching the screen
+        :param z_up: z coordinate of the finger above the screen
+        :param hold_s: seconds to hold each touch
+        :param count: number of taps
+        :param between_s: seconds to wait between taps
+        :param on_tap: function called once each touch has been held and its lift has been sent (EX: a touch read),
+                       None to not call anything
+        :return: list of what on_tap returned for each tap
+        """
+        if self._current_robot == "Fisnar F4300N":
+            return self._tap_fisnar(x, y, z_down, z_up, hold_s, count, between_s, on_tap)
+        else:  # If you want more robots to be moved, add an elif statement here
+            raise ValueError("Unknown robot being used: " + self._current_robot)
 
     ##########################
     # FISNAR related methods #
@@ -338,6 +623,41 @@ class RobotController:
         :param is_relative: signals if the move being made is relative to the robot's current position
         :return: true if it was able to move, false otherwise
         """
+        cord_x, cord_y, cord_z = self._format_coordinates_fisnar(x, y, z, is_relative)
+
+        if is_relative:
+            # executes if is_relative=True
+            x, y, z = self.get_current_coords()
+            time_ns = time.time_ns()
+            while float(x) == -1 or y == -1 or z == -1:
+                x, y, z = self.get_current_coords()
+                if time.time_ns() - time_ns > 10E9:
+                    raise TimeoutError("Reading coordinates exceeded timeout.")
+            self._position = (x, y, z)
+            x += float(cord_x)
+            y += float(cord_y)
+            z += float(cord_z)
+
+        command = self._move_command_fisnar(cord_x, cord_y, cord_z, is_relative, is_continuous)
+
+        try:
+            self._serial_port.write(bytes(command, "utf-8"))
+            if is_relative:  # executes if move is relative
+                return self.wait_for_move(x, y, z)
+            else:  # executes if not move reading and is not relative (normal absolute movement)
+                return self.wait_for_move(float(cord_x), float(cord_y), float(cord_z))
+        except serial.SerialException or TimeoutError:
+            return False
+
+    def _format_coordinates_fisnar(self, x: float, y: float, z: float, is_relative=False) -> tuple:
+        """
+        formats coordinates for a move command, keeping the robot inside its limits
+        :param x: x coordinate
+        :param y: y coordinate
+        :param z: z coordinate
+        :param is_relative: signals if the coordinates are relative to the robot's current position
+        :return: x, y and z coordinates as strings (max of 5 characters each)
+        """
         # get values as strings (max of 5 characters in the string)
         cord_x = str(x) if len(str(x)) <= 5 else str(x)[0:5]
         cord_y = str(y) if len(str(y)) <= 5 else str(y)[0:5]
@@ -351,18 +671,18 @@ class RobotController:
             cord_x = str(0) if x < 0 else cord_x
             cord_y = str(0) if y < 0 else cord_y
             cord_z = str(0) if z < 0 else cord_z
-        else:
-            # executes if is_relative=True
-            x, y, z = self.get_current_coords()
-            time_ns = time.time_ns()
-            while float(x) == -1 or y == -1 or z == -1:
-                x, y, z = self.get_current_coords()
-                if time.time_ns() - time_ns > 10E9:
-                    raise TimeoutError("Reading coordinates exceeded timeout.")
-            x += float(cord_x)
-            y += float(cord_y)
-            z += float(cord_z)
+        return cord_x, cord_y, cord_z
 
+    def _move_command_fisnar(self, cord_x: str, cord_y: str, cord_z: str, is_relative=False, is_continuous=True):
+        """
+        creates the command that moves the robot
+        :param cord_x: x coordinate as a string (max of 5 characters)
+        :param cord_y: y coordinate as a string (max of 5 characters)
+        :param cord_z: z coordinate as a string (max of 5 characters)
+        :param is_relative: signals if the move being made is relative to the robot's current position
+        :param is_continuous: signals if the move is one straight line from the current position
+        :return: command to write to the serial port
+        """
         # this if statement is entered if the movement is supposed to be continuous
         # (as in, one straight, continuous line from the current position to the new position)
         if is_continuous:
@@ -376,15 +696,7 @@ class RobotController:
                 command = "MAR " + cord_x + "," + cord_y + "," + cord_z + " \r\n"
             else:  # executes if move is absolute
                 command = "MA " + cord_x + "," + cord_y + "," + cord_z + " \r\n"
-
-        try:
-            self._serial_port.write(bytes(command, "utf-8"))
-            if is_relative:  # executes if move is relative
-                return self.wait_for_move(x, y, z)
-            else:  # executes if not move reading and is not relative (normal absolute movement)
-                return self.wait_for_move(float(cord_x), float(cord_y), float(cord_z))
-        except serial.SerialException or TimeoutError:
-            return False
+        return command
 
     def _move_home_fisnar(self, timeout=12):
         """
@@ -407,30 +719,43 @@ class RobotController:
         :return: x, y, and z coordinates (in that order) of the robot
         """
 
-        # Example outputs from readlines() when PA is called:
+        # Example lines received when PA is called:
         # [b'ok\r\n', b'ok\r\n', b'ok\r\n', b'30,30,50\r\n', b'ok\r\n', b'ok\r\n']
         # [b'ok\r\n', b'ok\r\n', b'ok\r\n', b'80,90,65.3985\r\n', b'ok\r\n', b'ok\r\n']
+        # the acks before the coordinates belong to earlier commands, so they're thrown away
 
+        self._serial_port.reset_input_buffer()
         self._serial_port.write(bytes("PA\r\n", "utf-8"))
-        output_list = self._serial_port.readlines()
-        output_str = None
-
-        for ele in output_list:
-            ele_as_str = ele.decode("utf-8")
-            if ele_as_str != "ok\r\n":
-                output_str = ele_as_str
-
-        if output_str is None:
-            return -1, -1, -1
-        else:
+        return self._read_coords_fisnar()
+
+    def _read_coords_fisnar(self, timeout=POSITION_RESPONSE_TIMEOUT):
+        """
+        reads the answer to PA one line at a time, returning as soon as the coordinate line and the ack after it
+        arrive instead of waiting for the serial timeout
+        :param timeout: seconds to wait for the answer
+        :return: x, y, and z coordinates (in that order) of the robot, -1, -1, -1 if no coordinates were received,
+                 None if the coordinates couldn't be read
+        """
+        coords = None
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            line = self._serial_port.readline()
+            if not line:  # serial timeout, the robot has nothing more to say
+                break
+            line = line.decode("utf-8", errors="ignore").strip()
+            if not line or line == ACK:
+                if coords is not None:
+                    return coords
+                continue
             try:
-                ls = output_str.split(",")
-                x_val = float(ls[0])
-                y_val = float(ls[1])
-                z_val = float(ls[2])
-                return x_val, y_val, z_val
+                x_val, y_val, z_val = (float(value) for value in line.split(","))
             except ValueError:
                 return None
+            coords = x_val, y_val, z_val
+
+        if coords is None:
+            return -1, -1, -1
+        return coords
 
     def _set_speed_point_to_point_fisnar(self, speed: float):
         """
@@ -443,3 +768,56 @@ class RobotController:
         :return: N/A
         """
         self._serial_port.write(bytes("SP " + str(speed) + "\r\n", "utf-8"))
+
+    def _tap_fisnar(self, x: float, y: float, z_down: float, z_up: float, hold_s: float, count: int, between_s: float,
+                    on_tap) -> list:
+        """
+        THIS METHOD USES SELF._SERIAL_PORT.WRITE
+
+        taps a point one or more times, only waiting for the finger to be down on each tap and for the final lift
+        :param x: x coordinate
+        :param y: y coordinate
+        :param z_down: z coordinate of the finger touching the screen
+        :param z_up: z coordinate of the finger above the screen
+        :param hold_s: seconds to hold each touch
+        :param count: number of taps
+        :param between_s: seconds to wait between taps
+        :param on_tap: function called once each touch has been held and its lift has been sent,
+                       None to not call anything
+        :return: list of what on_tap returned for each tap
+        """
+        down_cords = self._format_coordinates_fisnar(x, y, z_down)
+        up_cords = self._format_coordinates_fisnar(x, y, z_up)
+        down = tuple(float(cord) for cord in down_cords)
+        up = tuple(float(cord) for cord in up_cords)
+        down_command = bytes(self._move_command_fisnar(*down_cords, is_continuous=False), "utf-8")
+        up_command = bytes(self._move_command_fisnar(*up_cords, is_continuous=False), "utf-8")
+
+        results = list()
+        self._serial_port.write(up_command)  # hover over the point, confirmed along with the first touch
+        self._send_unconfirmed_fisnar(up)
+        for i in range(count):
+            if i != 0:
+                time.sleep(between_s)
+            self._serial_port.write(down_command)
+            self.wait_for_move(*down)  # the hold starts once the finger is on the screen
+            time.sleep(hold_s)
+            self._serial_port.write(up_command)
+            self._send_unconfirmed_fisnar(up)
+            if on_tap is not None:
+                # the touch was reported while it was held, so it's read while the finger lifts
+                results.append(on_tap())
+        self.wait_for_move(*up)  # the other lifts end before the press after them, which is confirmed
+        return results
+
+    def _send_unconfirmed_fisnar(self, goal: tuple) -> None:
+        """
+        keeps track of where the robot will be after a move that was sent without waiting for it
+        :param goal: (x, y, z) position the move ends at
+        :return: None
+        """
+        if self._position is None:
+            return  # the move can't be predicted, so the next move is confirmed by polling alone
+        now = time.monotonic()
+        self._busy_until = max(self._busy_until, now) + self._motion_model.predict(self._position, goal)
+        self._position = goal
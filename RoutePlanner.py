@@ -0,0 +1,96 @@
+import math
+
+# passes of 2-opt improvement made at most (each pass tries every segment reversal once)
+MAX_TWO_OPT_PASSES = 50
+# smallest travel saving (mm) worth reversing a segment for, so rounding errors don't loop forever
+MIN_IMPROVEMENT = 1e-6
+
+
+def route_length(points: list, order: list, start=None) -> float:
+    """
+    gets the distance travelled visiting points in a given order
+
+    :param points: list of (x, y) coordinates (or Points)
+    :param order: indices of the points in the order they're visited
+    :param start: (x, y) coordinate the route starts at, None to start at the first point
+    :return: distance travelled
+    """
+    length = 0.0
+    previous = start
+    for index in order:
+        point = (points[index][0], points[index][1])
+        if previous is not None:
+            length += math.dist(previous, point)
+        previous = point
+    return length
+
+
+def nearest_neighbour_route(points: list, start=None) -> list:
+    """
+    builds a route by always moving to the closest point not visited yet
+
+    :param points: list of (x, y) coordinates (or Points)
+    :param start: (x, y) coordinate the route starts at, None to start at the first point
+    :return: indices of the points in the order they're visited
+    """
+    coords = [(point[0], point[1]) for point in points]
+    remaining = set(range(len(coords)))
+    order = list()
+    current = start
+    while remaining:
+        if current is None:
+            index = 0
+        else:
+            index = min(remaining, key=lambda i: (math.dist(current, coords[i]), i))
+        remaining.remove(index)
+        order.append(index)
+        current = coords[index]
+    return order
+
+
+def two_opt(points: list, order: list, start=None) -> list:
+    """
+    shortens a route by reversing parts of it until no reversal makes it shorter.
+    the route is open (it doesn't return to the start), and starts at start if it's given
+
+    :param points: list of (x, y) coordinates (or Points)
+    :param order: indices of the points in the order they're visited
+    :param start: (x, y) coordinate the route starts at, None to let the first point change as well
+    :return: indices of the points in the improved order
+    """
+    coords = [(point[0], point[1]) for point in points]
+    route = list(order)
+    num_points = len(route)
+
+    def dist(a, b):
+        # distance between two positions in the route, position -1 is the start and num_points is the end
+        if a < 0:
+            return 0.0 if start is None else math.dist(start, coords[route[b]])
+        if b >= num_points:
+            return 0.0
+        return math.dist(coords[route[a]], coords[route[b]])
+
+    for _ in range(MAX_TWO_OPT_PASSES):
+        improved = False
+        for i in range(num_points - 1):
+            for j in range(i + 1, num_points):
+                # reversing route[i:j + 1] swaps the edges (i - 1, i) and (j, j + 1) for (i - 1, j) and (i, j + 1)
+                before = dist(i - 1, i) + dist(j, j + 1)
+                after = dist(i - 1, j) + dist(i, j + 1)
+                if after < before - MIN_IMPROVEMENT:
+                    route[i:j + 1] = reversed(route[i:j + 1])
+                    improved = True
+        if not improved:
+            break
+    return route
+
+
+def plan_route(points: list, start=None) -> list:
+    """
+    orders points for the least travel, using a nearest neighbour route improved with 2-opt
+
+    :param points: list of (x, y) coordinates (or Points)
+    :param start: (x, y) coordinate the route starts at (EX: the robot's position), None to start anywhere
+    :return: indices of the points in the order they should be visited
+    """
+    return two_opt(points, nearest_neighbour_route(points, start), start)
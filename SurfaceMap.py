@@ -0,0 +1,83 @@
+import bisect
+
+
+def grid_values(low: float, high: float, count: int, margin=0.0) -> list:
+    """
+    spreads evenly spaced values over a range
+
+    :param low: start of the range
+    :param high: end of the range
+    :param count: number of values (1 puts a single value in the middle of the range)
+    :param margin: fraction of the range to leave out at each end
+    :return: list of values in increasing order
+    """
+    inset = (high - low) * margin
+    low, high = low + inset, high - inset
+    if count <= 1:
+        return [(low + high) / 2]
+    step = (high - low) / (count - 1)
+    return [low + step * i for i in range(count)]
+
+
+class SurfaceMap:
+    """
+    Z height (mm) of a part's surface, probed over a grid of robot coordinates and interpolated bilinearly
+    between the probed points. points off the grid get the height of the closest edge of the grid
+    """
+
+    def __init__(self, x_values: list, y_values: list, heights: list):
+        """
+        creates a SurfaceMap
+
+        :param x_values: X coordinates of the grid columns, in increasing order
+        :param y_values: Y coordinates of the grid rows, in increasing order
+        :param heights: heights[i][j] is the height probed at (x_values[i], y_values[j])
+        :raises: ValueError if the heights don't match the grid
+        """
+        if len(heights) != len(x_values) or any(len(column) != len(y_values) for column in heights):
+            raise ValueError("heights must be " + str(len(x_values)) + " by " + str(len(y_values)))
+        self._x_values = list(x_values)
+        self._y_values = list(y_values)
+        self._heights = [list(column) for column in heights]
+
+    def get_grid(self) -> tuple:
+        """
+        :return: X coordinates, Y coordinates and heights of the probed grid
+        """
+        return list(self._x_values), list(self._y_values), [list(column) for column in self._heights]
+
+    def get_height(self, x: float, y: float) -> float:
+        """
+        :param x: X coordinate
+        :param y: Y coordinate
+        :return: interpolated height of the surface at the coordinate
+        """
+        i, x_weight = self._locate(self._x_values, x)
+        j, y_weight = self._locate(self._y_values, y)
+        i_next = min(i + 1, len(self._x_values) - 1)
+        j_next = min(j + 1, len(self._y_values) - 1)
+        low = self._heights[i][j] * (1 - x_weight) + self._heights[i_next][j] * x_weight
+        high = self._heights[i][j_next] * (1 - x_weight) + self._heights[i_next][j_next] * x_weight
+        return low * (1 - y_weight) + high * y_weight
+
+    def get_range(self) -> tuple:
+        """
+        :return: lowest and highest probed heights (EX: to check how flat the part is)
+        """
+        heights = [height for column in self._heights for height in column]
+        return min(heights), max(heights)
+
+    @staticmethod
+    def _locate(values: list, value: float) -> tuple:
+        """
+        :param values: grid coordinates in increasing order
+        :param value: coordinate to find
+        :return: index of the grid coordinate at or below the value, and how far (0 to 1) the value is towards
+                 the next grid coordinate
+        """
+        if len(values) == 1 or value <= values[0]:
+            return 0, 0.0
+        if value >= values[-1]:
+            return len(values) - 1, 0.0
+        index = bisect.bisect_right(values, value) - 1
+        return index, (value - values[index]) / (values[index + 1] - values[index])
@@ -4,18 +4,39 @@ import threading
 import time
 import pdb
 
+import numpy as np
 from PIL import Image
 from matplotlib import pyplot as plt
 
 import errors
 from DXFReader import Line, Point, DXFReader
 from ExcelSaver import ExcelSaver
+from FixtureSampler import FixtureSampler
 from RobotController import RobotController
-from TouchController import TouchController
+from RoutePlanner import plan_route
+from SurfaceMap import SurfaceMap, grid_values
+from TouchController import (TouchController, CAPABILITY_BACKGROUND_READ, CAPABILITY_FRAME_READ,
+                             CAPABILITY_NODE_READ, CAPABILITY_RAW_RATE)
 
 
 Z_OFFSET = 30
 
+# rows and columns of points probed over the active area to map the height of the part's surface
+SURFACE_GRID_SIZE = 3
+# fraction of the active area's width and height left out at its edges when probing the surface
+SURFACE_GRID_MARGIN = .1
+# mm above the Z start the surface is searched from, and the size of each step down (the finger never goes past the
+# Z start, the deepest it presses without a surface map)
+SURFACE_PROBE_RANGE = 5
+SURFACE_PROBE_STEP = .25
+# seconds to wait at each probe step for the touch controller to report a touch
+SURFACE_PROBE_SETTLE = .05
+# mm the finger presses past the surface when touching, and is lifted above it between touches
+SURFACE_PRESS_DEPTH = 1.0
+HOVER_CLEARANCE = 3.0
+# delta frames read from every controller of a multi-DUT fixture by the fixture noise test
+FIXTURE_NOISE_FRAMES = 50
+
 
 def are_nums_close(num1, num2, closeness=100) -> bool:
     """
@@ -248,13 +269,15 @@ def calc_linearity(core_lines_and_points: list, edge_lines_and_points: list, par
 
 class TestManager:
 
-    def __init__(self, robot_controller: RobotController):
+    def __init__(self, robot_controller: RobotController, touch_controller=None):
         """
         constructor for the test manager
         :param robot_controller: robot controller being used to run tests
+        :param touch_controller: TouchController of the part being tested, None to connect to the first one found
         """
         self.robot_controller = robot_controller
-        self.touch_controller = TouchController()
+        self.touch_controller = TouchController() if touch_controller is None else touch_controller
+        self._fixture_sampler = None  # samples every controller of a multi-DUT fixture, created when first used
         self._x_range, self._y_range = self.touch_controller.get_range()
         self._dxf_reader = None
 
@@ -262,6 +285,10 @@ class TestManager:
         self._num_x_nodes = self._num_y_nodes = None
         self._is_move_reading = False
         self._z_start = None
+        # height of the part's surface, None to press to the Z start and lift by Z_OFFSET everywhere
+        self._surface_map = None
+        self._press_depth = SURFACE_PRESS_DEPTH
+        self._hover_clearance = HOVER_CLEARANCE
 
         self._test_parameters = []
         # FIXME self._tests_to_run = ["Accuracy", "Signal-to-Noise (SNR)", "Jitter", "Linearity"]
@@ -307,12 +334,38 @@ class TestManager:
     ####
     # setter/getter/upload methods
 
+    def get_hover_clearance(self) -> float:
+        """
+        :return: mm above the surface the finger is lifted between touches once the surface is mapped
+        """
+        return self._hover_clearance
+
+    def get_reset_latencies(self) -> list:
+        """
+        :return: list of seconds each touch controller reset took to come up (EX: to spot slow controllers)
+        """
+        return self.touch_controller.get_reset_latencies()
+
+    def get_surface_map(self):
+        """
+        :return: SurfaceMap of the part, None if the surface hasn't been mapped
+        """
+        return self._surface_map
+
     def get_touch_controller_type(self):
         """
         :return: touch controller being used
         """
         return self.touch_controller.get_touch_controller_type()
 
+    def set_hover_clearance(self, clearance: float):
+        """
+        sets how far above the surface the finger is lifted between touches once the surface is mapped
+        :param clearance: mm above the surface
+        :return: None
+        """
+        self._hover_clearance = clearance
+
     def set_z_start(self, z: float):
         """
         sets the Z axis for the robot to move to
@@ -320,6 +373,7 @@ class TestManager:
         :return: None
         """
         self._z_start = z
+        self._surface_map = None  # the surface is searched for around the Z start
 
     def set_dxf_reader(self, reader: DXFReader):
         """
@@ -328,6 +382,7 @@ class TestManager:
         :return: N/A
         """
         self._dxf_reader = reader
+        self._surface_map = None  # the map was probed over the old part
 
     def set_touch_controller(self, controller_name: str) -> None:
         """
@@ -336,6 +391,7 @@ class TestManager:
         :return: None
         """
         self.touch_controller.set_touch_controller(controller_name)
+        self._fixture_sampler = None  # the fixture's other controllers were found with the old controller name
 
     def upload_tests_to_run(self, tests: list):
         """
@@ -467,6 +523,7 @@ class TestManager:
         # reset offsets for new offset when uploading configuration multiple times in a row
         if self._dxf_reader:
             self._dxf_reader.reset_offsets()
+        self._surface_map = None  # the map's coordinates don't include the new offset
 
         x_offset = offset[0]
         y_offset = offset[1]
@@ -499,7 +556,7 @@ class TestManager:
         ExcelSaver(filepath, acc_params, snr_params, jit_params, lin_params, self._num_x_nodes, self._num_y_nodes,
                    acc_results=self._acc_results, snr_results=self._snr_results, jit_results=self._jit_results,
                    lin_results=self._lin_results, conversion_function=self.convert_robot_to_screen_coordinates,
-                   sensor_data=sensor_data)
+                   sensor_data=sensor_data, reset_latencies=self.get_reset_latencies())
         self._snr_results.clear()
         self._acc_results.clear()
         self._jit_results.clear()
@@ -665,6 +722,83 @@ class TestManager:
     ####
     # end getter/setter
 
+    ####
+    # surface mapping methods
+
+    def map_surface(self, grid_size=SURFACE_GRID_SIZE, press_depth=SURFACE_PRESS_DEPTH, debug=False) -> SurfaceMap:
+        """
+        probes the height of the part's surface over a grid covering the active area. once mapped, every touch
+        presses press_depth past the surface under it and lifts only the hover clearance above it
+        :param grid_size: number of rows and columns of points to probe
+        :param press_depth: mm to press past the surface when touching
+        :param debug: bool determining if debug data is output to the console
+        :return: SurfaceMap of the part
+        """
+        corners = self._dxf_reader.get_active_area().get_points()
+        x_values = grid_values(min(c['x'] for c in corners), max(c['x'] for c in corners), grid_size,
+                               SURFACE_GRID_MARGIN)
+        y_values = grid_values(min(c['y'] for c in corners), max(c['y'] for c in corners), grid_size,
+                               SURFACE_GRID_MARGIN)
+        grid = [Point(x, y) for x in x_values for y in y_values]
+
+        self._surface_map = None  # probe from the Z start, not an older map
+        heights = [[None] * len(y_values) for _ in x_values]
+        for _, index in self.plan_touch_route([grid]):
+            height = self.surface_probe(grid[index]['x'], grid[index]['y'])
+            heights[index // len(y_values)][index % len(y_values)] = height
+            if debug:
+                print("SURFACE AT (" + str(grid[index]['x']) + ", " + str(grid[index]['y']) + "): " + str(height))
+
+        self._press_depth = press_depth
+        self._surface_map = SurfaceMap(x_values, y_values, heights)
+        return self._surface_map
+
+    def surface_probe(self, x: float, y: float) -> float:
+        """
+        finds the height of the surface at a point by stepping the finger down until the touch controller sees it.
+        the finger is never pushed past the Z start, so probing never presses harder than a touch without a map
+        :param x: X coordinate to probe
+        :param y: Y coordinate to probe
+        :return: Z coordinate the finger first touched the surface at
+        :raises: NoInputFromController if no touch was seen by the time the finger reached the Z start
+        """
+        self.robot_controller.move(x, y, self._z_start - Z_OFFSET, is_continuous=False)
+        self.touch_controller.clear_buffer()
+        z = self._z_start - SURFACE_PROBE_RANGE
+        try:
+            while z <= self._z_start:
+                self.robot_controller.move(x, y, z, is_continuous=False)
+                time.sleep(SURFACE_PROBE_SETTLE)
+                if self.touch_controller.read_all_points():
+                    return z
+                z += SURFACE_PROBE_STEP
+        finally:
+            self.robot_controller.move(x, y, self._z_start - Z_OFFSET, is_continuous=False)
+            self.touch_controller.clear_buffer()
+        raise errors.NoInputFromController("No touch was seen from " + str(SURFACE_PROBE_RANGE) +
+                                           " mm above the Z start down to the Z start at (" + str(x) + ", " +
+                                           str(y) + ").")
+
+    def press_height(self, x: float, y: float) -> float:
+        """
+        :param x: X coordinate
+        :param y: Y coordinate
+        :return: Z coordinate to press the finger down to at the point
+        """
+        if self._surface_map is None:
+            return self._z_start
+        return self._surface_map.get_height(x, y) + self._press_depth
+
+    def hover_height(self, x: float, y: float) -> float:
+        """
+        :param x: X coordinate
+        :param y: Y coordinate
+        :return: Z coordinate to lift the finger to between touches at the point
+        """
+        if self._surface_map is None:
+            return self._z_start - Z_OFFSET
+        return self._surface_map.get_height(x, y) - self._hover_clearance
+
     def reset_touch_controller(self) -> bool:
         """
         Resets the touch controller (crazy!)
@@ -672,6 +806,36 @@ class TestManager:
         """
         return self.touch_controller.reset()
 
+    def fixture_noise_test(self, num_frames=FIXTURE_NOISE_FRAMES) -> dict:
+        """
+        reads delta frames from every touch controller plugged into a multi-DUT fixture at the same time, with
+        nothing touching the parts, and finds the noise of each part (max(Nnf) - min(Nnf) of its noisiest node)
+        :param num_frames: delta frames to read from each controller
+        :return: dictionary with slots (numbered in USB location order) as keys and the noise of the part as values,
+                 or the error that stopped the slot's controller
+        """
+        if self._fixture_sampler is None:
+            self._fixture_sampler = FixtureSampler.from_fixture(
+                controller_name=self.touch_controller.get_touch_controller_type(), known=[self.touch_controller])
+
+        self._fixture_sampler.start_delta_frames(num_frames)
+        samples = self._fixture_sampler.collect()
+        results = self._fixture_sampler.get_errors()
+        for slot, frames in samples.items():
+            if slot not in results:
+                results[slot] = int(np.ptp(np.stack([frame for timestamp, frame in frames]), axis=0).max())
+        return results
+
+    def get_fixture_slots(self) -> dict:
+        """
+        :return: dictionary with the fixture's slots as keys and the (bus, port numbers) USB locations of their
+                 touch controllers as values, empty if the fixture hasn't been sampled
+        """
+        if self._fixture_sampler is None:
+            return dict()
+        return {slot: self._fixture_sampler.get_touch_controller(slot).get_usb_location()
+                for slot in self._fixture_sampler.get_slots()}
+
     def get_progress_dialog_size(self):
         """
         gets the size of the progress dialog
@@ -747,19 +911,37 @@ class TestManager:
                 print("BAD POINT GENERATED: (" + str(x_mm) + ", " + str(y_mm) + ")")
         return Point(x_mm, y_mm)
 
+    def plan_touch_route(self, point_groups: list) -> list:
+        """
+        orders the points of one or more point lists for the least robot travel, starting where the robot is
+        :param point_groups: lists of points (EX: [edge points, core points])
+        :return: list of (group index, point index) tuples in the order the points should be touched
+        """
+        points = [(group_index, point_index) for group_index, group in enumerate(point_groups)
+                  for point_index in range(len(group))]
+        coordinates = [(point_groups[group_index][point_index]['x'], point_groups[group_index][point_index]['y'])
+                       for group_index, point_index in points]
+        position = self.robot_controller.get_position()
+        start = None if position is None else position[:2]
+        return [points[index] for index in plan_route(coordinates, start)]
+
     ####
     # end conversion methods
 
     ####
     # robot controller methods
 
-    def run_tests(self, tests: list, dlg, part_name: str, is_large_read=False):
+    def run_tests(self, tests: list, dlg, part_name: str, is_large_read=False, raw_rate=False):
         """
         runs the tests
         :param tests: list of tests to be ran
         :param dlg: progressdialog to let user know state of tests
         :param part_name: name of the part being tested
         :param is_large_read: bool determining if the SNR test is a large read (5x5) or a small read (3x3).
+        :param raw_rate: bool determining if the jitter and linearity tests turn off the controller's power saving
+                         and touch filtering to sample touches at its highest report rate (EX: to characterize the
+                         sensor rather than the controller's configuration). off by default, so the part is tested
+                         the way it's configured to run in the field
         :return: bool determining if the tests were ran successfully
         """
         if not self.robot_controller.is_oriented():  # you need to orient the screen before using it, silly
@@ -798,13 +980,29 @@ class TestManager:
                     self.robot_controller.set_speed_point_to_point(200)
                     all_jit_core_values = list()
                     all_jit_edge_values = list()
-                    for i in range(self._jit_iterations):  # run test num_iterations number timer
-                        self.touch_controller.clear_buffer()
-                        jit_core, jit_edge = self.run_jit_test(i + 1, self._jit_num_touches, part_name=part_name)
-                        test_num += 1
-                        dlg.Update(test_num, "Jitter test " + str(i + 1) + " completed.")
-                        all_jit_core_values.append(jit_core)
-                        all_jit_edge_values.append(jit_edge)
+                    started_reader = started_raw_rate = False
+                    try:
+                        # capture reports on a background thread so they aren't missed while the robot moves
+                        if self.touch_controller.has_capability(CAPABILITY_BACKGROUND_READ):
+                            self.touch_controller.start_background_reader()
+                            started_reader = True
+                        # sample touches at the highest report rate only when asked to, the settings are restored after
+                        if raw_rate and self.touch_controller.has_capability(CAPABILITY_RAW_RATE):
+                            self.touch_controller.start_raw_rate_mode()
+                            started_raw_rate = True
+                        for i in range(self._jit_iterations):  # run test num_iterations number timer
+                            self.touch_controller.clear_buffer()
+                            jit_core, jit_edge = self.run_jit_test(i + 1, self._jit_num_touches,
+                                                                   part_name=part_name)
+                            test_num += 1
+                            dlg.Update(test_num, "Jitter test " + str(i + 1) + " completed.")
+                            all_jit_core_values.append(jit_core)
+                            all_jit_edge_values.append(jit_edge)
+                    finally:  # only undo what was started, a failed start leaves nothing to stop
+                        if started_raw_rate:
+                            self.touch_controller.stop_raw_rate_mode()
+                        if started_reader:
+                            self.touch_controller.stop_background_reader()
                     self._jit_results.append([all_jit_core_values, all_jit_edge_values, part_name])
                 elif test == "Linearity":
                     self.robot_controller.set_speed_point_to_point(50)
@@ -813,14 +1011,29 @@ class TestManager:
                     all_lin_full_values = list()
                     all_lines_and_points = list()
 
-                    for i in range(1, self._lin_iterations + 1):  # run test num_iterations number timer
-                        self.touch_controller.clear_buffer()
-                        core, edge, lines_and_points = self.run_lin_test(i, part_name)                        
-                        all_lin_full_values.append(edge)                        
-                        all_lin_core_values.append(core)
-                        all_lines_and_points.append(lines_and_points)
-                        test_num += 1
-                        dlg.Update(test_num, "Linearity test " + str(i) + " completed.")
+                    started_reader = started_raw_rate = False
+                    try:
+                        # capture reports on a background thread so they aren't missed while the robot moves
+                        if self.touch_controller.has_capability(CAPABILITY_BACKGROUND_READ):
+                            self.touch_controller.start_background_reader()
+                            started_reader = True
+                        # sample touches at the highest report rate only when asked to, the settings are restored after
+                        if raw_rate and self.touch_controller.has_capability(CAPABILITY_RAW_RATE):
+                            self.touch_controller.start_raw_rate_mode()
+                            started_raw_rate = True
+                        for i in range(1, self._lin_iterations + 1):  # run test num_iterations number timer
+                            self.touch_controller.clear_buffer()
+                            core, edge, lines_and_points = self.run_lin_test(i, part_name)
+                            all_lin_full_values.append(edge)
+                            all_lin_core_values.append(core)
+                            all_lines_and_points.append(lines_and_points)
+                            test_num += 1
+                            dlg.Update(test_num, "Linearity test " + str(i) + " completed.")
+                    finally:  # only undo what was started, a failed start leaves nothing to stop
+                        if started_raw_rate:
+                            self.touch_controller.stop_raw_rate_mode()
+                        if started_reader:
+                            self.touch_controller.stop_background_reader()
                     self._lin_results.append([all_lin_core_values, all_lin_full_values, all_lines_and_points, part_name])
                 elif test == "Signal-to-Noise (SNR)":
                     self.robot_controller.set_speed_point_to_point(200)
@@ -859,23 +1072,15 @@ class TestManager:
         # Xerr = Xr - Xp
         # Yerr = Yr - Yp
         # acc = sqrt(Xerr^2 + Yerr^2)
-        core_values = []
-        full_values = []
-        edge_values = []
-        # iterate over each edge accuracy point and perform a test
-        for touch_point in self._dxf_reader.get_accuracy_edge():
+        point_groups = [self._dxf_reader.get_accuracy_edge(), self._dxf_reader.get_accuracy_core()]
+        values = [[None] * len(group) for group in point_groups]
+        # test the edge and core points in the order with the least travel, keeping the results in the dxf order
+        for group_index, point_index in self.plan_touch_route(point_groups):
             # touch point format: [x pt, y pt]
-            touched_points = self.accuracy_touch_test(touch_point)
-            edge_values.append(touched_points)
-            full_values.append(touched_points)
-            self.touch_controller.clear_buffer()
-        # iterate over each core accuracy point and perform a test
-        for touch_point in self._dxf_reader.get_accuracy_core():
-            # touch point format: [x pt, y pt]
-            touched_points = self.accuracy_touch_test(touch_point)
-            core_values.append(touched_points)
-            full_values.append(touched_points)
+            values[group_index][point_index] = self.accuracy_touch_test(point_groups[group_index][point_index])
             self.touch_controller.clear_buffer()
+        edge_values, core_values = values
+        full_values = edge_values + core_values
         return calc_accuracy(core_values),\
                calc_accuracy(edge_values),\
                calc_accuracy(full_values)
@@ -889,15 +1094,14 @@ class TestManager:
         """
         # create list with index 0 being the actual point evaluated
         ret_list = [self.convert_robot_to_screen_coordinates(point['x'], point['y'])]
-        self.robot_controller.move(point['x'], point['y'], self._z_start - Z_OFFSET, is_continuous=False)  # move to start position
-        for i in range(int(self._acc_num_touches)):
-            if i != 0:
-                time.sleep(self._acc_sec_between_touch)  # wait time_between_touches before proceeding
-            self.robot_controller.move(point['x'], point['y'], self._z_start, is_continuous=False)  # move finger onto the board
-            time.sleep(self._acc_touch_duration)  # wait hold_duration
-            self.robot_controller.move(point['x'], point['y'], self._z_start - Z_OFFSET)  # move finger off of board
-            registered_touch = self.touch_controller.get_touch_coordinate()  # get a Point touched
-
+        # tap the point, holding each touch for touch_duration and reading the touch after each lift
+        registered_touches = self.robot_controller.tap(point['x'], point['y'], self.press_height(point['x'], point['y']),
+                                                       self.hover_height(point['x'], point['y']),
+                                                       hold_s=self._acc_touch_duration,
+                                                       count=int(self._acc_num_touches),
+                                                       between_s=self._acc_sec_between_touch,
+                                                       on_tap=self.touch_controller.get_touch_coordinate)
+        for registered_touch in registered_touches:
             if debug:
                 print("##############################################")
                 print("point before manipulation: " + str(point))
@@ -956,17 +1160,20 @@ class TestManager:
         # set speed to be fast to get to starting point of line
         self.robot_controller.set_speed_point_to_point(200)
         # move to start point
-        self.robot_controller.move(line.get_start_x(), line.get_start_y(), self._z_start - Z_OFFSET, is_continuous=False)
+        self.robot_controller.move(line.get_start_x(), line.get_start_y(),
+                                   self.hover_height(line.get_start_x(), line.get_start_y()), is_continuous=False)
         # clear old messages
         self.touch_controller.clear_buffer()
         # put finger on screen
-        self.robot_controller.move(line.get_start_x(), line.get_start_y(), self._z_start, is_continuous=False)
+        self.robot_controller.move(line.get_start_x(), line.get_start_y(),
+                                   self.press_height(line.get_start_x(), line.get_start_y()), is_continuous=False)
         # set speed to 40 mm/sec to get a good amount of data points
         self.robot_controller.set_speed_point_to_point(self._lin_path_velocity)
         # move to end of line and return results
         # this move method goes to the wait_and_read method which utilizes multithreading
         # FIXME find new way of doing this
-        return self.wait_and_read(line.get_end_x(), line.get_end_y(), self._z_start)
+        return self.wait_and_read(line.get_end_x(), line.get_end_y(),
+                                  self.press_height(line.get_end_x(), line.get_end_y()))
 
     def lin_read_wrapper(self, rfc, q: queue.Queue, lock: threading.Lock):
         """
@@ -1088,29 +1295,24 @@ class TestManager:
         :return: calculated jitter for the core and edge
         """
 
-        jitter_edge = list()
-        jitter_core = list()
+        point_groups = [self._dxf_reader.get_jitter_edge(), self._dxf_reader.get_jitter_core()]
+        colors = ['red', 'blue']  # edge points are marked red, core points blue
+        values = [[None] * len(group) for group in point_groups]
 
         # Initialize graph
         fig, ax = plt.subplots()
         img_title = "Jitter Test " + part_name + ", Iteration " + str(test_num)
         ax.set(xlabel="X - Axis (mm)", ylabel="Y - Axis (mm)", title=img_title)
 
-        for touch_point in self._dxf_reader.get_jitter_edge():
-            point_data = self.jitter_touch_test(touch_point, touches=num_touches,
-                                                hold_duration=self._jit_touch_duration)
-            jitter_edge.append(point_data)
-            screen_pt = self.convert_robot_to_screen_coordinates(touch_point['x'], touch_point['y'])
-            plt.plot(screen_pt['x'], screen_pt['y'], marker='x', color='red', markersize=4)
-            time.sleep(self._jit_sec_between_touch)
-
-        for touch_point in self._dxf_reader.get_jitter_core():
-            point_data = self.jitter_touch_test(touch_point, touches=num_touches,
-                                                hold_duration=self._jit_touch_duration)
-            jitter_core.append(point_data)
+        # test the edge and core points in the order with the least travel, keeping the results in the dxf order
+        for group_index, point_index in self.plan_touch_route(point_groups):
+            touch_point = point_groups[group_index][point_index]
+            values[group_index][point_index] = self.jitter_touch_test(touch_point, touches=num_touches,
+                                                                      hold_duration=self._jit_touch_duration)
             screen_pt = self.convert_robot_to_screen_coordinates(touch_point['x'], touch_point['y'])
-            plt.plot(screen_pt['x'], screen_pt['y'], marker='x', color='blue', markersize=4)
+            plt.plot(screen_pt['x'], screen_pt['y'], marker='x', color=colors[group_index], markersize=4)
             time.sleep(self._jit_sec_between_touch)
+        jitter_edge, jitter_core = values
 
         # add jitter-ed points to the graph
         for group in [jitter_core, jitter_edge]:
@@ -1145,7 +1347,7 @@ class TestManager:
         x = point['x']
         y = point['y']
 
-        self.robot_controller.move(x, y, self._z_start - Z_OFFSET)  # move above touch point
+        self.robot_controller.move(x, y, self.hover_height(x, y))  # move above touch point
         # create list of points where the 0th index is the point its at and the following points are
         # the jitter calculations
         jitter_points = [self.convert_robot_to_screen_coordinates(x, y)]
@@ -1167,10 +1369,10 @@ class TestManager:
         x = point['x']
         y = point['y']
         self._is_move_reading = True
-        self.robot_controller.move(x, y, self._z_start)
+        self.robot_controller.move(x, y, self.press_height(x, y))
         time.sleep(hold_duration)  # wait hold_duration seconds before moving again
         # move back off of the screen
-        self.robot_controller.move(x, y, self._z_start - Z_OFFSET)
+        self.robot_controller.move(x, y, self.hover_height(x, y))
         self._is_move_reading = False
 
     def jitter_touch_non_mt(self, point: Point, hold_duration):
@@ -1185,8 +1387,8 @@ class TestManager:
 
         self.touch_controller.clear_buffer()
 
-        self.robot_controller.move(x, y, self._z_start - Z_OFFSET)
-        self.robot_controller.move(x, y, self._z_start)
+        self.robot_controller.move(x, y, self.hover_height(x, y))
+        self.robot_controller.move(x, y, self.press_height(x, y))
 
         mm_coordinates = list()
 
@@ -1199,7 +1401,7 @@ class TestManager:
                 coordinates_mm = self.screen_units_to_mm(point[0], point[1])
                 mm_coordinates.append(coordinates_mm)
 
-        self.robot_controller.move(x, y, self._z_start - Z_OFFSET)
+        self.robot_controller.move(x, y, self.hover_height(x, y))
         return mm_coordinates
 
     """
@@ -1284,47 +1486,42 @@ class TestManager:
         # Noise = max(not touching input) - min(not touching input
         # Signal = avg(not touching) - avg(touching)
         # SNR = Signal/Noise
-        core_snr_values = list()
-        edge_snr_values = list()
-
-        is_core = True
-
-        for test in [self._dxf_reader.get_snr_core(), self._dxf_reader.get_snr_edge()]:
-            # iterate over each touch_point from the dxf file
-            for touch_point in test:
-                # get x and y coordinate from touch point
-                x_pt = touch_point[0]
-                y_pt = touch_point[1]
-
-                x_node, y_node = self.snr_get_node_numbers(x_pt, y_pt)
-                # get noises around given x,y point
-                noises = self.snr_noise_test(x_pt, y_pt, x_node=x_node, y_node=y_node, large_read=is_large_read)
-                # get signals around given x,y point
-                signals = self.snr_signal_test(x_pt, y_pt, noises, x_node=x_node, y_node=y_node)
-                snr_values = list()
-
-                # move finger off of board
-                self.robot_controller.move(x_pt, y_pt, self._z_start - Z_OFFSET)
-
-                # calculate SNR for each index of the signals and noises
-                for i in range(len(signals)):
-                    if noises[i] != 0:
-                        snr_values.append(signals[i] / noises[i])
-                    else:
-                        snr_values.append(0)
-                if debug:
-                    print("Max SNR VALUE: " + str(max(snr_values)) + '\n')
-                # get touch coordinates centered to match the board
-                centered_point = self.convert_robot_to_screen_coordinates(touch_point['x'], touch_point['y'])
-                # append snr value to core data
-
-                max_snr = max(snr_values)
-                raw_data = (self.snr_figure_nodes(x_node, y_node, is_large_read=is_large_read), signals, noises)
-                if is_core:
-                    core_snr_values.append([centered_point, max_snr, raw_data])
+        point_groups = [self._dxf_reader.get_snr_core(), self._dxf_reader.get_snr_edge()]
+        values = [[None] * len(group) for group in point_groups]
+
+        # test the core and edge points in the order with the least travel, keeping the results in the dxf order
+        for group_index, point_index in self.plan_touch_route(point_groups):
+            touch_point = point_groups[group_index][point_index]
+            # get x and y coordinate from touch point
+            x_pt = touch_point[0]
+            y_pt = touch_point[1]
+
+            x_node, y_node = self.snr_get_node_numbers(x_pt, y_pt)
+            # get noises around given x,y point
+            noises = self.snr_noise_test(x_pt, y_pt, x_node=x_node, y_node=y_node, large_read=is_large_read)
+            # get signals around given x,y point
+            signals = self.snr_signal_test(x_pt, y_pt, noises, x_node=x_node, y_node=y_node)
+            snr_values = list()
+
+            # move finger off of board
+            self.robot_controller.move(x_pt, y_pt, self._z_start - Z_OFFSET)
+
+            # calculate SNR for each index of the signals and noises
+            for i in range(len(signals)):
+                if noises[i] != 0:
+                    snr_values.append(signals[i] / noises[i])
                 else:
-                    edge_snr_values.append([centered_point, max_snr, raw_data])
-            is_core = False
+                    snr_values.append(0)
+            if debug:
+                print("Max SNR VALUE: " + str(max(snr_values)) + '\n')
+            # get touch coordinates centered to match the board
+            centered_point = self.convert_robot_to_screen_coordinates(touch_point['x'], touch_point['y'])
+            # save the SNR data in the point's place in the dxf order
+
+            max_snr = max(snr_values)
+            raw_data = (self.snr_figure_nodes(x_node, y_node, is_large_read=is_large_read), signals, noises)
+            values[group_index][point_index] = [centered_point, max_snr, raw_data]
+        core_snr_values, edge_snr_values = values
         return core_snr_values, edge_snr_values
 
     def snr_signal_test(self, x: float, y: float, noises: list, x_node=None, y_node=None, debug=False):
@@ -1350,7 +1547,7 @@ class TestManager:
             elif type(y_node) is not int:
                 raise ValueError("y_node is a " + str(type(y_node)) + " but needs to be an int.")
         # move finger onto board
-        self.robot_controller.move(x, y, self._z_start)
+        self.robot_controller.move(x, y, self.press_height(x, y))
         if x_node is None or y_node is None:
             x_node, y_node = self.snr_get_node_numbers(x, y)
         if debug:
@@ -1359,12 +1556,7 @@ class TestManager:
             print("##########################")
 
         # get signal samples
-        if is_large_read:
-            deltas = self.touch_controller.twenty_five_point_read(x_node, y_node, self._snr_num_signal_samples,
-                                                                       sleep_sec=self._snr_sec_between_touch)
-        else:
-            deltas = self.touch_controller.nine_point_read(x_node, y_node, self._snr_num_signal_samples,
-                                                                sleep_sec=self._snr_sec_between_touch)
+        deltas = self.snr_read_deltas(x_node, y_node, self._snr_num_signal_samples, is_large_read)
         self.robot_controller.move(x, y, self._z_start - Z_OFFSET)  # move finger off of board
         signals = list()
         index = 0
@@ -1401,7 +1593,7 @@ class TestManager:
         else:
             x_node, y_node = self.snr_get_node_numbers(x, y)
 
-        # move finger above board
+        # move finger above board (always the full Z_OFFSET, a finger hovering close to the board adds to the noise)
         self.robot_controller.move(x, y, self._z_start - Z_OFFSET, is_continuous=False)
 
         if debug:
@@ -1409,12 +1601,7 @@ class TestManager:
             print("Y NODE: " + str(y_node))
 
         # get noise samples
-        if large_read:
-            deltas = self.touch_controller.twenty_five_point_read(x_node, y_node, self._snr_num_noise_samples,
-                                                                      sleep_sec=self._snr_sec_between_touch)
-        else:
-            deltas = self.touch_controller.nine_point_read(x_node, y_node, self._snr_num_noise_samples,
-                                                               sleep_sec=self._snr_sec_between_touch)
+        deltas = self.snr_read_deltas(x_node, y_node, self._snr_num_noise_samples, large_read)
 
         noises = list()
         # get the noise for each node_data in deltas
@@ -1423,6 +1610,39 @@ class TestManager:
         # return noise = max(Nnf) - min(Nnf)
         return noises
 
+    def snr_read_deltas(self, x_node: int, y_node: int, samples: int, large_read=True) -> list:
+        """
+        reads the deltas of the 5x5 (or 3x3) square of nodes around a node, using the fastest read the touch
+        controller supports
+        :param x_node: X node at the center of the square
+        :param y_node: Y node at the center of the square
+        :param samples: number of times to read the deltas
+        :param large_read: bool representing if the 5x5 square is read instead of the 3x3 square
+        :return: list of lists of deltas, one list per node, in rows of increasing Y
+        """
+        if self.touch_controller.has_capability(CAPABILITY_NODE_READ):
+            if large_read:
+                return self.touch_controller.twenty_five_point_read(x_node, y_node, samples,
+                                                                    sleep_sec=self._snr_sec_between_touch)
+            return self.touch_controller.nine_point_read(x_node, y_node, samples,
+                                                         sleep_sec=self._snr_sec_between_touch)
+        if not self.touch_controller.has_capability(CAPABILITY_FRAME_READ):
+            raise errors.UnsupportedCapability(str(self.touch_controller.get_touch_controller_type()) +
+                                               " can't read node deltas.")
+
+        # cut the square out of whole delta frames, moved back onto the screen like the node reads do
+        radius = 2 if large_read else 1
+        x_node = min(max(x_node, radius), self._num_x_nodes - radius - 1)
+        y_node = min(max(y_node, radius), self._num_y_nodes - radius - 1)
+        deltas = [list() for _ in range((2 * radius + 1) ** 2)]
+        for _ in range(samples):
+            frame = self.touch_controller.get_delta_frame()
+            square = frame[x_node - radius:x_node + radius + 1, y_node - radius:y_node + radius + 1]
+            for index, delta in enumerate(square.T.ravel().tolist()):
+                deltas[index].append(delta)
+            time.sleep(self._snr_sec_between_touch)
+        return deltas
+
     def snr_get_node_numbers(self, x, y):
         """
         gets the node numbers to evaluate for a given X,Y coordinate pair
@@ -0,0 +1,159 @@
+import argparse
+import time
+
+import numpy as np
+
+from TouchController import TouchController, read_command, INFO_BLOCK_SIZE, CAPABILITY_RAW_RATE
+
+# percentiles printed for every measurement
+PERCENTILES = [50, 90, 99, 99.9]
+# width of the bars in the printed histograms
+HISTOGRAM_WIDTH = 40
+# Z distance (mm) the robot lifts the finger off the screen before and after holding a touch
+HOVER_HEIGHT = 30
+
+
+def print_histogram(name: str, samples_ms: np.ndarray, bins=10) -> None:
+    """
+    prints the percentiles and a text histogram of a set of measurements
+
+    :param name: name of the measurement
+    :param samples_ms: measurements (ms)
+    :param bins: number of bars in the histogram
+    :return: None
+    """
+    print(name + " (" + str(len(samples_ms)) + " samples)")
+    if not len(samples_ms):
+        print("    no samples")
+        return
+    values = np.percentile(samples_ms, PERCENTILES)
+    print("    " + "   ".join("p" + str(p) + ": " + format(v, ".3f") + " ms" for p, v in zip(PERCENTILES, values)))
+    print("    min: " + format(np.min(samples_ms), ".3f") + " ms   max: " + format(np.max(samples_ms), ".3f") +
+          " ms   std: " + format(np.std(samples_ms), ".3f") + " ms")
+
+    # clip to the 99.9th percentile so a single outlier doesn't squash every other bar
+    counts, edges = np.histogram(np.clip(samples_ms, None, values[-1]), bins=bins)
+    for count, low, high in zip(counts, edges[:-1], edges[1:]):
+        bar = "#" * int(round(HISTOGRAM_WIDTH * count / counts.max()))
+        print("    " + format(low, "9.3f") + " - " + format(high, "9.3f") + " ms | " + bar.ljust(HISTOGRAM_WIDTH) +
+              " " + str(count))
+
+
+def measure_round_trip(touch_controller: TouchController, iterations: int) -> np.ndarray:
+    """
+    times write_and_read with a small read of the information block (one USB round trip)
+
+    :param touch_controller: TouchController to measure
+    :param iterations: number of round trips to time
+    :return: round trip times (ms)
+    """
+    message = read_command(0x0000, INFO_BLOCK_SIZE)
+    samples = np.zeros(iterations)
+    for i in range(iterations):
+        start = time.perf_counter_ns()
+        touch_controller.write_and_read(message)
+        samples[i] = (time.perf_counter_ns() - start) / 1e6
+    return samples
+
+
+def measure_t44_poll(touch_controller: TouchController, iterations: int) -> np.ndarray:
+    """
+    times reading the number of messages waiting in the T5 object
+
+    :param touch_controller: TouchController to measure
+    :param iterations: number of polls to time
+    :return: poll times (ms)
+    """
+    samples = np.zeros(iterations)
+    for i in range(iterations):
+        start = time.perf_counter_ns()
+        touch_controller.num_messages_to_read()
+        samples[i] = (time.perf_counter_ns() - start) / 1e6
+    return samples
+
+
+def measure_reports(touch_controller: TouchController, window: float) -> np.ndarray:
+    """
+    reads touch reports with the background reader for a fixed window
+
+    :param touch_controller: TouchController to measure
+    :param window: seconds to read reports for
+    :return: array of reports read (dtype TOUCH_REPORT_DTYPE)
+    """
+    batches = list()
+    touch_controller.clear_buffer()
+    touch_controller.start_background_reader()
+    try:
+        end = time.monotonic() + window
+        while time.monotonic() < end:
+            batches.append(touch_controller.read_all_reports())
+    finally:
+        touch_controller.stop_background_reader()
+    return np.concatenate(batches)
+
+
+def run_benchmark(touch_controller: TouchController, window: float, iterations: int) -> None:
+    """
+    measures the USB round trip time, T44 poll cost, report rate and inter-report jitter and prints the results
+
+    :param touch_controller: TouchController to measure
+    :param window: seconds to read reports for
+    :param iterations: number of round trips and T44 polls to time
+    :return: None
+    """
+    print_histogram("write_and_read round trip", measure_round_trip(touch_controller, iterations))
+    print_histogram("T44 poll", measure_t44_poll(touch_controller, iterations))
+
+    reports = measure_reports(touch_controller, window)
+    print("reports: " + str(len(reports)) + " in " + str(window) + " s (" +
+          format(len(reports) / window, ".1f") + " reports/s)")
+    # reports read in the same transaction burst share a timestamp, so jitter is measured between bursts
+    timestamps = np.unique(reports['timestamp'])
+    print_histogram("inter-report interval", np.diff(timestamps) / 1e6)
+
+
+def main():
+    """
+    benchmarks a touch controller, either idle, with the robot holding a touch or against the simulator
+    :return: N/A
+    """
+    parser = argparse.ArgumentParser(description="measure touch report throughput and USB latency")
+    parser.add_argument("--window", type=float, default=10.0, help="seconds to read touch reports for")
+    parser.add_argument("--iterations", type=int, default=1000, help="round trips and T44 polls to time")
+    parser.add_argument("--hold", type=float, nargs=3, metavar=("X", "Y", "Z"),
+                        help="robot coordinates (mm) to hold a touch at while reading reports")
+    parser.add_argument("--raw-rate", action="store_true",
+                        help="read reports with the controller in raw-rate mode (no idle, no report filtering)")
+    parser.add_argument("--simulate", action="store_true", help="use a simulated controller instead of hardware")
+    parser.add_argument("--sim-latency", type=float, default=0.0005, help="seconds per simulated USB transaction")
+    parser.add_argument("--sim-rate", type=float, default=200.0, help="reports per second of the simulated touch")
+    args = parser.parse_args()
+
+    robot = None
+    if args.simulate:
+        from MaxTouchSimulator import SimulatedMaxTouchDevice
+        device = SimulatedMaxTouchDevice(latency=args.sim_latency)
+        touch_controller = TouchController(device=device)
+        if args.hold:
+            device.hold_touch(int(args.hold[0]), int(args.hold[1]), args.sim_rate)
+    else:
+        touch_controller = TouchController()
+        if args.hold:
+            from RobotController import RobotController
+            robot = RobotController()
+            x, y, z = args.hold
+            robot.move(x, y, z - HOVER_HEIGHT, is_continuous=False)
+            robot.move(x, y, z, is_continuous=False)
+
+    if args.raw_rate and touch_controller.has_capability(CAPABILITY_RAW_RATE):
+        touch_controller.start_raw_rate_mode()
+    try:
+        run_benchmark(touch_controller, args.window, args.iterations)
+    finally:
+        touch_controller.stop_raw_rate_mode()
+        if robot is not None:
+            robot.move(args.hold[0], args.hold[1], args.hold[2] - HOVER_HEIGHT, is_continuous=False)
+
+
+if __name__ == '__main__':
+    main()
@@ -1,4 +1,8 @@
+import abc
 import array
+import json
+import os
+import threading
 import time
 
 import numpy as np
@@ -93,17 +97,96 @@ ATMEL_IDS_TO_OBJECTS = {1: 'T6', 2: 'T68', 3: 'T15', 4: 'T19', 5: 'T25', 6: 'T46
 
 Z_OFFSET = 40
 
-
-def arr_to_list(arr: array) -> list:
-    """
-    changes a np array to a list
-    :param arr: array
-    :return: list of array contents
-    """
-    return_list = []
-    for i in arr:
-        return_list.append(i)
-    return return_list
+# USB vendor and product IDs of the supported touch controllers
+CONTROLLER_IDS = {"Microchip ATMXT1066T2": (0x03EB, 0x6123)}  # update this with more controllers
+
+# maXTouch memory map layout
+INFO_BLOCK_SIZE = 7  # family ID, variant ID, version, build, matrix X size, matrix Y size, number of objects
+OBJECT_ENTRY_SIZE = 6  # type, start address (LSB, MSB), size - 1, instances - 1, report IDs per instance
+MAX_READ_SIZE = 62  # most bytes that can be read in one transaction (64 byte response, 2 byte header)
+# object tables read from controllers, keyed by family, variant, firmware version, build and CRC.
+# kept next to this file so it's found no matter which directory the program is started from
+OBJECT_TABLE_CACHE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "object_table_cache.json")
+# objects the program needs to communicate with the controller
+REQUIRED_OBJECTS = ['T5', 'T6', 'T37', 'T44', 'T100']
+
+# values written to the diagnostic byte of the T6 object
+T37_PAGE_UP = 0x01
+T37_PAGE_DOWN = 0x02
+T37_DELTA_MODE = 0x10
+T37_REFERENCE_MODE = 0x11
+T37_SIGNAL_MODE = 0x12
+# data type of the values each diagnostic mode puts in the T37 object (deltas are signed, the rest aren't)
+T37_MODE_DTYPES = {T37_DELTA_MODE: '<i2', T37_REFERENCE_MODE: '<u2', T37_SIGNAL_MODE: '<u2'}
+# times the T37Navigator re-syncs with the controller's page before giving up
+MAX_T37_RESYNCS = 10
+
+# a single touch report decoded from a T5 message (and held by the TouchReportBuffer)
+TOUCH_REPORT_DTYPE = np.dtype([('timestamp', '<i8'), ('report_id', 'u1'), ('touch_id', 'u1'), ('event', 'u1'),
+                               ('x', '<u2'), ('y', '<u2'), ('area', 'u1'), ('amplitude', 'u1')])
+# frame stream files start with this header, followed by one (timestamp, frame) record per frame
+FRAME_STREAM_MAGIC = b'T37F'
+FRAME_STREAM_VERSION = 1
+FRAME_STREAM_HEADER_DTYPE = np.dtype([('magic', 'S4'), ('version', 'u1'), ('mode', 'u1'), ('x_nodes', '<u2'),
+                                      ('y_nodes', '<u2'), ('frames_per_second', '<f4')])
+
+# report ID the T5 object returns when there are no messages left to read
+T5_INVALID_REPORT_ID = 0xFF
+
+# seconds the buffered read_all_points waits for a report before returning an empty list
+BACKGROUND_READ_WAIT = .01
+# seconds get_touch_coordinate waits for a touch before giving up
+TOUCH_READ_TIMEOUT = 2
+# longest wait (seconds) between polls of the T44 object while waiting for a touch
+TOUCH_POLL_MAX_INTERVAL = .01
+
+# seconds to wait for a leftover response from an interrupted transaction
+FLUSH_TIMEOUT = .02
+# seconds between checks for the T6 messages sent while the controller resets
+RESET_POLL_INTERVAL = .005
+# seconds the controller has to report it's ready after a reset
+RESET_TIMEOUT = 2
+# USB timeout (ms) used until enough round trips have been timed, and the limits of the adaptive timeout
+DEFAULT_USB_TIMEOUT = 2000
+MIN_USB_TIMEOUT = 50
+MAX_USB_TIMEOUT = 2000
+# the adaptive USB timeout is this multiple of the 99th percentile round trip time
+TIMEOUT_P99_MULTIPLE = 10
+# number of recent round trip times the adaptive timeout is based on
+RTT_WINDOW = 256
+# round trips between updates of the adaptive timeout
+RTT_UPDATE_INTERVAL = 32
+# times a read is sent again after a bad response, and the backoff (seconds) before the first retry
+MAX_USB_RETRIES = 3
+RETRY_BACKOFF = .002
+# longest backoff (seconds) between retries, or between polls for a touch
+MAX_BACKOFF = .05
+# seconds after a message is sent that its transaction stops waiting for a late response and gives up
+USB_GIVE_UP_TIME = 4
+
+# capabilities a TouchDriver can advertise, so callers can pick the fastest path a controller supports
+CAPABILITY_BACKGROUND_READ = "background read"  # touch reports can be read on a background thread
+CAPABILITY_BURST_READ = "burst read"  # the message count and several messages are read in one transaction
+CAPABILITY_FRAME_READ = "frame read"  # whole delta, reference and signal frames can be read
+CAPABILITY_NODE_READ = "node read"  # deltas of a set of nodes can be read without reading the whole frame
+CAPABILITY_RAW_RATE = "raw rate"  # power saving and report filtering can be turned off for the highest report rate
+# TouchDriver methods a driver has to implement to advertise each capability
+CAPABILITY_METHODS = {CAPABILITY_FRAME_READ: ('read_frame', 'stream_frames'),
+                      CAPABILITY_NODE_READ: ('get_delta_at', 'read_nodes'),
+                      CAPABILITY_RAW_RATE: ('start_raw_rate', 'stop_raw_rate')}
+
+# T7 IDLEACQINT, ACTVACQINT and ACTV2IDLETO written in raw-rate mode: free-run acquisition while idle and active,
+# and never drop back to idle
+T7_RAW_RATE_CONFIG = [0xFF, 0xFF, 0xFF]
+# T100 MOVFILTER, MOVSMOOTH, MOVPRED (1 byte each), MOVHYSTI and MOVHYSTN (2 bytes each) written in raw-rate mode,
+# so every acquisition is reported without filtering, and a touch held still isn't held back by the movement hysteresis
+T100_MOVEMENT_OFFSET = 44
+T100_RAW_RATE_MOVEMENT_CONFIG = [0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00]
+
+# T6 status bytes sent in order while the controller resets
+T6_RESET_STATUS = 0x80
+T6_CALIBRATION_STATUS = 0x10
+T6_READY_STATUS = 0x00
 
 
 def binary_to_decimal(binary_string: str) -> int:
@@ -146,6 +229,172 @@ def twos_complement_to_decimal(bits: str) -> int:
     return value
 
 
+def read_command(address: int, num_bytes: int) -> array.array:
+    """
+    creates a message that reads from the controller's memory map.
+    messages are array.arrays, which pyusb sends without converting them first
+    :param address: memory address to start reading at
+    :param num_bytes: number of bytes to read (at most MAX_READ_SIZE)
+    :return: message to pass to write_and_read
+    """
+    return array.array('B', [0x51, 0x02, num_bytes, address & 0xFF, address >> 8])
+
+
+def write_command(address: int, data: list) -> array.array:
+    """
+    creates a message that writes to the controller's memory map
+    :param address: memory address to start writing at
+    :param data: list of bytes to write
+    :return: message to pass to write_and_read
+    """
+    # number of bytes to read needs to be non-zero, even for writes
+    return array.array('B', [0x51, 0x02 + len(data), 0x01, address & 0xFF, address >> 8] + list(data))
+
+
+def load_object_table_cache(filepath=OBJECT_TABLE_CACHE) -> dict:
+    """
+    loads the object tables saved from previous runs
+    :param filepath: path of the cache file
+    :return: dictionary of cached object tables, empty if there is no (readable) cache
+    """
+    try:
+        with open(filepath, 'r') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return dict()
+
+
+def save_object_table_cache(cache: dict, filepath=OBJECT_TABLE_CACHE) -> None:
+    """
+    saves object tables so the next run doesn't have to read them from the controller
+    :param cache: dictionary of object tables
+    :param filepath: path of the cache file
+    :return: None
+    """
+    try:
+        with open(filepath, 'w') as f:
+            json.dump(cache, f, indent=1)
+    except OSError:
+        pass  # the cache only speeds up startup, not being able to save it is fine
+
+
+def decode_t37_page(page_data, dtype='<i2') -> np.ndarray:
+    """
+    decodes the raw bytes of a T37 page into 16 bit values.
+    each value is 2 bytes, least significant byte first (in two's complement for deltas).
+    bytes-like page data is viewed rather than copied
+
+    :param page_data: bytes of the T37 page (bytes, bytearray, memoryview or list of ints)
+    :param dtype: data type of the values (EX: T37_MODE_DTYPES[T37_REFERENCE_MODE])
+    :return: array holding one value per node on the page
+    """
+    if not isinstance(page_data, (bytes, bytearray, memoryview)):
+        page_data = bytes(page_data)
+    return np.frombuffer(page_data, dtype=dtype)
+
+
+def decode_t5_messages(messages: list, status_report_id: int, first_touch_id: int, message_size: int,
+                       timestamp_ns=0) -> np.ndarray:
+    """
+    decodes a batch of T5 responses into touch reports in one vectorized pass.
+    screen status messages and messages at 0,0 are left out, the same as reading the messages one at a time.
+    a T100 touch message is the report ID, status (low 4 bits are the event), X (LSB, MSB), Y (LSB, MSB),
+    then the auxiliary data enabled in T100 TCHAUX (amplitude followed by area)
+
+    :param messages: list (or 2D array) of T5 responses, formatted the same as the response to reading the T5 object
+    :param status_report_id: report ID of the T100 screen status message
+    :param first_touch_id: report ID of the first T100 touch
+    :param message_size: bytes in one T5 message (the T5 object's size without its checksum byte)
+    :param timestamp_ns: time.monotonic_ns() timestamp of when the messages were read
+    :return: array of reports (dtype TOUCH_REPORT_DTYPE)
+    """
+    if not len(messages):
+        return np.zeros(0, dtype=TOUCH_REPORT_DTYPE)
+    if isinstance(messages, np.ndarray):
+        raw = messages[:, 2:2 + message_size].astype(np.uint8, copy=False)
+    else:
+        # joining the report bytes of every message is much faster than converting a list of lists
+        raw = np.frombuffer(b''.join([bytes(message[2:2 + message_size]) for message in messages]),
+                            dtype=np.uint8).reshape(-1, message_size)
+    x_vals = raw[:, 2] | (raw[:, 3].astype(np.uint16) << 8)
+    y_vals = raw[:, 4] | (raw[:, 5].astype(np.uint16) << 8)
+    keep = (raw[:, 0] != status_report_id) & ((x_vals != 0) | (y_vals != 0))
+
+    reports = np.zeros(np.count_nonzero(keep), dtype=TOUCH_REPORT_DTYPE)
+    reports['timestamp'] = timestamp_ns
+    reports['report_id'] = raw[keep, 0]
+    reports['touch_id'] = raw[keep, 0] - np.uint8(first_touch_id)  # wraps for messages that aren't touches
+    reports['event'] = raw[keep, 1] & 0x0F
+    reports['x'] = x_vals[keep]
+    reports['y'] = y_vals[keep]
+    reports['amplitude'] = raw[keep, 6]
+    reports['area'] = raw[keep, 7]
+    return reports
+
+
+def frame_stream_record_dtype(mode: int, x_nodes: int, y_nodes: int) -> np.dtype:
+    """
+    :param mode: diagnostic mode the frames were captured in
+    :param x_nodes: number of nodes in the X direction
+    :param y_nodes: number of nodes in the Y direction
+    :return: data type of one record of a frame stream file
+    """
+    return np.dtype([('timestamp', '<i8'), ('frame', T37_MODE_DTYPES[mode], (x_nodes, y_nodes))])
+
+
+def load_frame_stream(filepath: str) -> tuple:
+    """
+    loads a file written by TouchController.stream_frames
+
+    :param filepath: path of the file
+    :return: (header, timestamps, frames), where header is a dictionary of the file's header,
+             timestamps is an array of time.monotonic_ns() timestamps and frames is an array shaped
+             (number of frames, x nodes, y nodes)
+    :raises: InvalidInput if the file isn't a frame stream
+    """
+    with open(filepath, 'rb') as f:
+        header = np.fromfile(f, dtype=FRAME_STREAM_HEADER_DTYPE, count=1)
+        if not len(header) or header['magic'][0] != FRAME_STREAM_MAGIC:
+            raise InvalidInput(filepath + " is not a frame stream file.")
+        header = {name: header[name][0].item() for name in FRAME_STREAM_HEADER_DTYPE.names}
+        records = np.fromfile(f, dtype=frame_stream_record_dtype(header['mode'], header['x_nodes'],
+                                                                 header['y_nodes']))
+    return header, records['timestamp'], records['frame']
+
+
+def find_all_touch_controllers(controller_name="Microchip ATMXT1066T2", known=None) -> list:
+    """
+    creates a TouchController for every connected controller of a type (EX: every sensor in a multi-DUT fixture)
+
+    :param controller_name: name of the touch controller to look for
+    :param known: TouchControllers already talking to some of the controllers, returned instead of opening
+                  their devices a second time
+    :return: list of TouchControllers sorted by USB bus and port
+    :raises: NoDeviceError if no controllers are connected
+    """
+    backend = usb.backend.libusb1.get_backend(find_library=lambda q: "libusb-1.0.dll")
+    devices = list(usb.core.find(find_all=True, idVendor=CONTROLLER_IDS[controller_name][0],
+                                 idProduct=CONTROLLER_IDS[controller_name][1], backend=backend))
+    if not devices:
+        raise NoDeviceError('Device not found')
+
+    # created one at a time, since each constructor resets its controller and may update the object table cache
+    devices.sort(key=usb_location)
+    known = {tc.get_usb_location(): tc for tc in known or list()}
+    return [known.get(usb_location(device)) or TouchController(device=device, controller_name=controller_name)
+            for device in devices]
+
+
+def usb_location(dev) -> tuple:
+    """
+    gets where a device is plugged in, which stays the same for a fixture slot across reconnects
+
+    :param dev: device
+    :return: (bus number, tuple of port numbers from the root hub to the device)
+    """
+    return dev.bus, tuple(dev.port_numbers or ())
+
+
 def device_info(dev) -> None:
     """
     prints device info, debugging method
@@ -166,72 +415,1204 @@ def device_info(dev) -> None:
     print(dev.configurations())
 
 
-class TouchController:
+class T37Navigator:
+    """
+    reads pages of the T37 diagnostic object while keeping track of which diagnostic mode and page the
+    controller is on. pages are reached with the fewest page up/page down commands from the current page,
+    the controller's page is only re-synced when a read shows it's not where it was expected to be,
+    and the diagnostic mode stays enabled between reads until release() is called
+    """
 
-    def __init__(self):
+    def __init__(self, write_and_read, diagnostic_address: int, t37_address: int, t37_size: int):
         """
-        creates a TouchController object, doesn't take any parameters other than self
+        creates a T37Navigator
+
+        :param write_and_read: function that sends a message to the controller and returns a view of its response,
+                               which the next call overwrites
+        :param diagnostic_address: memory address of the diagnostic byte of the T6 object
+        :param t37_address: memory address of the T37 object
+        :param t37_size: size of the T37 object
         """
-        # USB\VID_03EB&PID_6123&REV_0054
-        self._controller_name = "Microchip ATMXT1066T2"
-        self._ids = {"Microchip ATMXT1066T2": (0x03EB, 0x6123)}  # update this with more controllers
+        self._write_and_read = write_and_read
+        self._diagnostic_address = diagnostic_address
+        self._page_up_msg = write_command(diagnostic_address, [T37_PAGE_UP])
+        self._page_down_msg = write_command(diagnostic_address, [T37_PAGE_DOWN])
+        self._disable_msg = write_command(diagnostic_address, [0x00])
+        # the T37 object is split into three reads (mode & page bytes + 60 bytes of data, 62 bytes, the rest)
+        # the last read stops at the end of the T37 object so it can't pop messages out of the T5 object
+        self._read_1_msg = read_command(t37_address, MAX_READ_SIZE)
+        self._read_2_msg = read_command(t37_address + MAX_READ_SIZE, MAX_READ_SIZE)
+        self._read_3_msg = read_command(t37_address + 2 * MAX_READ_SIZE,
+                                        min(t37_size - 2 * MAX_READ_SIZE, MAX_READ_SIZE))
+        self._mode_msgs = dict()
+        self._mode = None  # None means the controller's diagnostic mode is unknown
+        self._page = 0
+
+    def capture(self, mode=T37_DELTA_MODE) -> None:
+        """
+        writes a diagnostic mode to the T6 object, which makes the controller capture a new set of data
+        into the T37 object and go back to page 0
 
-        # messages for atmel touch controller
-        self._t5_msg = np.array([0x51, 0x02, 0x0A, 0x89, 0x01], dtype=np.uint8)
-        self._t44_msg = np.array([0x51, 0x02, 0x01, 0x88, 0x01], dtype=np.uint8)
-        # get the backend
-        self._backend = usb.backend.libusb1.get_backend(find_library=lambda q: "libusb-1.0.dll")
+        :param mode: diagnostic mode to capture (EX: T37_DELTA_MODE)
+        :return: None
+        """
+        if mode not in self._mode_msgs:
+            self._mode_msgs[mode] = write_command(self._diagnostic_address, [mode])
+        self._write_and_read(self._mode_msgs[mode])
+        self._mode = mode
+        self._page = 0
 
-        # find our self._device
-        self._device = usb.core.find(idVendor=self._ids[self._controller_name][0],
-                                     idProduct=self._ids[self._controller_name][1],
-                                     backend=self._backend)
-        # was it found?
-        if self._device is None:
-            raise NoDeviceError('Device not found')
+    def forget(self) -> None:
+        """
+        forgets the controller's diagnostic mode and page (call after the controller is reset)
+        :return: None
+        """
+        self._mode = None
+        self._page = 0
 
-        self.reset()  # reset the board on instantiation
-        self._device.set_configuration()  # set the active configuration.
+    def get_mode(self):
+        """
+        :return: the diagnostic mode the controller is in, 0 if disabled, None if unknown
+        """
+        return self._mode
+
+    def read_page(self, page_num: int, page_size=128) -> bytearray:
+        """
+        goes to a page of the T37 object and reads all of its data.
+        captures deltas first if no diagnostic mode is enabled
+
+        :param page_num: page number of the T37 to read
+        :param page_size: size of the page
+        :return: bytearray of data gathered from the page
+        :raises: ReadFailError if the controller can't be brought to the page
+        """
+        if not self._mode:
+            self.capture()
+
+        for i in range(MAX_T37_RESYNCS):
+            self._step_to(page_num)
+            ans = self._write_and_read(self._read_1_msg)  # get first section of data
+            if ans[2] == self._mode and ans[3] == page_num:
+                break
+            # the controller can take a moment to change pages, read once more before re-syncing
+            ans = self._write_and_read(self._read_1_msg)
+            if ans[2] == self._mode and ans[3] == page_num:
+                break
+            if ans[2] != self._mode:
+                self.capture(self._mode)  # controller left the mode (EX: it was reset), start over
+            else:
+                self._page = ans[3]  # re-sync with the page the controller is actually on
+        else:
+            raise ReadFailError("Unable to get to page " + str(page_num) + " of the T37 object.")
+
+        page_data = bytearray(ans[4:])  # copy 60 bytes from message (page_data is now len(60) )
+        ans = self._write_and_read(self._read_2_msg)  # get second section of data
+        page_data.extend(ans[2:])  # get 62 bytes from message (page_data is now len(122) )
+        ans = self._write_and_read(self._read_3_msg)  # get third section of data
+        end_index = page_size - len(page_data) + 2  # get the end index to read from in the line below
+        page_data.extend(ans[2:end_index])  # get enough bytes from message to make len(page_data) = page_size
+        return page_data
+
+    def release(self) -> None:
+        """
+        disables the diagnostic mode of the controller (does nothing if it's already known to be disabled)
+        :return: None
+        """
+        if self._mode != 0:
+            self._write_and_read(self._disable_msg)
+            self._mode = 0
+            self._page = 0
+
+    def _step_to(self, page_num: int) -> None:
+        """
+        pages up or down from the current page to a page
+        :param page_num: page to go to
+        :return: None
+        """
+        while self._page < page_num:
+            self._write_and_read(self._page_up_msg)
+            self._page += 1
+        while self._page > page_num:
+            self._write_and_read(self._page_down_msg)
+            self._page -= 1
+
+
+class TransportPolicy:
+    """
+    decides the USB timeout and retries of the TouchController's transactions.
+    the timeout is a multiple of the 99th percentile of recent round trip times, so a late
+    response costs a few milliseconds instead of seconds. a response that times out is waited on
+    again with bounded exponential backoff until the give up time, reads with a bad response are
+    sent again up to max_retries times, and every retry and failure is counted
+    """
+
+    def __init__(self, max_retries=MAX_USB_RETRIES, backoff=RETRY_BACKOFF, p99_multiple=TIMEOUT_P99_MULTIPLE,
+                 give_up_time=USB_GIVE_UP_TIME):
+        """
+        creates a TransportPolicy
+
+        :param max_retries: times a read with a bad response is sent again before the error is raised
+        :param backoff: seconds to wait before the first retry (doubles every retry)
+        :param p99_multiple: multiple of the 99th percentile round trip time used as the timeout
+        :param give_up_time: seconds after a message is sent that its response stops being waited on
+        """
+        self.max_retries = max_retries
+        self.give_up_time = give_up_time
+        self._backoff = backoff
+        self._p99_multiple = p99_multiple
+        self._rtt = np.zeros(RTT_WINDOW)  # ring of recent round trip times (seconds)
+        self._num_rtt = 0
+        self._p99 = None
+        self._timeout = DEFAULT_USB_TIMEOUT
+        self._retries = dict()
+        self._failures = dict()
+
+    def count_failure(self, error: Exception) -> None:
+        """
+        counts a transaction that failed after its retries (or couldn't be retried)
+        :param error: error that was raised
+        :return: None
+        """
+        name = type(error).__name__
+        self._failures[name] = self._failures.get(name, 0) + 1
+
+    def count_retry(self, error: Exception) -> None:
+        """
+        counts a retried transaction
+        :param error: error that caused the retry
+        :return: None
+        """
+        name = type(error).__name__
+        self._retries[name] = self._retries.get(name, 0) + 1
+
+    def get_backoff(self, attempt: int) -> float:
+        """
+        :param attempt: number of retries already made
+        :return: seconds to wait before the next retry
+        """
+        return min(self._backoff * 2 ** attempt, MAX_BACKOFF)
+
+    def get_stats(self) -> dict:
+        """
+        :return: dictionary of the timeout (ms), 99th percentile round trip time (ms),
+                 number of timed round trips, and retries and failures counted by error
+        """
+        return {'timeout': self._timeout, 'p99_rtt': None if self._p99 is None else self._p99 * 1000,
+                'round_trips': self._num_rtt, 'retries': dict(self._retries), 'failures': dict(self._failures)}
+
+    def get_timeout(self) -> int:
+        """
+        :return: USB timeout (ms) to use for the next transaction
+        """
+        return self._timeout
+
+    def record(self, rtt: float) -> None:
+        """
+        records the round trip time of a successful transaction, updating the timeout every RTT_UPDATE_INTERVAL
+        :param rtt: round trip time (seconds)
+        :return: None
+        """
+        self._rtt[self._num_rtt % RTT_WINDOW] = rtt
+        self._num_rtt += 1
+        if self._num_rtt % RTT_UPDATE_INTERVAL == 0:
+            self._p99 = float(np.percentile(self._rtt[:min(self._num_rtt, RTT_WINDOW)], 99))
+            timeout = int(self._p99 * self._p99_multiple * 1000)
+            self._timeout = min(max(timeout, MIN_USB_TIMEOUT), MAX_USB_TIMEOUT)
+
+
+class TouchReportBuffer:
+    """
+    bounded ring buffer of touch reports, filled by the TouchController's background reader.
+
+    storage is preallocated, so adding a report never allocates memory. once the buffer is
+    full the oldest reports are overwritten (and counted as dropped)
+    """
+
+    def __init__(self, capacity=4096):
+        """
+        creates an empty TouchReportBuffer
+        :param capacity: maximum number of reports held at once
+        """
+        self._reports = np.zeros(capacity, dtype=TOUCH_REPORT_DTYPE)
+        self._capacity = capacity
+        self._start = 0  # index of the oldest report
+        self._count = 0  # number of reports currently held
+        self._dropped = 0  # number of reports overwritten before they were read
+        self._condition = threading.Condition()
+
+    def __len__(self):
+        """
+        :return: number of reports currently in the buffer
+        """
+        with self._condition:
+            return self._count
+
+    def clear(self) -> None:
+        """
+        discards every report in the buffer
+        :return: None
+        """
+        with self._condition:
+            self._start = self._count = 0
+
+    def drain(self, timeout=0.0) -> np.ndarray:
+        """
+        removes and returns every report in the buffer, oldest first
+        :param timeout: seconds to wait for a report if the buffer is empty
+        :return: array of reports (dtype TOUCH_REPORT_DTYPE)
+        """
+        with self._condition:
+            if not self._count and timeout > 0:
+                self._condition.wait(timeout)
+            end = self._start + self._count
+            if end <= self._capacity:
+                reports = self._reports[self._start:end].copy()
+            else:
+                reports = np.concatenate((self._reports[self._start:], self._reports[:end - self._capacity]))
+            self._start = self._count = 0
+            return reports
+
+    def get_dropped(self) -> int:
+        """
+        :return: number of reports that were overwritten before they could be read
+        """
+        return self._dropped
+
+    def extend(self, reports: np.ndarray) -> None:
+        """
+        adds reports to the buffer, overwriting the oldest reports if the buffer is full
+        :param reports: array of reports (dtype TOUCH_REPORT_DTYPE)
+        :return: None
+        """
+        num_reports = len(reports)
+        if not num_reports:
+            return
+        with self._condition:
+            if num_reports >= self._capacity:
+                # only the newest reports fit, everything already held is overwritten
+                self._dropped += self._count + num_reports - self._capacity
+                self._reports[:] = reports[-self._capacity:]
+                self._start = 0
+                self._count = self._capacity
+            else:
+                index = (self._start + self._count) % self._capacity
+                first = min(num_reports, self._capacity - index)
+                self._reports[index:index + first] = reports[:first]
+                self._reports[:num_reports - first] = reports[first:]
+                overflow = max(self._count + num_reports - self._capacity, 0)
+                self._start = (self._start + overflow) % self._capacity  # oldest reports were overwritten
+                self._dropped += overflow
+                self._count += num_reports - overflow
+            self._condition.notify_all()
+
+
+class TouchDriver(abc.ABC):
+    """
+    talks to one kind of touch controller for a TouchController. every driver implements the abstract methods,
+    and advertises the optional features it implements in capabilities (see CAPABILITY_METHODS).
+    the optional methods raise UnsupportedCapability unless the driver overrides them
+    """
+
+    def __init__(self, device, transport_policy):
+        """
+        creates a TouchDriver
+
+        :param device: USB device of the touch controller
+        :param transport_policy: TransportPolicy the driver's USB transactions follow
+        """
+        self._device = device
+        self._transport_policy = transport_policy
+        self.capabilities = frozenset()
+
+    def check_capabilities(self) -> None:
+        """
+        makes sure the driver implements the methods of every capability it advertises
+        :return: None
+        :raises: UnsupportedCapability if an advertised capability's methods aren't implemented
+        """
+        for capability in self.capabilities:
+            for method in CAPABILITY_METHODS.get(capability, ()):
+                if getattr(type(self), method) is getattr(TouchDriver, method):
+                    raise UnsupportedCapability(type(self).__name__ + " advertises " + capability +
+                                                " but doesn't implement " + method + ".")
+
+    @abc.abstractmethod
+    def clear_buffer(self) -> None:
+        """
+        reads all messages left in the controller to clear the buffer
+        :return: None
+        """
+
+    def get_delta_at(self, x_node: int, y_node: int, page_size=128):
+        """
+        :param x_node: X node
+        :param y_node: Y node
+        :param page_size: size of a diagnostic page
+        :return: delta value of the node
+        """
+        raise UnsupportedCapability(type(self).__name__ + " can't read node deltas.")
+
+    @abc.abstractmethod
+    def get_range(self, debug=False):
+        """
+        :param debug: bool determining if debug data is output to the console
+        :return: X and Y ranges of the touch screen
+        """
+
+    @abc.abstractmethod
+    def get_touch_coordinate(self) -> list:
+        """
+        :return: [x, y] screen coordinate of the current touch
+        """
+
+    @abc.abstractmethod
+    def num_messages_to_read(self) -> int:
+        """
+        :return: number of messages waiting to be read
+        """
+
+    def read_frame(self, mode: int, page_size=128) -> np.ndarray:
+        """
+        :param mode: diagnostic mode (EX: T37_DELTA_MODE)
+        :param page_size: size of a diagnostic page
+        :return: X by Y array of node values
+        """
+        raise UnsupportedCapability(type(self).__name__ + " can't read frames.")
+
+    def read_nodes(self, nodes: list, iterations: int, sleep_sec: float, page_size=128) -> list:
+        """
+        :param nodes: list of (x, y) nodes to read
+        :param iterations: number of times to read deltas
+        :param sleep_sec: number of seconds to sleep between each read
+        :param page_size: size of a diagnostic page
+        :return: list of lists of deltas, one list per node
+        """
+        raise UnsupportedCapability(type(self).__name__ + " can't read node deltas.")
+
+    @abc.abstractmethod
+    def read_reports(self) -> np.ndarray:
+        """
+        reads the touch reports waiting in the controller. the background reader calls this on its own thread
+        :return: array of touch reports (dtype TOUCH_REPORT_DTYPE)
+        """
+
+    @abc.abstractmethod
+    def read_touch_point(self, num_messages_to_read: int, debug=False) -> list:
+        """
+        :param num_messages_to_read: number of messages to read
+        :param debug: bool determining if debug data is output to the console
+        :return: [x, y] screen coordinate of the touch read
+        """
+
+    @abc.abstractmethod
+    def reset(self) -> float:
+        """
+        resets the controller and waits for it to be ready
+        :return: seconds from the reset command until the controller was ready
+        """
+
+    def start_raw_rate(self) -> None:
+        """
+        saves the controller's power and filter settings, then switches it to its highest report rate
+        :return: None
+        """
+        raise UnsupportedCapability(type(self).__name__ + " doesn't have a raw-rate mode.")
+
+    def stop_raw_rate(self) -> None:
+        """
+        restores the power and filter settings saved by start_raw_rate
+        :return: None
+        """
+        raise UnsupportedCapability(type(self).__name__ + " doesn't have a raw-rate mode.")
+
+    def stream_frames(self, filepath: str, num_frames: int, frames_per_second: float, mode=T37_DELTA_MODE,
+                      page_size=128) -> int:
+        """
+        :param filepath: file to write the frames to
+        :param num_frames: number of frames to capture
+        :param frames_per_second: rate to capture frames at
+        :param mode: diagnostic mode (EX: T37_DELTA_MODE)
+        :param page_size: size of a diagnostic page
+        :return: number of frames written
+        """
+        raise UnsupportedCapability(type(self).__name__ + " can't read frames.")
+
+    @abc.abstractmethod
+    def write_and_read(self, message: array.array, timeout=None, debug=False) -> memoryview:
+        """
+        :param message: message to send to the controller
+        :param timeout: USB timeout (ms), None to use the adaptive timeout
+        :param debug: bool determining if debug data is output to the console
+        :return: view of the response from the controller, which the thread's next write_and_read may overwrite
+        """
+
+
+class AtmelDriver(TouchDriver):
+    """
+    driver for Microchip maXTouch controllers. the object table is read when the driver is created,
+    and every object is reached through the addresses found in it
+    """
+
+    def __init__(self, device, transport_policy):
+        """
+        creates an AtmelDriver
+
+        :param device: USB device of the touch controller
+        :param transport_policy: TransportPolicy the driver's USB transactions follow
+        """
+        super().__init__(device, transport_policy)
+        # only one USB transaction can happen at a time (the background reader shares the device)
+        self._usb_lock = threading.Lock()
+        # each thread reads responses into its own preallocated buffer (see write_and_read)
+        self._response_buffers = threading.local()
+        self._stale_response = False  # a response may arrive after its transaction gave up
+        self._t5_range = None  # (start, end) addresses of the T5 object, found with the object table
+        self._raw_rate_snapshot = None  # (address, saved bytes) of each setting changed by raw-rate mode
+
+        # find where every object is in the controller's memory, then create the messages used to talk to them
+        self._objects = self._read_object_table()
+        self._create_messages()
+        self._create_node_map()
         try:
-            t6_disable_debug = np.array([0x51, 0x03, 0x01, 0x99, 0x01, 0x00], dtype=np.uint8)
-            self.write_and_read(t6_disable_debug)
-        except errors.ZeroIndexInvalid:
+            self._t37_navigator.release()
+        except ZeroIndexInvalid:
             pass
 
-        zero_block_ans = self.write_and_read(np.array([0x51, 0x02, 0x0A, 0x00, 0x00], dtype=np.uint8))
-        num_x_nodes = zero_block_ans[6]
-        num_y_nodes = zero_block_ans[7]
-        self._board_num_x_nodes = None
-        self._board_num_y_nodes = None
+        capabilities = {CAPABILITY_BACKGROUND_READ, CAPABILITY_FRAME_READ, CAPABILITY_NODE_READ}
+        if self._t44_t5_msg is not None:  # T44 sits right before T5, so both can be read together
+            capabilities.add(CAPABILITY_BURST_READ)
+        if 'T7' in self._objects:  # power configuration
+            capabilities.add(CAPABILITY_RAW_RATE)
+        self.capabilities = frozenset(capabilities)
+
+    def clear_buffer(self):
+        """
+        reads all data left out of the T5 object to clear the buffer
+        :return: None
+        """
+        # one pass reads everything the T44 object counted (a single transaction when there are no messages)
+        self._read_messages()
+
+    def get_delta_at(self, x_node: int, y_node: int, page_size=128):
+        """
+        gets the delta value at a specified node crossing
+
+        :param x_node: x node to evaluate
+        :param y_node: y node to evaluate
+        :param page_size: page size of the T37 object (typically 128< i'm unaware of cases where it is not 128)
+        :return: twos complement calculation of the data indices representing the delta of the node crossing
+        """
+        # IMPORTANT:
+        # the data is organized into pages, each page contains data regarding the input signals
+        # of the board in specific locations. the data is sent in order, so all data regarding the
+        # first row of X is followed by all data regarding the second row of x, and so on.
+        # there will likely be more possible nodes  to be sent than actual nodes on the touchscreen being
+        # tested, so many 0 will follow each row's data (the default is 26 possible nodes in the X direction)
+
+        # all_page_data = self.t37_read_all_data_DEBUG()
+
+        data_index = self._data_indices[(x_node, y_node)]
+        page_number = self._page_numbers[(x_node, y_node)]
+        ans = self._t37_read_page(page_number, page_size=page_size)
+
+        return int(decode_t37_page(ans)[data_index // 2])
+
+    def get_range(self, debug=False):
+        """
+        gets the ranges of the screen in both the X and Y direction
+
+        :param debug: bool for developers to get output in console, remains false unless you want debug info
+        :return: x range, y range
+        """
+        # these represent the index of the return message that indicates the
+        # ls and ms bytes for x and y range, respectively
+        ls_x_index = 15
+        ms_x_index = 16
+        ls_y_index = 26
+        ms_y_index = 27
+
+        retry = 10
+
+        while True:
+            resp = self.write_and_read(self._t100_msg)
+            # get X range bytes
+            ls_x = resp[ls_x_index]
+            ms_x = resp[ms_x_index]
+            shifted_ms_x = ms_x << 8  # shift most significant byte
+            x_rng = shifted_ms_x + ls_x
+            # get Y range bytes
+            ls_y = resp[ls_y_index]
+            ms_y = resp[ms_y_index]
+            shifted_ms_y = ms_y << 8  # shift most significant byte
+            y_rng = shifted_ms_y + ls_y
+
+            if x_rng != 0 and y_rng != 0:
+                if debug:
+                    print(" RANGE: (" + str(x_rng) + ", " + str(y_rng) + ")")
+                return x_rng, y_rng
+            else:
+                retry -= 1
+                if retry <= 0:
+                    raise ZeroIndexInvalid("Unable to determine range of the touch controller.")
+
+    def get_touch_coordinate(self) -> list:
+        """
+        gets the current estimated input from the touch controller
+        :return: touch coordinate
+        """
+        cont = True
+        empty_polls = 0
+        deadline = time.monotonic() + TOUCH_READ_TIMEOUT
+        retval = None
+
+        while cont:
+            messages = self._read_messages()
+            msgs_to_read = len(messages)
+
+            if msgs_to_read != 0:
+                # raise exception of reading wrong thing if response has wacky value
+                if msgs_to_read > 12:
+                    raise Exception(
+                        "Response read wrong thing. number of messages its wrongly going to read: " + str(msgs_to_read))
+                retval = self._parse_touch_point(messages)
+                if retval[0] is not None and retval[1] is not None:
+                    cont = False
+            else:
+                if time.monotonic() >= deadline:
+                    raise NoInputFromController("cannot read this touch coordinate, damn")
+                # back off between empty polls rather than spinning on the USB bus
+                time.sleep(min(RETRY_BACKOFF * 2 ** empty_polls, TOUCH_POLL_MAX_INTERVAL))
+                empty_polls += 1
+
+        return retval
+
+    def num_messages_to_read(self) -> int:
+        """
+        gets the number of messages to read from the T44 object
+        :return: integer representing the number of messages to read
+        """
+        whole_ans = self.write_and_read(self._t44_msg, debug=True)
+        ans = whole_ans[2]
+        return ans
+
+    def read_frame(self, mode: int, page_size=128) -> np.ndarray:
+        """
+        captures the value of every node on the screen in one sweep of the T37 pages
+
+        :param mode: diagnostic mode to capture (EX: T37_DELTA_MODE)
+        :param page_size: page size of the T37 object
+        :return: array of values shaped (num_x_nodes, num_y_nodes), indexed frame[x, y]
+        """
+        try:
+            return self._read_frame(mode, page_size)
+        finally:
+            self._t37_navigator.release()
+
+    def read_nodes(self, nodes: list, iterations: int, sleep_sec: float, page_size=128) -> list:
+        """
+        reads the deltas of several nodes a number of times
+
+        :param nodes: list of (x, y) nodes to read
+        :param iterations: number of times to read deltas
+        :param sleep_sec: number of seconds to sleep between each read
+        :param page_size: size of the T37 page
+        :return: list of lists of deltas, one list per node
+        """
+        # create list of lists containing the deltas from each node connection
+        ret_deltas = [list() for _ in range(len(nodes))]
+
+        try:
+            # run iteration amount of times
+            for i in range(iterations):
+                # capture a new set of deltas, then read every page the nodes sit on once
+                self._t37_navigator.capture(T37_DELTA_MODE)
+                deltas = self._t37_read_nodes(nodes, page_size)
+                for ret_deltas_index in range(len(nodes)):
+                    ret_deltas[ret_deltas_index].append(deltas[ret_deltas_index])  # save delta value
+                time.sleep(sleep_sec)
+        finally:
+            self._t37_navigator.release()  # disable debug after getting all iterations of the nodes' data
+        return ret_deltas
+
+    def read_reports(self) -> np.ndarray:
+        """
+        reads all touch reports waiting in the T5 object of the maxtouch controller
+        :return: array of reports (dtype TOUCH_REPORT_DTYPE)
+        """
+        messages = self._read_messages()
+        return self._reports_from_messages(messages, time.monotonic_ns())
+
+    def read_touch_point(self, num_messages_to_read: int, debug=False) -> list:
+        """
+        gets the touch point in screen units (NOT mm !!!)
+
+        :param num_messages_to_read: number of messages to read from the T5 object
+        :param debug: determines if debug output is printed (default False)
+        :return: tuple of (x_val, y_val)
+        """
+        return self._parse_touch_point(self._read_t5_messages(num_messages_to_read), debug)
+
+    def reset(self) -> float:
+        """
+        resets the touch controller and polls the T6 messages until it reports it's ready
+        :return: seconds from the reset command until the controller was ready
+        """
+        # t6_reset message outline:
+        # 0x51 - standard first byte to send
+        # 0x03 - writing 3 bytes, 2 for address, 1 for signaling a reset
+        # 0x01 - needs to be non-zero (No idea why)
+        # LS byte of the T6 address
+        # MS byte of the T6 address
+        # 0x01 - value to write to byte 0 of the T6
+        # throw away a response left over from an interrupted transaction
+        with self._usb_lock:
+            self._flush_response()
+
+        self.write_and_read(self._t6_reset_msg)
+        self._raw_rate_snapshot = None  # the controller reloads its saved configuration
+        start = time.monotonic()
+        deadline = start + RESET_TIMEOUT
+        self._t37_navigator.forget()  # reset takes the controller out of diagnostic mode
+
+        # poll for the T6 messages until the controller reports it's ready, rather than sleeping a fixed time
+        reset_msgs = list()
+        while T6_READY_STATUS not in reset_msgs:
+            if time.monotonic() > deadline:
+                raise NoInputFromController("Touch controller wasn't ready " + str(RESET_TIMEOUT) +
+                                            " seconds after being reset.")
+            try:
+                msgs = self._read_messages()
+            except (usb.core.USBError, ZeroIndexInvalid):
+                msgs = list()  # the controller may not answer while it's resetting
+            for msg in msgs:
+                if msg[2] == self._t6_report_id:
+                    reset_msgs.append(msg[3])
+            if not msgs:
+                time.sleep(RESET_POLL_INTERVAL)
+        latency = time.monotonic() - start
+
+        if reset_msgs[0] != T6_RESET_STATUS:
+            raise Exception("Reset not properly set")
+        if reset_msgs[1] != T6_CALIBRATION_STATUS:
+            raise Exception("Orientation not properly set")
+        if reset_msgs[2] != T6_READY_STATUS:
+            raise Exception("End not properly set")
+
+        return latency
+
+    def start_raw_rate(self) -> None:
+        """
+        saves the T7 power configuration and T100 movement filter, then writes the raw-rate settings over them.
+        nothing is written to T6 BACKUPNV, so the saved configuration on the controller is never changed
+        :return: None
+        """
+        if self._raw_rate_snapshot is not None:
+            return
+        settings = [(self._objects['T7']['address'], T7_RAW_RATE_CONFIG),
+                    (self._objects['T100']['address'] + T100_MOVEMENT_OFFSET, T100_RAW_RATE_MOVEMENT_CONFIG)]
+        self._raw_rate_snapshot = [(address, list(self._read_memory(address, len(data))))
+                                         for address, data in settings]
+        for address, data in settings:
+            self.write_and_read(write_command(address, data))
+
+    def stop_raw_rate(self) -> None:
+        """
+        writes back the settings saved by start_raw_rate
+        :return: None
+        """
+        if self._raw_rate_snapshot is None:
+            return
+        for address, data in reversed(self._raw_rate_snapshot):
+            self.write_and_read(write_command(address, data))
+        self._raw_rate_snapshot = None
+
+    def stream_frames(self, filepath: str, num_frames: int, frames_per_second: float, mode=T37_DELTA_MODE,
+                      page_size=128) -> int:
+        """
+        captures frames at a fixed rate and writes them to a binary file
+
+        :param filepath: path of the file to write
+        :param num_frames: number of frames to capture
+        :param frames_per_second: frames to capture per second
+        :param mode: diagnostic mode to capture
+        :param page_size: page size of the T37 object
+        :return: number of frames written
+        """
+        x_nodes, y_nodes = self._frame_indices.shape
+        header = np.array([(FRAME_STREAM_MAGIC, FRAME_STREAM_VERSION, mode, x_nodes, y_nodes, frames_per_second)],
+                          dtype=FRAME_STREAM_HEADER_DTYPE)
+        record = np.zeros(1, dtype=frame_stream_record_dtype(mode, x_nodes, y_nodes))
+        period = 1 / frames_per_second
+        start = time.monotonic()
+
+        with open(filepath, 'wb') as f:
+            f.write(header.tobytes())
+            try:
+                for i in range(num_frames):
+                    # frames are scheduled from the start time, so a slow frame doesn't push every later frame back
+                    delay = start + i * period - time.monotonic()
+                    if delay > 0:
+                        time.sleep(delay)
+                    record['timestamp'] = time.monotonic_ns()
+                    record['frame'] = self._read_frame(mode, page_size)
+                    f.write(record.tobytes())
+            finally:
+                self._t37_navigator.release()
+        return num_frames
+
+    def write_and_read(self, message: array.array, timeout=None, debug=False) -> memoryview:
+        """
+        writes a message to the device and handles any possible exceptions.
+        a message that times out is never sent again, only its response is waited on again (see
+        _read_response): sending a read of the T5 object twice would lose the messages the first read
+        popped, and a write may not be safe to repeat (EX: paging the T37 object). once the transport policy's
+        give up time has passed the USBTimeoutError is raised, and a response that arrives after that is thrown
+        away by the next transaction. a read with a bad response is sent again with backoff, unless it reads the
+        T5 object
+        :param message: message to send
+        :param timeout: timeout (ms), None to use the adaptive timeout
+        :param debug: bool determining if debug data is output
+        :return: view of the answer from write command, only valid until the thread's next write_and_read
+        """
+        # the response is read into a buffer that's reused for every transaction on this thread,
+        # rather than allocating a new array and copying it into a list every time
+        buffers = self._response_buffers
+        if not hasattr(buffers, 'response'):
+            buffers.response = array.array('B', bytes(64))
+            buffers.view = memoryview(buffers.response)
+        policy = self._transport_policy
+        if timeout is None:
+            timeout = policy.get_timeout()
+        # only the address is written, and reading it again doesn't change the controller
+        repeatable = message[1] == 2 and not self._reads_t5(message)
+        attempt = 0
+
+        while True:
+            with self._usb_lock:
+                if self._stale_response:
+                    self._flush_response()
+                    self._stale_response = False
+                start = time.perf_counter()
+                self._device.write(0x02, message, timeout)
+                num_read, waited = self._read_response(buffers.response, timeout)
+                rtt = time.perf_counter() - start
+            ans = buffers.view[:num_read]
+            if ans[0] == 0 or ans[0] == 4:
+                if not attempt and not waited:
+                    policy.record(rtt)  # retried round trips would skew the timeout
+                return ans
+
+            if debug:
+                print("BAD 0 INDEX: " + str(ans[0]))
+            error = ZeroIndexInvalid("Index 0 of the response message is " + str(ans[0]))
+            if not repeatable or attempt >= policy.max_retries:
+                policy.count_failure(error)
+                raise error
+            policy.count_retry(error)
+            time.sleep(policy.get_backoff(attempt))
+            attempt += 1
+
+    def _create_messages(self) -> None:
+        """
+        creates the messages for the atmel touch controller from the object addresses in the object table
+        :return: None
+        """
+        t5 = self._objects['T5']
+        t6 = self._objects['T6']
+        t37 = self._objects['T37']
+        t44 = self._objects['T44']
+        t100 = self._objects['T100']
+
+        # the last byte of the T5 object is a checksum, which is only sent when requested
+        self._t5_message_size = t5['size'] - 1
+        self._t5_range = (t5['address'], t5['address'] + t5['size'])
+        self._t5_msg = read_command(t5['address'], self._t5_message_size)
+        self._t44_msg = read_command(t44['address'], 1)
+        # reading past the end of a message continues with the next message, so several messages
+        # can be read in one transaction (index i reads i messages)
+        self._t5_burst_size = MAX_READ_SIZE // self._t5_message_size
+        self._t5_burst_msgs = [read_command(t5['address'], i * self._t5_message_size)
+                               for i in range(self._t5_burst_size + 1)]
+        # reads the T44 message count and as many T5 messages as fit in one transaction
+        # (only possible when T5 directly follows T44 in memory)
+        if t5['address'] == t44['address'] + 1:
+            self._t44_burst_size = (MAX_READ_SIZE - 1) // self._t5_message_size
+            self._t44_t5_msg = read_command(t44['address'], 1 + self._t44_burst_size * self._t5_message_size)
+        else:
+            self._t44_t5_msg = None
+
+        # byte 0 of the T6 object is reset, byte 5 is diagnostic
+        self._t6_reset_msg = write_command(t6['address'], [0x01])
+        self._t37_navigator = T37Navigator(self.write_and_read, t6['address'] + 5, t37['address'], t37['size'])
+
+        # reads through the Y range of the T100 object
+        self._t100_msg = read_command(t100['address'], 0x26)
+
+        # report IDs of the messages the program looks for
+        self._t6_report_id = t6['first_report_id']
+        # T100's first report ID is the screen status, the second is reserved, the rest are touches
+        self._t100_status_report_id = t100['first_report_id']
+        self._t100_first_touch_id = t100['first_report_id'] + 2
+        self._t100_last_touch_id = t100['first_report_id'] + t100['num_report_ids'] - 1
+
+    def _create_node_map(self, page_size=128) -> None:
+        """
+        finds the T37 page and data index of every node from the matrix size in the information block
+        :param page_size: page size of the T37 object
+        :return: None
+        """
+        num_x_nodes = self._info_block[4]
+        num_y_nodes = self._info_block[5]
         bytes_per_node = 2
-        page_size = 128
         nodes_per_page = int(page_size / bytes_per_node)
 
-        self.data_indices_atmel = dict()
-        self.page_numbers_atmel = dict()
+        self._data_indices = dict()
+        self._page_numbers = dict()
         node_number = 0
         page_number = 0
         # create dictionary containing x&y nodes as keys and their associated data index as values
         # keys are tuples in form (x, y)
         for x in range(num_x_nodes):
             for y in range(num_y_nodes):
-                self.data_indices_atmel[(x, y)] = bytes_per_node * (node_number % nodes_per_page)
-                self.page_numbers_atmel[(x, y)] = page_number
+                self._data_indices[(x, y)] = bytes_per_node * (node_number % nodes_per_page)
+                self._page_numbers[(x, y)] = page_number
                 node_number += 1
                 if node_number % nodes_per_page == 0:
                     page_number += 1
 
+        # pages that hold node data, and the index of each node's value in all of those pages read back to back
+        # (used to turn a full sweep of the T37 pages into a node matrix)
+        self._frame_pages = sorted(set(self._page_numbers.values()))
+        self._frame_indices = np.zeros((num_x_nodes, num_y_nodes), dtype=np.intp)
+        for node, data_index in self._data_indices.items():
+            page_offset = self._frame_pages.index(self._page_numbers[node]) * page_size
+            self._frame_indices[node] = (page_offset + data_index) // bytes_per_node
+
+    def _flush_response(self) -> None:
+        """
+        throws away a response left over from an interrupted transaction (the USB lock must be held)
+        :return: None
+        """
+        try:
+            self._device.read(0x81, 64, int(FLUSH_TIMEOUT * 1000))
+        except usb.core.USBTimeoutError:
+            pass
+
+    def _parse_touch_point(self, messages: list, debug=False) -> list:
+        """
+        gets the touch point in screen units (NOT mm !!!) from messages read from the T5 object
+
+        :param messages: list of T5 responses
+        :param debug: determines if debug output is printed (default False)
+        :return: tuple of (x_val, y_val)
+        """
+        touches = self._reports_from_messages(messages)
+        if debug:
+            print("#############################################################################################")
+            print("NUM MESSAGES TO READ: " + str(len(messages)))
+            for touch in touches:
+                print("event: " + ATMEL_TOUCH_EVENTS.get(int(touch['event']), "UNKNOWN"))
+                print(" Coordinates: (" + str(touch['x']) + ", " + str(touch['y']) + ")")
+
+        # the most recent touch is the current touch point
+        if len(touches):
+            x_val, y_val = int(touches['x'][-1]), int(touches['y'][-1])
+        else:
+            x_val = y_val = None
+        if debug:
+            print("MAKING POINT: (" + str(x_val) + ", " + str(y_val) + ")")
+        return [x_val, y_val]
+
+    def _read_frame(self, mode: int, page_size=128) -> np.ndarray:
+        """
+        captures a frame, leaving the diagnostic mode enabled so more frames can follow
+
+        :param mode: diagnostic mode to capture (EX: T37_DELTA_MODE)
+        :param page_size: page size of the T37 object
+        :return: array of values shaped (num_x_nodes, num_y_nodes), indexed frame[x, y]
+        """
+        frame_data = bytearray()
+
+        self._t37_navigator.capture(mode)
+        # pages are read in ascending order, so the controller only pages up between reads
+        for page_num in self._frame_pages:
+            frame_data.extend(self._t37_navigator.read_page(page_num, page_size))
+
+        return decode_t37_page(frame_data, T37_MODE_DTYPES[mode])[self._frame_indices]
+
+    def _read_memory(self, address: int, num_bytes: int) -> bytearray:
+        """
+        reads a block of the controller's memory map, splitting it into as many transactions as needed
+        :param address: memory address to start reading at
+        :param num_bytes: number of bytes to read
+        :return: bytes read
+        """
+        data = bytearray()
+        while len(data) < num_bytes:
+            chunk_size = min(num_bytes - len(data), MAX_READ_SIZE)
+            ans = self.write_and_read(read_command(address + len(data), chunk_size))
+            data.extend(ans[2:2 + chunk_size])
+        return data
+
+    def _read_messages(self) -> list:
+        """
+        reads every message waiting in the T5 object.
+        the T44 message count and the first few T5 messages are read in a single transaction,
+        and any remaining messages are read several at a time
+        :return: list of T5 responses (formatted the same as the response to reading the T5 object)
+        """
+        if self._t44_t5_msg is None:
+            return self._read_t5_messages(self.num_messages_to_read())
+
+        ans = self.write_and_read(self._t44_t5_msg)
+        msgs_to_read = ans[2]  # T44 message count
+        if msgs_to_read == 0:
+            return list()
+
+        # remove the T44 count so the messages line up with a response from reading the T5 object
+        messages = self._split_messages(bytes(ans[:2]), ans[3:], self._t44_burst_size)
+        if msgs_to_read > len(messages):
+            messages.extend(self._read_t5_messages(msgs_to_read - len(messages)))
+        return messages
+
+    def _read_object_table(self) -> dict:
+        """
+        reads the information block and object table to find the address, size and report IDs of every object.
+        object tables are cached on disk, keyed by family, variant, firmware version, build and the information
+        block CRC, so the table is only read from the controller the first time a panel is connected
+
+        :return: dictionary with object names as keys (EX: 'T5') and dictionaries of the object's address, size,
+                 instances, first_report_id and num_report_ids as values
+        """
+        self._info_block = self._read_memory(0x0000, INFO_BLOCK_SIZE)
+        num_objects = self._info_block[6]
+        table_size = num_objects * OBJECT_ENTRY_SIZE
+        crc = self._read_memory(INFO_BLOCK_SIZE + table_size, 3)  # 24 bit CRC follows the object table
+
+        key = "-".join('%02X' % byte for byte in self._info_block[0:4]) + \
+              "-%02X%02X%02X" % (crc[2], crc[1], crc[0])
+        cache = load_object_table_cache()
+
+        if key in cache:
+            objects = cache[key]
+        else:
+            table = self._read_memory(INFO_BLOCK_SIZE, table_size)
+            objects = dict()
+            report_id = 1  # report IDs are handed out in object table order, starting at 1
+            for i in range(0, table_size, OBJECT_ENTRY_SIZE):
+                entry = table[i:i + OBJECT_ENTRY_SIZE]
+                instances = entry[4] + 1
+                num_report_ids = entry[5] * instances
+                objects['T' + str(entry[0])] = {'address': entry[1] | (entry[2] << 8),
+                                                'size': entry[3] + 1,
+                                                'instances': instances,
+                                                'first_report_id': report_id if num_report_ids else 0,
+                                                'num_report_ids': num_report_ids}
+                report_id += num_report_ids
+            cache[key] = objects
+            save_object_table_cache(cache)
+
+        for obj in REQUIRED_OBJECTS:
+            if obj not in objects:
+                raise NoDeviceError("Touch controller does not have a " + obj + " object.")
+        return objects
+
+    def _read_response(self, response: array.array, timeout: int) -> tuple:
+        """
+        reads the response to the message that was just sent (the USB lock must be held).
+        a response that times out is waited on again with backoff and a longer timeout, until
+        the transport policy's give up time has passed since the message was sent
+
+        :param response: buffer to read the response into
+        :param timeout: timeout (ms) of the first wait
+        :return: number of bytes read, and bool indicating if the response had to be waited on again
+        :raises: usb.core.USBTimeoutError if the response didn't arrive in time
+        """
+        policy = self._transport_policy
+        give_up = time.monotonic() + policy.give_up_time
+        attempt = 0
+
+        while True:
+            try:
+                return self._device.read(0x81, response, timeout), attempt > 0
+            except usb.core.USBTimeoutError as e:
+                if time.monotonic() + policy.get_backoff(attempt) >= give_up:
+                    policy.count_failure(e)
+                    self._stale_response = True  # flushed before the next transaction
+                    raise
+                policy.count_retry(e)
+                time.sleep(policy.get_backoff(attempt))
+                timeout = min(timeout * 2, MAX_USB_TIMEOUT)
+                attempt += 1
+
+    def _read_t5_messages(self, num_messages: int) -> list:
+        """
+        reads messages from the T5 object, as many per transaction as fit in one read
+        :param num_messages: number of messages to read
+        :return: list of T5 responses (formatted the same as the response to reading the T5 object)
+        """
+        messages = list()
+        while len(messages) < num_messages:
+            burst = min(num_messages - len(messages), self._t5_burst_size)
+            ans = self.write_and_read(self._t5_burst_msgs[burst])
+            batch = self._split_messages(bytes(ans[:2]), ans[2:], burst)
+            messages.extend(batch)
+            if len(batch) < burst:
+                break  # the T5 object ran out of messages
+        return messages
+
+    def _reads_t5(self, message: array.array) -> bool:
+        """
+        :param message: message to send
+        :return: bool indicating if the message reads any of the T5 object, which pops the messages it reads
+                 off the controller
+        """
+        if self._t5_range is None:  # the object table hasn't been read yet
+            return False
+        start = message[3] | (message[4] << 8)
+        return start < self._t5_range[1] and start + message[2] > self._t5_range[0]
+
+    def _reports_from_messages(self, messages: list, timestamp_ns=0) -> np.ndarray:
+        """
+        gets the T100 touch reports out of messages read from the T5 object
+        :param messages: list of T5 responses
+        :param timestamp_ns: time.monotonic_ns() timestamp of when the messages were read
+        :return: array of reports (dtype TOUCH_REPORT_DTYPE)
+        """
+        reports = decode_t5_messages(messages, self._t100_status_report_id, self._t100_first_touch_id,
+                                     self._t5_message_size, timestamp_ns)
+        # only keep T100 touches (EX: not the T6 status messages)
+        return reports[(reports['report_id'] >= self._t100_first_touch_id) &
+                       (reports['report_id'] <= self._t100_last_touch_id)]
+
+    def _split_messages(self, header: bytes, data: memoryview, num_messages: int) -> list:
+        """
+        splits the data of a multi-message read into separate T5 responses, leaving out empty messages.
+        each message is copied out of the response, so it stays valid after the next transaction
+        :param header: status and byte count of the response
+        :param data: view of the message bytes of the response
+        :param num_messages: number of messages read
+        :return: list of T5 responses (formatted the same as the response to reading the T5 object)
+        """
+        size = self._t5_message_size
+        messages = list()
+        for start in range(0, num_messages * size, size):
+            if data[start] != T5_INVALID_REPORT_ID:
+                messages.append(header + data[start:start + size])
+        return messages
+
+    def _t37_read_nodes(self, nodes: list, page_size=128) -> list:
+        """
+        reads the deltas of multiple nodes, grouping the nodes by the T37 page they sit on so
+        each page is only read once (deltas must already be captured by the T37 navigator)
+
+        :param nodes: list of (x, y) node tuples to read
+        :param page_size: size of the T37 page
+        :return: list of deltas in the same order as nodes
+        """
+        # group the nodes by the page they are on
+        nodes_on_page = dict()
+        for node in nodes:
+            nodes_on_page.setdefault(self._page_numbers[node], list()).append(node)
+
+        deltas = dict()
+        # read pages in ascending order so the controller only ever pages up between reads
+        for page_num in sorted(nodes_on_page):
+            page_values = decode_t37_page(self._t37_navigator.read_page(page_num, page_size))
+            # each node is 2 bytes, so the data index halved is the node's index in the decoded page
+            value_indices = [self._data_indices[node] // 2 for node in nodes_on_page[page_num]]
+            deltas.update(zip(nodes_on_page[page_num], page_values[value_indices].tolist()))
+
+        return [deltas[node] for node in nodes]
+
+    def _t37_read_page(self, page_num: int, page_size=128):
+        """
+        reads an entire page of the t37 object
+
+        :param page_num: page number of the T37 to read
+        :param page_size: size of the page
+        :return: bytearray of data gathered from the T37 object
+        """
+        self._t37_navigator.capture(T37_DELTA_MODE)
+        try:
+            return self._t37_navigator.read_page(page_num, page_size)
+        finally:
+            self._t37_navigator.release()
+
+
+# driver class of each supported touch controller, bound once when a TouchController is created
+TOUCH_DRIVERS = {"Microchip ATMXT1066T2": AtmelDriver}  # update this with more controllers
+
+
+def register_touch_driver(controller_name: str, driver_class, usb_ids: tuple) -> None:
+    """
+    adds support for a touch controller without changing TouchController or the tests using it
+
+    :param controller_name: name of the touch controller (EX: "Microchip ATMXT1066T2")
+    :param driver_class: TouchDriver subclass that talks to the controller
+    :param usb_ids: (vendor ID, product ID) of the controller
+    :return: None
+    """
+    TOUCH_DRIVERS[controller_name] = driver_class
+    CONTROLLER_IDS[controller_name] = usb_ids
+
+
+class TouchController:
+
+    def __init__(self, device=None, controller_name="Microchip ATMXT1066T2"):
+        """
+        creates a TouchController object
+
+        :param device: USB device to use instead of searching for one (EX: a SimulatedMaxTouchDevice)
+        :param controller_name: name of the touch controller (a key of TOUCH_DRIVERS)
+        """
+        if controller_name not in TOUCH_DRIVERS:
+            raise ValueError("Unknown touch controller: " + controller_name)
+        # USB\VID_03EB&PID_6123&REV_0054
+        self._controller_name = controller_name
+        self._ids = CONTROLLER_IDS
+
+        # get the backend
+        self._backend = usb.backend.libusb1.get_backend(find_library=lambda q: "libusb-1.0.dll")
+
+        self._report_buffer = None
+        self._reader_thread = None
+        self._reader_stop = threading.Event()
+        self._reader_error = None
+        self._reset_latencies = list()  # seconds from each reset command until the controller was ready
+        self._raw_rate_mode = False
+        self._transport_policy = TransportPolicy()
+        self._board_num_x_nodes = None
+        self._board_num_y_nodes = None
+
+        # find our self._device
+        if device is not None:
+            self._device = device
+        else:
+            self._device = usb.core.find(idVendor=self._ids[self._controller_name][0],
+                                         idProduct=self._ids[self._controller_name][1],
+                                         backend=self._backend)
+        # was it found?
+        if self._device is None:
+            raise NoDeviceError('Device not found')
+
+        # bind the driver once, so the public methods don't have to check which controller is used on every call.
+        # the driver also sets up what it needs to talk to the device (EX: the maXTouch object table)
+        self._driver = self._create_driver(self._controller_name)
+
+        self.reset()  # reset the board on instantiation
+        self._device.set_configuration()  # set the active configuration.
+
     def clear_buffer(self) -> None:
         """
         reads all data left out of the T5 object to clear the buffer
         :return: None
         """
-        if self._controller_name == "Microchip ATMXT1066T2":
-            self._clear_buffer_atmel()
-        elif self._controller_name == "NEW_CONTROLLER":
-            print("implement new controller method here")
-        else:
-            raise ValueError("Unknown touch controller: " + self._controller_name)
+        if self._report_buffer is not None:
+            self._check_background_reader()
+            self._report_buffer.clear()
+            return
+        self._driver.clear_buffer()
 
     def get_orientation_coordinates(self, max_iterations=12) -> list:
         """
@@ -256,6 +1637,12 @@ class TouchController:
                                                                                " from the controller.")
         return self.read_touch_point(msgs_to_read)
 
+    def get_capabilities(self) -> frozenset:
+        """
+        :return: capabilities of the touch controller's driver (EX: CAPABILITY_FRAME_READ)
+        """
+        return self._driver.capabilities
+
     def get_delta_at(self, x_node: int, y_node: int, page_size=128):
         """
         gets the delta value at a specified node crossing
@@ -265,38 +1652,62 @@ class TouchController:
         :param page_size: page size of the T37 object (typically 128< i'm unaware of cases where it is not 128)
         :return: twos complement calculation of the data indices representing the delta of the node crossing
         """
-        if self._controller_name == "Microchip ATMXT1066T2":
-            return self._get_delta_at_atmel(x_node, y_node, page_size)
-        elif self._controller_name == "NEW_CONTROLLER":
-            print("implement new controller method here")
-        else:
-            raise ValueError("Unknown touch controller: " + self._controller_name)
+        self._check_capability(CAPABILITY_NODE_READ)
+        return self._driver.get_delta_at(x_node, y_node, page_size)
+
+    def get_delta_frame(self, page_size=128) -> np.ndarray:
+        """
+        captures the delta of every node on the screen in one sweep of the T37 pages
+
+        :param page_size: page size of the T37 object
+        :return: int16 array of deltas shaped (num_x_nodes, num_y_nodes), indexed frame[x, y]
+        """
+        self._check_capability(CAPABILITY_FRAME_READ)
+        return self._driver.read_frame(T37_DELTA_MODE, page_size)
+
+    def get_range(self, debug=False):
+        """
+        gets the ranges of the screen in both the X and Y direction
+
+        :param debug: bool for developers to get output in console, remains false unless you want debug info
+        :return: x range, y range
+        """
+        return self._driver.get_range(debug)
+
+    def get_reference_frame(self, page_size=128) -> np.ndarray:
+        """
+        captures the reference of every node on the screen in one sweep of the T37 pages
+
+        :param page_size: page size of the T37 object
+        :return: uint16 array of references shaped (num_x_nodes, num_y_nodes), indexed frame[x, y]
+        """
+        self._check_capability(CAPABILITY_FRAME_READ)
+        return self._driver.read_frame(T37_REFERENCE_MODE, page_size)
+
+    def get_reset_latencies(self) -> list:
+        """
+        :return: list of seconds each reset took from the reset command until the controller reported ready
+        """
+        return list(self._reset_latencies)
 
-    def get_range(self, debug=False):
+    def get_signal_frame(self, page_size=128) -> np.ndarray:
         """
-        gets the ranges of the screen in both the X and Y direction
+        captures the raw signal of every node on the screen in one sweep of the T37 pages
 
-        :param debug: bool for developers to get output in console, remains false unless you want debug info
-        :return: x range, y range
+        :param page_size: page size of the T37 object
+        :return: uint16 array of signals shaped (num_x_nodes, num_y_nodes), indexed frame[x, y]
         """
-        if self._controller_name == "Microchip ATMXT1066T2":
-            return self._get_range_atmel(debug)
-        elif self._controller_name == "NEW_CONTROLLER":
-            print("implement new controller method here")
-        else:
-            raise ValueError("Unknown touch controller: " + self._controller_name)
+        self._check_capability(CAPABILITY_FRAME_READ)
+        return self._driver.read_frame(T37_SIGNAL_MODE, page_size)
 
     def get_touch_coordinate(self) -> list:
         """
         gets the current estimated input from the touch controller
         :return: current touch controllers get_touch_coordinate results
         """
-        if self._controller_name == "Microchip ATMXT1066T2":
-            return self._get_touch_coordinate_atmel()
-        elif self._controller_name == "NEW_CONTROLLER":
-            print("implement new controller method here")
-        else:
-            raise ValueError("Unknown touch controller: " + self._controller_name)
+        if self._report_buffer is not None:
+            return self._get_buffered_touch_coordinate()
+        return self._driver.get_touch_coordinate()
 
     def get_touch_controller_type(self):
         """
@@ -304,6 +1715,38 @@ class TouchController:
         """
         return self._controller_name
 
+    def get_transport_stats(self) -> dict:
+        """
+        :return: dictionary of the USB timeout (ms), 99th percentile round trip time (ms),
+                 number of timed round trips, and retries and failures counted by error
+        """
+        return self._transport_policy.get_stats()
+
+    def get_usb_location(self) -> tuple:
+        """
+        :return: (bus number, tuple of port numbers) of the USB port the controller is plugged into
+        """
+        return usb_location(self._device)
+
+    def has_capability(self, capability: str) -> bool:
+        """
+        :param capability: capability to check for (EX: CAPABILITY_BURST_READ)
+        :return: bool indicating if the touch controller's driver supports the capability
+        """
+        return capability in self._driver.capabilities
+
+    def is_background_reading(self) -> bool:
+        """
+        :return: bool indicating if the background reader is filling the report buffer
+        """
+        return self._reader_thread is not None
+
+    def is_raw_rate_mode(self) -> bool:
+        """
+        :return: bool indicating if the controller is in raw-rate mode
+        """
+        return self._raw_rate_mode
+
     def nine_point_read(self, x: int, y: int, iterations: int, sleep_sec: float, page_size=128, debug=False) -> list:
         """
         reads 9 nodes around the input parameter nodes and returns
@@ -325,36 +1768,33 @@ class TouchController:
         :param debug: bool determining if debug data is output to the console
         :return: list of deltas in their specified locations
         """
-        if self._controller_name == "Microchip ATMXT1066T2":
-            return self._t37_nine_point_read_atmel(x, y, iterations, sleep_sec, page_size, debug)
-        elif self._controller_name == "NEW_CONTROLLER":
-            print("implement new controller method here")
-        else:
-            raise ValueError("Unknown touch controller: " + self._controller_name)
+        return self._read_node_window(x, y, 1, iterations, sleep_sec, page_size, debug)
 
     def num_messages_to_read(self) -> int:
         """
         gets the number of messages to read from the T44 object
         :return: integer representing the number of messages to read
         """
-        if self._controller_name == "Microchip ATMXT1066T2":
-            return self._t44_num_messages_to_read_atmel()
-        elif self._controller_name == "NEW_CONTROLLER":
-            print("implement new controller method here")
-        else:
-            raise ValueError("Unknown touch controller: " + self._controller_name)
+        return self._driver.num_messages_to_read()
 
     def read_all_points(self) -> list:
         """
         reads all touch points registered in the T5 object of the maxtouch controller
         :return: list of touch points
         """
-        if self._controller_name == "Microchip ATMXT1066T2":
-            return self._read_all_points_atmel()
-        elif self._controller_name == "NEW_CONTROLLER":
-            print("implement new controller method here")
-        else:
-            raise ValueError("Unknown touch controller: " + self._controller_name)
+        reports = self.read_all_reports()
+        return [Point(x_val, y_val) for x_val, y_val in zip(reports['x'].tolist(), reports['y'].tolist())]
+
+    def read_all_reports(self) -> np.ndarray:
+        """
+        reads all touch reports registered in the T5 object of the maxtouch controller, including
+        the touch ID, event, amplitude, area and the time they were read
+        :return: array of reports (dtype TOUCH_REPORT_DTYPE)
+        """
+        if self._report_buffer is not None:
+            self._check_background_reader()
+            return self._report_buffer.drain(timeout=BACKGROUND_READ_WAIT)
+        return self._driver.read_reports()
 
     def read_touch_point(self, num_messages_to_read: int, debug=False) -> list:
         """
@@ -364,32 +1804,103 @@ class TouchController:
         :param debug: determines if debug output is printed (default False)
         :return: tuple of (x_val, y_val)
         """
-        if self._controller_name == "Microchip ATMXT1066T2":
-            return self._read_touch_point_atmel(num_messages_to_read, debug)
-        elif self._controller_name == "NEW_CONTROLLER":
-            print("implement new controller method here")
-        else:
-            raise ValueError("Unknown touch controller: " + self._controller_name)
+        return self._driver.read_touch_point(num_messages_to_read, debug)
 
     def reset(self) -> bool:
         """
         resets the touch controller
         :return: bool indicating if the reset was successful
         """
-        if self._controller_name == "Microchip ATMXT1066T2":
-            return self._reset_atmel()
-        elif self._controller_name == "NEW_CONTROLLER":
-            print("implement new controller method here")
-        else:
-            raise ValueError("Unknown touch controller: " + self._controller_name)
+        # the background reader would swallow the reset messages
+        self.stop_background_reader()
+        self._raw_rate_mode = False  # the reset goes back to the configuration saved on the controller
+        self._reset_latencies.append(self._driver.reset())
+        return True
 
     def set_touch_controller(self, controller_name: str):
         """
         sets the touch controller being used
-        :param controller_name: name of the controller being used
+        :param controller_name: name of the controller being used (a key of TOUCH_DRIVERS)
         :return: N/A
         """
+        if controller_name not in TOUCH_DRIVERS:
+            raise ValueError("Unknown touch controller: " + controller_name)
+        self.stop_background_reader()
+        self._driver = self._create_driver(controller_name)
         self._controller_name = controller_name
+        self._raw_rate_mode = False
+
+    def start_background_reader(self, capacity=4096, poll_interval=.001) -> None:
+        """
+        starts a thread that continuously reads touch reports from the controller into a ring buffer.
+        while it runs, read_all_points and get_touch_coordinate read from that buffer and clear_buffer
+        empties it, instead of polling the controller on the caller's thread
+
+        :param capacity: maximum number of reports the buffer holds before overwriting the oldest
+        :param poll_interval: seconds to wait between polls when the controller has no messages
+        :return: None
+        """
+        if self._reader_thread is not None:
+            return
+        self._check_capability(CAPABILITY_BACKGROUND_READ)
+
+        self._report_buffer = TouchReportBuffer(capacity)
+        self._reader_error = None
+        self._reader_stop.clear()
+        self._reader_thread = threading.Thread(target=self._background_read_loop, args=(poll_interval,),
+                                               daemon=True)
+        self._reader_thread.start()
+
+    def start_raw_rate_mode(self) -> None:
+        """
+        saves the controller's power and touch filter settings, then switches it to free-run acquisition with no
+        idle mode and no report filtering, so touches are sampled at the controller's highest report rate.
+        the settings aren't backed up on the controller, so stop_raw_rate_mode() or a reset restores them
+        :return: None
+        """
+        if self._raw_rate_mode:
+            return
+        self._check_capability(CAPABILITY_RAW_RATE)
+        self._driver.start_raw_rate()
+        self._raw_rate_mode = True
+
+    def stop_background_reader(self) -> None:
+        """
+        stops the background reader, reads go back to polling the controller directly
+        :return: None
+        """
+        if self._reader_thread is None:
+            return
+        self._reader_stop.set()
+        self._reader_thread.join()
+        self._reader_thread = None
+        self._report_buffer = None
+
+    def stop_raw_rate_mode(self) -> None:
+        """
+        restores the power and touch filter settings saved by start_raw_rate_mode()
+        :return: None
+        """
+        if not self._raw_rate_mode:
+            return
+        self._driver.stop_raw_rate()
+        self._raw_rate_mode = False
+
+    def stream_frames(self, filepath: str, num_frames: int, frames_per_second: float, mode=T37_DELTA_MODE,
+                      page_size=128) -> int:
+        """
+        captures frames at a fixed rate and writes them to a binary file (read it back with load_frame_stream)
+
+        :param filepath: path of the file to write
+        :param num_frames: number of frames to capture
+        :param frames_per_second: frames to capture per second (frames are captured as fast as possible
+                                  if the controller can't keep up)
+        :param mode: diagnostic mode to capture (T37_DELTA_MODE, T37_REFERENCE_MODE or T37_SIGNAL_MODE)
+        :param page_size: page size of the T37 object
+        :return: number of frames written
+        """
+        self._check_capability(CAPABILITY_FRAME_READ)
+        return self._driver.stream_frames(filepath, num_frames, frames_per_second, mode, page_size)
 
     def twenty_five_point_read(self, x: int, y: int, iterations: int, sleep_sec: float, page_size=128,
                                debug=False) -> list:
@@ -417,12 +1928,7 @@ class TouchController:
         :param debug: bool determining if debug data is output to the console
         :return: list of deltas in their specified locations
         """
-        if self._controller_name == "Microchip ATMXT1066T2":
-            return self._t37_twenty_five_point_read_atmel(x, y, iterations, sleep_sec, page_size, debug)
-        elif self._controller_name == "NEW_CONTROLLER":
-            print("implement new controller method here")
-        else:
-            raise ValueError("Unknown touch controller: " + self._controller_name)
+        return self._read_node_window(x, y, 2, iterations, sleep_sec, page_size, debug)
 
     def update_number_of_nodes(self, num_x: int, num_y: int) -> None:
         """
@@ -434,559 +1940,113 @@ class TouchController:
         self._board_num_x_nodes = num_x
         self._board_num_y_nodes = num_y
 
-    def write_and_read(self, message: np.ndarray, timeout=2000, debug=False) -> list:
+    def write_and_read(self, message: array.array, timeout=None, debug=False) -> memoryview:
         """
-        writes a message to the device and handles any possible exceptions
+        writes a message to the device and handles any possible exceptions.
+        the response is read into a buffer that each thread reuses for all of its transactions, so the returned
+        view is overwritten by the same thread's next write_and_read (or any other TouchController method that
+        talks to the device). copy anything that needs to be kept before then (EX: bytes(ans) or ans.tolist())
         :param message: message to send
-        :param timeout: timeout (ms)
+        :param timeout: timeout (ms), None to use the adaptive timeout
         :param debug: bool determining if debug data is output
-        :return: answer from write command in a list
+        :return: view of the answer from write command (status, number of bytes read, data...)
         """
-        if self._controller_name == "Microchip ATMXT1066T2":
-            return self._write_and_read_atmel(message, timeout, debug)
-        elif self._controller_name == "NEW_CONTROLLER":
-            print("implement new controller method here")
-        else:
-            raise ValueError("Unknown touch controller: " + self._controller_name)
-
-    ############################
-    # Atmel controller methods #
-    ############################
+        return self._driver.write_and_read(message, timeout, debug)
 
-    def _clear_buffer_atmel(self):
+    def _background_read_loop(self, poll_interval: float) -> None:
         """
-        reads all data left out of the T5 object to clear the buffer
+        body of the background reader thread, reads touch reports into the report buffer
+        until stop_background_reader is called
+        :param poll_interval: seconds to wait between polls when the controller has no messages
         :return: None
         """
-        msgs_to_read = 1  # initialize msgs_to_read
-
-
-        while msgs_to_read:        
-            msgs_to_read = self._t44_num_messages_to_read_atmel()
-
-            if msgs_to_read:
-                for i in range(msgs_to_read):
-                    self.write_and_read(self._t5_msg)
-                    
-
-    def _get_delta_at_atmel(self, x_node: int, y_node: int, page_size=128):
-        """
-        gets the delta value at a specified node crossing
-
-        :param x_node: x node to evaluate
-        :param y_node: y node to evaluate
-        :param page_size: page size of the T37 object (typically 128< i'm unaware of cases where it is not 128)
-        :return: twos complement calculation of the data indices representing the delta of the node crossing
-        """
-        # IMPORTANT:
-        # the data is organized into pages, each page contains data regarding the input signals
-        # of the board in specific locations. the data is sent in order, so all data regarding the
-        # first row of X is followed by all data regarding the second row of x, and so on.
-        # there will likely be more possible nodes  to be sent than actual nodes on the touchscreen being
-        # tested, so many 0 will follow each row's data (the default is 26 possible nodes in the X direction)
-
-        # all_page_data = self.t37_read_all_data_DEBUG()
-
-        data_index = self.data_indices_atmel[(x_node, y_node)]
-        page_number = self.page_numbers_atmel[(x_node, y_node)]
-        ans = self._t37_read_page_atmel(page_number, page_size=page_size)
-
-        rightmost_bits = bin(ans[data_index])[2:]
-        leftmost_bits = bin(ans[data_index+1] << 8)[2:]
-
-        binary = bin(int(leftmost_bits, 2) + int(rightmost_bits, 2))[2:]
-
-        # handle cases where the binary representation is not 16 bits in length
-        if len(binary) < 16:
-            zero_bits = ''
-            for i in range(16 - len(binary)):
-                zero_bits += '0'
-            binary = zero_bits + binary
-
-        return twos_complement_to_decimal(binary)
-
-    def _get_range_atmel(self, debug=False):
-        """
-        gets the ranges of the screen in both the X and Y direction
-
-        :param debug: bool for developers to get output in console, remains false unless you want debug info
-        :return: x range, y range
-        """
-        # these represent the index of the return message that indicates the
-        # ls and ms bytes for x and y range, respectively
-        ls_x_index = 15
-        ms_x_index = 16
-        ls_y_index = 26
-        ms_y_index = 27
-
-        t100_message = np.array([0x51, 0x02, 0x26, 0xFC, 0x06], dtype=np.uint8)
-
-        retry = 10
-
-        while True:
-            resp = self.write_and_read(t100_message)
-            # get X range bytes
-            ls_x = resp[ls_x_index]
-            ms_x = resp[ms_x_index]
-            shifted_ms_x = ms_x << 8  # shift most significant byte
-            x_rng = shifted_ms_x + ls_x
-            # get Y range bytes
-            ls_y = resp[ls_y_index]
-            ms_y = resp[ms_y_index]
-            shifted_ms_y = ms_y << 8  # shift most significant byte
-            y_rng = shifted_ms_y + ls_y
-
-            if x_rng != 0 and y_rng != 0:
-                if debug:
-                    print(" RANGE: (" + str(x_rng) + ", " + str(y_rng) + ")")
-                return x_rng, y_rng
-            else:
-                retry -= 1
-                if retry <= 0:
-                    raise ZeroIndexInvalid("Unable to determine range of the touch controller.")
-
-    def _get_touch_coordinate_atmel(self) -> list:
-        """
-        gets the current estimated input from the touch controller
-        :return: touch coordinate
-        """
-
-        cont = True
-        infinite_loop_stopper = 0
-        retval = None
-
-        while cont:
-            msgs_to_read = self._t44_num_messages_to_read_atmel()
-
-            if msgs_to_read != 0:
-                # raise exception of reading wrong thing if response has wacky value
-                if msgs_to_read > 12:
-                    raise Exception(
-                        "Response read wrong thing. number of messages its wrongly going to read: " + str(msgs_to_read))
-                retval = self.read_touch_point(msgs_to_read)
-                if retval[0] is not None and retval[1] is not None:
-                    cont = False
-            else:
-                infinite_loop_stopper += 1
-                if infinite_loop_stopper > 100:
-                    raise NoInputFromController("cannot read this touch coordinate, damn")
-
-        return retval
-
-    def _read_all_points_atmel(self) -> list:
-        """
-        reads all touch points registered in the T5 object of the maxtouch controller
-        :return: list of touch points
-        """
-        points = list()
-        y_val = x_val = None
-
-        for i in range(self._t44_num_messages_to_read_atmel()):
-            ans = self._write_and_read_atmel(self._t5_msg)
-            if ans[2] != 48:
-                # get X pos bytes
-                ls_x = ans[4]
-                ms_x = ans[5]
-                shifted_ms_x = ms_x << 8  # shift most significant byte
-                old_x = x_val
-                x_val = shifted_ms_x + ls_x
-                # get Y pos bytes
-                ls_y = ans[6]
-                ms_y = ans[7]
-                shifted_ms_y = ms_y << 8  # shift most significant byte
-                old_y = y_val
-                y_val = shifted_ms_y + ls_y
-
-                if x_val == y_val == 0 and x_val is not None and y_val is not None:
-                    x_val = old_x
-                    y_val = old_y
-                elif x_val is not None and y_val is not None:
-                    points.append(Point(x_val, y_val))
-
-        return points
-
-    def _read_touch_point_atmel(self, num_messages_to_read: int, debug=False) -> list:
+        try:
+            while not self._reader_stop.is_set():
+                reports = self._driver.read_reports()
+                self._report_buffer.extend(reports)
+                if not len(reports):
+                    self._reader_stop.wait(poll_interval)
+        except Exception as e:  # any error would otherwise end the thread silently
+            self._reader_error = e  # raised on the caller's thread by the next buffered read
+
+    def _check_capability(self, capability: str) -> None:
         """
-        gets the touch point in screen units (NOT mm !!!)
-
-        :param num_messages_to_read: number of messages to read from the T5 object
-        :param debug: determines if debug output is printed (default False)
-        :return: tuple of (x_val, y_val)
+        :param capability: capability a method needs (EX: CAPABILITY_FRAME_READ)
+        :return: None
+        :raises: UnsupportedCapability if the touch controller's driver doesn't support the capability
         """
+        if capability not in self._driver.capabilities:
+            raise UnsupportedCapability(self._controller_name + " doesn't support " + capability + ".")
 
-        x_val = y_val = None
-        # iterate over all messages to read
-        if debug:
-            print("#############################################################################################")
-            print("NUM MESSAGES TO READ: " + str(num_messages_to_read))
-        for i in range(num_messages_to_read):
-            resp = self.write_and_read(self._t5_msg)
-
-            # check if thing is not 49 (bad number!?)
-            if resp[2] == 48:
-                if debug:
-                    print("TOUCH REGISTERED")
-
-            elif 49 < resp[2] < 66:  # bound 50-63 (double check max bound)
-                # PAGE 80
-                tch_status = '{0:08b}'.format(resp[3])
-
-                event_bits = tch_status[4:]
-                event = int(event_bits, base=2)
-
-                # get X pos bytes
-                ls_x = resp[4]
-                ms_x = resp[5]
-                shifted_ms_x = ms_x << 8  # shift most significant byte
-                old_x = x_val
-                x_val = shifted_ms_x + ls_x
-                # get Y pos bytes
-                ls_y = resp[6]
-                ms_y = resp[7]
-                shifted_ms_y = ms_y << 8  # shift most significant byte
-                old_y = y_val
-                y_val = shifted_ms_y + ls_y
-
-                # pdb.set_trace()
-                if x_val == y_val == 0 and x_val is not None and y_val is not None:
-                    x_val = old_x
-                    y_val = old_y
-
-                if debug:
-                    print("event: " + ATMEL_TOUCH_EVENTS[event])
-                    print(" Coordinates: (" + str(x_val) + ", " + str(y_val) + ")")
-        if debug:
-            print("MAKING POINT: (" + str(x_val) + ", " + str(y_val) + ")")
-        return [x_val, y_val]
-
-    def _reset_atmel(self) -> bool:
+    def _check_background_reader(self) -> None:
         """
-        resets the touch controller
-        :return: bool indicating if the reset was successful
+        raises the error that stopped the background reader, if there was one
+        :return: None
         """
-        # t6_reset message outline:
-        # 0x51 - standard first byte to send
-        # 0x03 - writing 3 bytes, 2 for address, 1 for signaling a reset
-        # 0x01 - needs to be non-zero (No idea why)
-        # 0x94 - LS byte of address
-        # 0x01 - MS byte of address
-        # 0x01 - value to write to byte 0 of the T6
-        t6_reset = np.array([0x51, 0x03, 0x01, 0x94, 0x01, 0x01], dtype=np.uint8)
-
-        try:
-            self._device.read(0x81, 64, 200)
-        except usb.core.USBTimeoutError:
-            pass
-
-        self.write_and_read(t6_reset)
-        time.sleep(.2)
-    
-        reset_msgs = list()
-        msgs = 1
-        
-        while msgs:
-            msgs = self._t44_num_messages_to_read_atmel()
-            for i in range(msgs):
-                msg = self.write_and_read(self._t5_msg)
-                if msg[2] == 1:
-                    reset_msgs.append(msg[3])
-        
-        if reset_msgs[0] != 128:
-            raise Exception("Reset not properly set")        
-        if reset_msgs[1] != 16:
-            raise Exception("Orientation not properly set")
-        if reset_msgs[2] != 0:
-            raise Exception("End not properly set")
-                
-        return True
+        if self._reader_error is not None:
+            error = self._reader_error
+            self.stop_background_reader()
+            raise error
 
-    def _t37_read_page_atmel(self, page_num: int, page_size=128):
+    def _create_driver(self, controller_name: str) -> TouchDriver:
         """
-        reads an entire page of the t37 object
-
-        :param page_num: page number of the T37 to read
-        :param page_size: size of the page
-        :return: list of data gathered from the T37 object
+        creates the driver of a touch controller and makes sure it implements what it advertises
+        :param controller_name: name of the touch controller (a key of TOUCH_DRIVERS)
+        :return: driver bound to this TouchController's device
         """
-        t6_enable_debug = np.array([0x51, 0x03, 0x01, 0x99, 0x01, 0x10], dtype=np.uint8)
-        t6_disable_debug = np.array([0x51, 0x03, 0x01, 0x99, 0x01, 0x00], dtype=np.uint8)
-        page_up = np.array([0x51, 0x03, 0x01, 0x99, 0x01, 0x01], dtype=np.uint8)
-        page_down = np.array([0x51, 0x03, 0x01, 0x99, 0x01, 0x02], dtype=np.uint8)
-        t37_read_1 = np.array([0x51, 0x02, 0x3E, 0x06, 0x01], dtype=np.uint8)
-        t37_read_2 = np.array([0x51, 0x02, 0x3E, 0x44, 0x01], dtype=np.uint8)
-        t37_read_3 = np.array([0x51, 0x02, 0x3E, 0x82, 0x01], dtype=np.uint8)
-
-        self._write_and_read_atmel(t6_enable_debug)
-
-        # iterate to page
-        for i in range(page_num):
-            self._write_and_read_atmel(page_up)
-
-        ans = self._write_and_read_atmel(t37_read_1)  # get first section of data
-
-        while ans[3] != page_num:
-            # print("####### WRONG PAGE SOMEHOW ############")
-            ans = self._write_and_read_atmel(t37_read_1)  # get first section of data
-            if ans[3] > page_num:
-                # print('CURRENT PAGE: ' + str(ans[3]) + '\nPaging down')
-                self.write_and_read(page_down)
-            elif ans[3] < page_num:
-                # print('CURRENT PAGE: ' + str(ans[3]) + '\nPaging up')
-                self.write_and_read(page_up)
-
-        page_data = list()
-        page_data.clear()
-
-        # get all data from page
-
-        if ans[3] != page_num:
-            raise ValueError("invalid page: " + str(ans[3]))
-
-        page_data.extend(ans[4:])  # get 60 bytes from message (page_data is now len(60) )
-        ans = self._write_and_read_atmel(t37_read_2)  # get second section of data
-        page_data.extend(ans[2:])  # get 62 bytes from message (page_data is now len(122) )
-        ans = self._write_and_read_atmel(t37_read_3)  # get third section of data
-        end_index = page_size - len(page_data) + 2  # get the end index to read from in the line below
-        page_data.extend(ans[2:end_index])  # get enough bytes from message to make len(page_data) = page_size
+        driver = TOUCH_DRIVERS[controller_name](self._device, self._transport_policy)
+        driver.check_capabilities()
+        return driver
 
-        self._write_and_read_atmel(t6_disable_debug)
-
-        return page_data
-
-    def _t37_nine_point_read_atmel(self, x: int, y: int, iterations: int, sleep_sec: float, page_size=128,
-                                   debug=False) -> list:
+    def _get_buffered_touch_coordinate(self) -> list:
         """
-        reads 9 nodes around the input parameter nodes and returns
-
-        EX: the (X,Y) represents the node input, and the stars are each node relative to the
-        input node that are evaluated (scans a 3x3 area)
-
-        * - * - *
-        |   |   |
-        *-(X,Y)-*
-        |   |   |
-        * - * - *
-
-        :param x: X node to evaluate
-        :param y: Y node to evaluate
-        :param iterations: number of times to red deltas
-        :param sleep_sec: number of seconds to sleep between each read
-        :param page_size: size of the T37 page
-        :param debug: bool determining if debug data is output to the console
-        :return: list of deltas in their specified locations
+        gets the most recent touch coordinate from the background reader's report buffer
+        :return: touch coordinate
         """
-        # initialize messages
-        t6_enable_debug = np.array([0x51, 0x03, 0x01, 0x99, 0x01, 0x10], dtype=np.uint8)
-        t6_disable_debug = np.array([0x51, 0x03, 0x01, 0x99, 0x01, 0x00], dtype=np.uint8)
-        page_up = np.array([0x51, 0x03, 0x01, 0x99, 0x01, 0x01], dtype=np.uint8)
-        page_down = np.array([0x51, 0x03, 0x01, 0x99, 0x01, 0x02], dtype=np.uint8)
-        t37_read_1 = np.array([0x51, 0x02, 0x3E, 0x06, 0x01], dtype=np.uint8)
-        t37_read_2 = np.array([0x51, 0x02, 0x3E, 0x44, 0x01], dtype=np.uint8)
-        t37_read_3 = np.array([0x51, 0x02, 0x3E, 0x82, 0x01], dtype=np.uint8)
-
-        # handle edge cases where 9 points would be off the screen
-        if x - 1 < 0:
-            if debug:
-                print(str(x) + ' is too small, setting it to 1')
-            x = 1  # set point to one off of 0 edge (can scan x-1 -> 0 node)
-        elif x + 1 >= self._board_num_x_nodes:
-            if debug:
-                print(str(x) + ' is too big, setting it to ' + str(self._board_num_x_nodes - 2))
-            x = self._board_num_x_nodes - 2
-        if y - 1 < 0:
-            if debug:
-                print(str(y) + ' is too small, setting it to 1')
-            y = 1  # set point to one off of 0 edge (can scan y-1 -> 0 node)
-        elif y + 1 >= self._board_num_y_nodes:
-            if debug:
-                print(str(y) + ' is too big, setting it to ' + str(self._board_num_y_nodes - 2))
-            y = self._board_num_y_nodes - 2
+        deadline = time.monotonic() + TOUCH_READ_TIMEOUT
 
-        # create list of 9 tuples indicating which points to read
-        nodes = [(x-1, y-1), (x, y-1), (x+1, y-1),
-                 (x-1, y),   (x, y),   (x+1, y),
-                 (x-1, y+1), (x, y+1), (x+1, y+1)]
-
-        # create list of lists containing the deltas from each node connection
-        ret_deltas = [list() for _ in range(9)]
-
-        # run iteration amount of times
-        for i in range(iterations):
-            self.write_and_read(t6_enable_debug)
-            # iterate over each node to scan
-            ret_deltas_index = 0
-            for node in nodes:
-                page_num = self.page_numbers_atmel[node]  # get the page number node is on
-                data_index = self.data_indices_atmel[node]  # get the data index of the node
-                page_data = list()  # initialize the list for page data
-                ans = self.write_and_read(t37_read_1)  # read first bit of the page
-
-                # while loops iterates to the correct page
-                while ans[3] != page_num:
-                    ans = self.write_and_read(t37_read_1)  # get first section of data
-                    if ans[3] > page_num:
-                        self.write_and_read(page_down)
-                    elif ans[3] < page_num:
-                        self.write_and_read(page_up)
-
-                page_data.extend(ans[4:])  # get 60 bytes from message (page_data is now len(60) )
-                ans = self.write_and_read(t37_read_2)  # get second section of data
-                page_data.extend(ans[2:])  # get 62 bytes from message (page_data is now len(122) )
-                ans = self.write_and_read(t37_read_3)  # get third section of data
-                end_index = page_size - len(page_data) + 2  # get the end index to read from in the line below
-                page_data.extend(ans[2:end_index])  # get enough bytes from message to make len(page_data) = page_size
-
-                # block gets the 16 bits and creates a binary value from them
-                rightmost_bits = bin(page_data[data_index])[2:]
-                leftmost_bits = bin(page_data[data_index + 1] << 8)[2:]
-                binary = bin(int(leftmost_bits, 2) + int(rightmost_bits, 2))[2:]
-
-                # handle cases where the binary representation is not 16 bits in length
-                if len(binary) < 16:
-                    zero_bits = ''
-                    for _ in range(16 - len(binary)):
-                        zero_bits += '0'
-                    binary = zero_bits + binary
-
-                # do the twos complement of the binary value (if neg)
-                twos_comp = twos_complement_to_decimal(binary)
-                ret_deltas[ret_deltas_index].append(twos_comp)  # save delta value
-                ret_deltas_index += 1  # iterate deltas index for appending to the list
-            self.write_and_read(t6_disable_debug)  # disable debug after getting all 9 point's data
-            time.sleep(sleep_sec)
-        return ret_deltas  # return list of 9 lists containing deltas for each respective point
-
-    def _t37_twenty_five_point_read_atmel(self, x: int, y: int, iterations: int, sleep_sec: float, page_size=128,
-                                          debug=False):
+        while True:
+            self._check_background_reader()
+            touches = self._report_buffer.drain(timeout=max(deadline - time.monotonic(), 0))
+            if len(touches):
+                return [int(touches['x'][-1]), int(touches['y'][-1])]
+            if time.monotonic() >= deadline:
+                raise NoInputFromController("cannot read this touch coordinate, damn")
+
+    def _read_node_window(self, x: int, y: int, radius: int, iterations: int, sleep_sec: float, page_size=128,
+                          debug=False) -> list:
         """
-        reads 25 nodes around the input parameter nodes and returns
-
-        EX: the (X,Y) represents the node input, and the stars are each node relative to the
-        input node that are evaluated (scans a 5x5 area)
-
-        * - * - * - * - *
-        |   |   |   |   |
-        * - * - * - * - *
-        |   |   |   |   |
-        * - *-(X,Y)-* - *
-        |   |   |   |   |
-        * - * - * - * - *
-        |   |   |   |   |
-        * - * - * - * - *
+        reads the deltas of the square of nodes around a node, moving the square back onto the
+        screen if it would go off an edge
 
-        :param x: X node to evaluate
-        :param y: Y node to evaluate
-        :param iterations: number of times to red deltas
+        :param x: X node at the center of the square
+        :param y: Y node at the center of the square
+        :param radius: nodes from the center to the edge of the square (1 for 3x3, 2 for 5x5)
+        :param iterations: number of times to read deltas
         :param sleep_sec: number of seconds to sleep between each read
         :param page_size: size of the T37 page
         :param debug: bool determining if debug data is output to the console
-        :return: list of deltas in their specified locations
+        :return: list of lists of deltas, one list per node, in rows of increasing Y
         """
-        # initialize messages
-        t6_enable_debug = np.array([0x51, 0x03, 0x01, 0x99, 0x01, 0x10], dtype=np.uint8)
-        t6_disable_debug = np.array([0x51, 0x03, 0x01, 0x99, 0x01, 0x00], dtype=np.uint8)
-        page_up = np.array([0x51, 0x03, 0x01, 0x99, 0x01, 0x01], dtype=np.uint8)
-        page_down = np.array([0x51, 0x03, 0x01, 0x99, 0x01, 0x02], dtype=np.uint8)
-        t37_read_1 = np.array([0x51, 0x02, 0x3E, 0x06, 0x01], dtype=np.uint8)
-        t37_read_2 = np.array([0x51, 0x02, 0x3E, 0x44, 0x01], dtype=np.uint8)
-        t37_read_3 = np.array([0x51, 0x02, 0x3E, 0x82, 0x01], dtype=np.uint8)
-
-        # handle edge cases where 9 points would be off the screen
-        if x - 2 < 0:
+        # handle edge cases where the square would be off the screen
+        if x - radius < 0:
             if debug:
-                print(str(x) + ' is too small, setting it to 2')
-            x = 2  # set point to one off of 0 edge (can scan x-1 -> 0 node)
-        elif x + 2 >= self._board_num_x_nodes:
+                print(str(x) + ' is too small, setting it to ' + str(radius))
+            x = radius  # set point far enough off of the 0 edge to scan x - radius -> 0 node
+        elif x + radius >= self._board_num_x_nodes:
             if debug:
-                print(str(x) + ' is too big, setting it to ' + str(self._board_num_x_nodes - 3))
-            x = self._board_num_x_nodes - 3
-        if y - 2 < 0:
+                print(str(x) + ' is too big, setting it to ' + str(self._board_num_x_nodes - radius - 1))
+            x = self._board_num_x_nodes - radius - 1
+        if y - radius < 0:
             if debug:
-                print(str(y) + ' is too small, setting it to 2')
-            y = 2  # set point to one off of 0 edge (can scan y-1 -> 0 node)
-        elif y + 2 >= self._board_num_y_nodes:
+                print(str(y) + ' is too small, setting it to ' + str(radius))
+            y = radius  # set point far enough off of the 0 edge to scan y - radius -> 0 node
+        elif y + radius >= self._board_num_y_nodes:
             if debug:
-                print(str(y) + ' is too big, setting it to ' + str(self._board_num_y_nodes - 3))
-            y = self._board_num_y_nodes - 3
-
-        # create list of 25 tuples indicating which points to read
-        nodes = [(x - 2, y - 2), (x - 1, y - 2), (x, y - 2), (x + 1, y - 2), (x + 2, y - 2),
-                 (x - 2, y - 1), (x - 1, y - 1), (x, y - 1), (x + 1, y - 1), (x + 2, y - 1),
-                 (x - 2, y),     (x - 1, y),     (x, y),     (x + 1, y),     (x + 2, y),
-                 (x - 2, y + 1), (x - 1, y + 1), (x, y + 1), (x + 1, y + 1), (x + 2, y + 1),
-                 (x - 2, y + 2), (x - 1, y + 2), (x, y + 2), (x + 1, y + 2), (x + 2, y + 2)]
+                print(str(y) + ' is too big, setting it to ' + str(self._board_num_y_nodes - radius - 1))
+            y = self._board_num_y_nodes - radius - 1
 
-        # create list of lists containing the deltas from each node connection
-        ret_deltas = [list() for _ in range(25)]
-
-        # run iteration amount of times
-        for i in range(iterations):
-            self.write_and_read(t6_enable_debug)
-            # iterate over each node to scan
-            ret_deltas_index = 0
-            for node in nodes:
-                page_num = self.page_numbers_atmel[node]  # get the page number node is on
-                data_index = self.data_indices_atmel[node]  # get the data index of the node
-                page_data = list()  # initialize the list for page data
-                ans = self.write_and_read(t37_read_1)  # read first bit of the page
-
-                # while loops iterates to the correct page
-                while ans[3] != page_num:
-                    ans = self.write_and_read(t37_read_1)  # get first section of data
-                    if ans[3] > page_num:
-                        self.write_and_read(page_down)
-                    elif ans[3] < page_num:
-                        self.write_and_read(page_up)
-
-                page_data.extend(ans[4:])  # get 60 bytes from message (page_data is now len(60) )
-                ans = self.write_and_read(t37_read_2)  # get second section of data
-                page_data.extend(ans[2:])  # get 62 bytes from message (page_data is now len(122) )
-                ans = self.write_and_read(t37_read_3)  # get third section of data
-                end_index = page_size - len(page_data) + 2  # get the end index to read from in the line below
-                page_data.extend(ans[2:end_index])  # get enough bytes from message to make len(page_data) = page_size
-
-                # block gets the 16 bits and creates a binary value from them
-                rightmost_bits = bin(page_data[data_index])[2:]
-                leftmost_bits = bin(page_data[data_index + 1] << 8)[2:]
-                binary = bin(int(leftmost_bits, 2) + int(rightmost_bits, 2))[2:]
-
-                # handle cases where the binary representation is not 16 bits in length
-                if len(binary) < 16:
-                    zero_bits = ''
-                    for _ in range(16 - len(binary)):
-                        zero_bits += '0'
-                    binary = zero_bits + binary
-
-                # do the twos complement of the binary value (if neg)
-                twos_comp = twos_complement_to_decimal(binary)
-                ret_deltas[ret_deltas_index].append(twos_comp)  # save delta value
-                ret_deltas_index += 1  # iterate deltas index for appending to the list
-            self.write_and_read(t6_disable_debug)  # disable debug after getting all 9 point's data
-            time.sleep(sleep_sec)
-        return ret_deltas  # return list of 9 lists containing deltas for each respective point
-
-    def _t44_num_messages_to_read_atmel(self) -> int:
-        """
-        gets the number of messages to read from the T44 object
-        :return: integer representing the number of messages to read
-        """
-        whole_ans = self.write_and_read(self._t44_msg, 5000, debug=True)
-        ans = whole_ans[2]
-        return ans
-
-    def _write_and_read_atmel(self, message: np.ndarray, timeout=2000, debug=False) -> list:
-        """
-        writes a message to the device and handles any possible exceptions
-        :param message: message to send
-        :param timeout: timeout (ms)
-        :param debug: bool determining if debug data is output
-        :return: answer from write command in a list
-        """
-
-        self._device.write(0x02, message, timeout)
-        ans = arr_to_list(self._device.read(0x81, 64, timeout))
-        if ans[0] != 0 and ans[0] != 4:
-            if debug:
-                print("BAD 0 INDEX: " + str(ans[0]))
-            raise ZeroIndexInvalid("Index 0 of the response message is " + str(ans[0]))
-        return ans
+        self._check_capability(CAPABILITY_NODE_READ)
+        nodes = [(x + x_offset, y + y_offset) for y_offset in range(-radius, radius + 1)
+                 for x_offset in range(-radius, radius + 1)]
+        return self._driver.read_nodes(nodes, iterations, sleep_sec, page_size)
@@ -127,3 +127,12 @@ class SaveError(Error):
     def __init__(self, msg: str):
         self._message = msg
         super().__init__(self._message)
+
+
+class UnsupportedCapability(Error):
+    """
+    Raised when a touch controller is asked for something its driver doesn't support (EX: reading frames)
+    """
+    def __init__(self, msg: str):
+        self._message = msg
+        super().__init__(self._message)
@@ -0,0 +1,54 @@
+import functools
+import os
+import sys
+
+import pytest
+
+# the modules sit at the top of the repo rather than in a package
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import RobotController
+import TouchController
+from FisnarSimulator import FisnarSimulator
+
+
+@pytest.fixture(autouse=True)
+def cache_files(tmp_path, monkeypatch):
+    """
+    keeps the object table cache the tests write out of the repo
+    """
+    monkeypatch.setattr(TouchController, "load_object_table_cache",
+                        functools.partial(TouchController.load_object_table_cache,
+                                          filepath=str(tmp_path / "object_table_cache.json")))
+    monkeypatch.setattr(TouchController, "save_object_table_cache",
+                        functools.partial(TouchController.save_object_table_cache,
+                                          filepath=str(tmp_path / "object_table_cache.json")))
+    return tmp_path
+
+
+@pytest.fixture(autouse=True)
+def robot_port_cache(tmp_path, monkeypatch):
+    """
+    keeps the port the robot tests find the simulator on out of the repo
+    """
+    monkeypatch.setattr(RobotController, "find_robot_port",
+                        functools.partial(RobotController.find_robot_port,
+                                          cache_path=str(tmp_path / "last_robot_port.json")))
+    return tmp_path / "last_robot_port.json"
+
+
+@pytest.fixture
+def simulator():
+    if not sys.platform.startswith('linux'):
+        pytest.skip("the Fisnar simulator needs a Linux pseudo-terminal")
+    with FisnarSimulator() as sim:
+        yield sim
+
+
+@pytest.fixture
+def sim_robot(monkeypatch, simulator):
+    monkeypatch.setattr(RobotController, "serial_ports", lambda extra_ports=None: list(extra_ports or []))
+    robot = RobotController.RobotController(extra_ports=[simulator.port])
+    robot.set_speed_point_to_point(800)
+    yield robot
+    robot._serial_port.close()
@@ -0,0 +1,106 @@
+import numpy as np
+import pytest
+import usb.core
+
+from errors import InvalidInput
+from FixtureSampler import FixtureSampler
+from MaxTouchSimulator import SimulatedMaxTouchDevice
+import TestManager
+from TouchController import TouchController
+
+
+@pytest.fixture
+def devices():
+    # plugged in out of USB location order
+    return [SimulatedMaxTouchDevice(num_x_nodes=8, num_y_nodes=6, noise_model='none', seed=seed, port_numbers=ports)
+            for seed, ports in [(1, (3,)), (2, (1, 2)), (3, (1,))]]
+
+
+@pytest.fixture
+def found_devices(devices, monkeypatch):
+    """
+    makes usb.core.find return the simulated devices
+    """
+    def find(find_all=False, **kwargs):
+        return iter(devices) if find_all else devices[0]
+
+    monkeypatch.setattr(usb.core, "find", find)
+    return devices
+
+
+def fail(*args, **kwargs):
+    raise usb.core.USBError("device unplugged")
+
+
+def test_slots_in_usb_location_order(devices):
+    sampler = FixtureSampler([TouchController(device=device) for device in devices])
+    assert sampler.get_slots() == [0, 1, 2]
+    assert [sampler.get_touch_controller(slot).get_usb_location() for slot in range(3)] == \
+        [(1, (1,)), (1, (1, 2)), (1, (3,))]
+
+
+def test_named_slots(devices):
+    touch_controllers = [TouchController(device=device) for device in devices]
+    sampler = FixtureSampler(touch_controllers, {"left": (1, [3]), "right": (1, (1,))})
+    assert sampler.get_slots() == ["left", "right"]
+    assert sampler.get_touch_controller("left") is touch_controllers[0]
+    with pytest.raises(InvalidInput):
+        FixtureSampler(touch_controllers, {"middle": (2, (1,))})
+
+
+def test_each_slot_gets_its_own_stream(devices):
+    sampler = FixtureSampler([TouchController(device=device) for device in devices])
+    sampler.start_delta_frames(iterations=4)
+    samples = sampler.collect()
+    assert not sampler.is_sampling()
+    assert sampler.get_errors() == dict()
+    for slot, device in zip([2, 1, 0], devices):
+        assert len(samples[slot]) == 4
+        for timestamp, frame in samples[slot]:
+            np.testing.assert_array_equal(frame, device.baseline)
+        timestamps = [timestamp for timestamp, frame in samples[slot]]
+        assert timestamps == sorted(timestamps)
+
+
+def test_failing_slot_does_not_stop_the_fixture(devices, monkeypatch):
+    sampler = FixtureSampler([TouchController(device=device) for device in devices])
+    monkeypatch.setattr(devices[1], "write", fail)
+    sampler.start_delta_frames(iterations=3)
+    samples = sampler.collect()
+    assert list(sampler.get_errors()) == [1]
+    assert isinstance(sampler.get_errors()[1], usb.core.USBError)
+    assert samples[1] == []
+    assert len(samples[0]) == len(samples[2]) == 3
+
+
+def test_stop_ends_every_stream(devices):
+    sampler = FixtureSampler([TouchController(device=device) for device in devices])
+    streams = sampler.start(lambda tc: tc.get_delta_at(0, 0), interval=.001)
+    with pytest.raises(RuntimeError):
+        sampler.start(lambda tc: None)
+    sampler.stop()
+    for stream in streams.values():
+        items = list()
+        while not stream.empty():
+            items.append(stream.get())
+        assert items[-1] is None
+
+
+def test_from_fixture_reuses_known_controllers(found_devices):
+    known = TouchController(device=found_devices[0])
+    sampler = FixtureSampler.from_fixture(known=[known])
+    assert sampler.get_touch_controller(2) is known
+    assert all(sampler.get_touch_controller(slot).get_touch_controller_type() == "Microchip ATMXT1066T2"
+               for slot in sampler.get_slots())
+
+
+def test_fixture_noise_test(found_devices, monkeypatch):
+    test_manager = TestManager.TestManager(None, TouchController(device=found_devices[0]))
+    assert test_manager.get_fixture_slots() == dict()
+    assert test_manager.fixture_noise_test(num_frames=5) == {0: 0, 1: 0, 2: 0}  # the simulator has no noise
+    assert test_manager.get_fixture_slots()[2] == (1, (3,))
+
+    monkeypatch.setattr(found_devices[2], "write", fail)
+    results = test_manager.fixture_noise_test(num_frames=5)
+    assert results[1] == results[2] == 0
+    assert isinstance(results[0], usb.core.USBError)
@@ -0,0 +1,61 @@
+import numpy as np
+import pytest
+import usb.core
+
+from MaxTouchSimulator import SIMULATED_OBJECTS, SimulatedMaxTouchDevice, object_table_crc
+from TouchController import INFO_BLOCK_SIZE, OBJECT_ENTRY_SIZE, read_command, write_command
+
+
+def transact(device, message):
+    """
+    :return: response of the device to a message
+    """
+    device.write(0x02, message)
+    return device.read(0x81, 64)
+
+
+def test_object_table_crc():
+    device = SimulatedMaxTouchDevice(num_x_nodes=12, num_y_nodes=9)
+    size = INFO_BLOCK_SIZE + len(SIMULATED_OBJECTS) * OBJECT_ENTRY_SIZE
+    block = bytearray()
+    while len(block) < size + 3:
+        block.extend(transact(device, read_command(len(block), 62))[2:])
+    assert block[4:6] == bytes([12, 9])
+    assert int.from_bytes(block[size:size + 3], 'little') == object_table_crc(block[:size])
+
+
+def read_deltas(device):
+    """
+    :return: deltas on the first T37 page of a new capture
+    """
+    transact(device, write_command(0x0194 + 5, [0x10]))  # T6 diagnostic, capture deltas
+    return np.frombuffer(bytes(transact(device, read_command(0x0106 + 2, 60))[2:62]), dtype='<i2')
+
+
+def test_noise_models():
+    quiet = SimulatedMaxTouchDevice(noise_model='none')
+    np.testing.assert_array_equal(read_deltas(quiet), quiet.baseline.flatten()[:30])
+    noisy = SimulatedMaxTouchDevice(noise_model='uniform', noise=3)
+    deltas = [read_deltas(noisy) for _ in range(2)]
+    assert np.any(deltas[0] != deltas[1])
+    assert np.all(np.abs(deltas[0] - noisy.baseline.flatten()[:30]) <= 3)
+    with pytest.raises(ValueError):
+        SimulatedMaxTouchDevice(noise_model='pink')
+
+
+def test_reset_restores_configuration():
+    device = SimulatedMaxTouchDevice()
+    t7 = 0x019A
+    transact(device, write_command(t7, [0xFF, 0xFF, 0xFF]))
+    assert transact(device, read_command(t7, 3))[2:5].tolist() == [0xFF, 0xFF, 0xFF]
+    transact(device, write_command(0x0194, [0x01]))  # T6 reset
+    assert transact(device, read_command(t7, 3))[2:5].tolist() == [32, 10, 50]
+
+
+def test_timed_out_response_arrives_late():
+    device = SimulatedMaxTouchDevice(timeout_rate=1.0)
+    device.write(0x02, read_command(4, 2))
+    with pytest.raises(usb.core.USBTimeoutError):
+        device.read(0x81, 64)
+    device.timeout_rate = 0
+    assert device.read(0x81, 64)[2:4].tolist() == [32, 20]
@@ -0,0 +1,214 @@
+import os
+import sys
+import time
+
+import pytest
+
+import RobotController
+from FisnarSimulator import FisnarSimulator, axis_profile
+
+
+class ScriptedPort:
+    """
+    serial port that answers readline with scripted lines, then times out like the robot's port does
+    """
+
+    def __init__(self, lines, timeout=.2, delay=0.0):
+        self.lines = list(lines)
+        self.timeout = timeout
+        self.delay = delay  # seconds before each line arrives
+        self.written = list()
+
+    def readline(self):
+        if self.lines:
+            time.sleep(self.delay)
+            return self.lines.pop(0)
+        time.sleep(self.timeout)
+        return b''
+
+    def reset_input_buffer(self):
+        pass
+
+    def write(self, data):
+        self.written.append(data)
+        return len(data)
+
+
+@pytest.fixture
+def robot(monkeypatch):
+    # only the simulator's port is checked, so the tests never talk to a real device
+    monkeypatch.setattr(RobotController, "serial_ports", lambda extra_ports=None: list(extra_ports or []))
+    return RobotController.RobotController()
+
+
+def test_read_coords_skips_earlier_acks(robot):
+    robot._serial_port = ScriptedPort([b'ok\r\n', b'ok\r\n', b'ok\r\n', b'80,90,65.3985\r\n', b'ok\r\n', b'ok\r\n'])
+    start = time.monotonic()
+    assert robot._read_coords_fisnar() == (80, 90, 65.3985)
+    assert time.monotonic() - start < robot._serial_port.timeout  # returned on the ack, not the serial timeout
+    assert robot._serial_port.lines == [b'ok\r\n']
+
+
+def test_read_coords_without_trailing_ack(robot):
+    robot._serial_port = ScriptedPort([b'30,30,50\r\n'])
+    assert robot._read_coords_fisnar() == (30, 30, 50)
+
+
+def test_read_coords_no_answer(robot):
+    robot._serial_port = ScriptedPort([b'ok\r\n'])
+    assert robot._read_coords_fisnar() == (-1, -1, -1)
+
+
+def test_read_coords_garbage(robot):
+    robot._serial_port = ScriptedPort([b'ok\r\n', b'30,thirty\r\n', b'ok\r\n'])
+    assert robot._read_coords_fisnar() is None
+
+
+def test_read_coords_timeout(robot):
+    robot._serial_port = ScriptedPort([b'ok\r\n'] * 100, delay=.01)  # a port that keeps acking
+    start = time.monotonic()
+    assert robot._read_coords_fisnar(timeout=.1) == (-1, -1, -1)
+    assert time.monotonic() - start < .5
+
+
+def test_get_current_coords_doesnt_wait_for_serial_timeout(sim_robot, simulator):
+    sim_robot.get_current_coords()  # the first answer includes the port opening
+    start = time.monotonic()
+    for _ in range(10):
+        assert sim_robot.get_current_coords() == (0, 0, 0)
+    # the port times out after a second, a reader waiting for it would take at least 10 seconds
+    assert time.monotonic() - start < 1
+    assert simulator.commands.count("PA") >= 10
+
+
+def test_motion_model_upper_bound():
+    model = RobotController.MotionModel()
+    start, goal = (0, 0, 0), (100, 0, 0)
+    predicted = model.predict(start, goal)
+    model.record(start, goal, predicted * 2, is_upper_bound=True)  # it may have been on time
+    assert model.get_acceleration() == RobotController.DEFAULT_ACCELERATION
+    model.record(start, goal, predicted / 2, is_upper_bound=True)  # it can't have been on time
+    assert model.get_acceleration() > RobotController.DEFAULT_ACCELERATION
+    assert len(model.get_move_log()) == 2
+
+
+@pytest.mark.skipif(not sys.platform.startswith('linux'), reason="the Fisnar simulator needs a Linux pseudo-terminal")
+@pytest.mark.parametrize("acceleration", [400, 4000])
+def test_motion_model_calibrates_to_simulator(monkeypatch, acceleration):
+    monkeypatch.setattr(RobotController, "serial_ports", lambda extra_ports=None: list(extra_ports or []))
+    with FisnarSimulator(acceleration=acceleration, speed=800) as simulator:
+        robot = RobotController.RobotController(extra_ports=[simulator.port])
+        robot.set_speed_point_to_point(800)
+        robot.move(10, 10, 5)
+        for i in range(5):
+            robot.move(30 if i % 2 == 0 else 10, 10, 5)
+        robot._serial_port.close()
+    # the simulator's own speed profile, plus the time it takes to hear the move and start it
+    actual = axis_profile(20, 800, acceleration)[2] + simulator.start_delay
+    model = robot.get_motion_model()
+    log = model.get_move_log()
+    assert len(log) == 5
+    if acceleration < RobotController.DEFAULT_ACCELERATION:
+        # the robot arrives after the sleep, so the polls time it without the sleep or the poll's round trip
+        assert all(abs(measured - actual) < .05 for _, _, measured in log)
+        assert acceleration <= model.get_acceleration() < .8 * RobotController.DEFAULT_ACCELERATION
+    else:
+        # the robot is already there when it's first polled, which only bounds the move time
+        assert all(measured >= actual for _, _, measured in log)
+        assert model.get_acceleration() > RobotController.DEFAULT_ACCELERATION
+    assert abs(log[-1][1] - actual) < abs(log[0][1] - actual)  # the predictions move towards the simulator
+
+
+def test_tap_confirms_each_press_and_the_last_lift(sim_robot, simulator):
+    sim_robot.move(50, 50, 40)
+    heights = list()
+    polls = simulator.commands.count("PA")
+    results = sim_robot.tap(50, 50, 45, 40, hold_s=.05, count=3,
+                            on_tap=lambda: heights.append(simulator.get_position()[2]) or len(heights))
+    assert results == [1, 2, 3]
+    # each touch is read once it has been held, before its lift is confirmed
+    assert all(height > 40 for height in heights)
+    assert simulator.commands.count("MA 50,50,45") == 3
+    assert simulator.commands.count("MA 50,50,40") == 4  # hover, then a lift after every touch
+    # a press or the final lift is confirmed with as little as one poll each
+    assert simulator.commands.count("PA") - polls < 3 * 4
+    assert not simulator.is_moving()
+    assert simulator.get_position() == pytest.approx((50, 50, 40))
+
+
+def test_tap_without_on_tap(sim_robot, simulator):
+    assert sim_robot.tap(20, 20, 45, 40, count=2) == list()
+    assert simulator.commands.count("MA 20,20,45") == 2
+    assert simulator.get_position() == pytest.approx((20, 20, 40))
+
+
+def test_tap_keeps_coordinates_in_range_like_move(sim_robot, simulator):
+    sim_robot.move(-5, 400, 120, is_continuous=False)
+    sim_robot.tap(-5, 400, 120, 40)
+    moves = [command for command in simulator.commands if command.startswith("MA")]
+    assert moves == ["MA 0,300,100", "MA 0,300,40", "MA 0,300,100", "MA 0,300,40"]
+
+
+@pytest.fixture
+def silent_port():
+    """
+    port with nothing on the other end to answer
+    """
+    if not sys.platform.startswith('linux'):
+        pytest.skip("the silent port needs a Linux pseudo-terminal")
+    master, slave = os.openpty()
+    yield os.ttyname(slave)
+    os.close(master)
+    os.close(slave)
+
+
+def test_last_port_cache(tmp_path):
+    cache_path = str(tmp_path / "port.json")
+    assert RobotController.load_last_port(cache_path) is None
+    RobotController.save_last_port("/dev/ttyUSB3", cache_path)
+    assert RobotController.load_last_port(cache_path) == "/dev/ttyUSB3"
+    (tmp_path / "port.json").write_text("not json")
+    assert RobotController.load_last_port(cache_path) is None
+
+
+def test_probe_robot_port(simulator, silent_port):
+    assert RobotController.probe_robot_port(simulator.port)
+    assert "PA" in simulator.commands
+    assert not RobotController.probe_robot_port(silent_port, timeout=.1)
+    assert not RobotController.probe_robot_port("/dev/no_such_port", timeout=.1)
+
+
+def test_find_robot_port_caches_the_port(simulator, silent_port, robot_port_cache):
+    assert RobotController.find_robot_port([silent_port, simulator.port], timeout=.2) == simulator.port
+    assert RobotController.load_last_port(str(robot_port_cache)) == simulator.port
+
+
+def test_find_robot_port_tries_the_cached_port_first(simulator, silent_port, robot_port_cache, monkeypatch):
+    RobotController.save_last_port(simulator.port, str(robot_port_cache))
+    probed = list()
+    probe_robot_port = RobotController.probe_robot_port
+    monkeypatch.setattr(RobotController, "probe_robot_port",
+                        lambda port, timeout: probed.append(port) or probe_robot_port(port, timeout))
+    assert RobotController.find_robot_port([silent_port, simulator.port], timeout=.2) == simulator.port
+    assert probed == [simulator.port]
+
+
+def test_find_robot_port_falls_back_when_cached_port_is_gone(simulator, silent_port, robot_port_cache):
+    RobotController.save_last_port(silent_port, str(robot_port_cache))
+    assert RobotController.find_robot_port([silent_port, simulator.port], timeout=.2) == simulator.port
+    assert RobotController.load_last_port(str(robot_port_cache)) == simulator.port
+
+
+def test_find_robot_port_without_robot(silent_port, robot_port_cache):
+    start = time.monotonic()
+    assert RobotController.find_robot_port([silent_port], timeout=.2) is None
+    assert time.monotonic() - start < 1
+    assert not robot_port_cache.exists()
+    assert RobotController.find_robot_port([]) is None
+
+
+def test_constructor_binds_to_the_robot(monkeypatch, simulator, silent_port):
+    monkeypatch.setattr(RobotController, "serial_ports", lambda extra_ports=None: [silent_port, simulator.port])
+    robot = RobotController.RobotController()
+    assert robot.get_current_com_port() == simulator.port
+    robot._serial_port.close()
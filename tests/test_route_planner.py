@@ -0,0 +1,49 @@
+import itertools
+import random
+
+import pytest
+
+from DXFReader import Point
+from RoutePlanner import nearest_neighbour_route, plan_route, route_length, two_opt
+
+
+def test_route_length():
+    points = [(0, 0), (3, 4), (3, 0)]
+    assert route_length(points, [0, 1, 2]) == pytest.approx(9)
+    assert route_length(points, [1, 2], start=(0, 0)) == pytest.approx(9)
+    assert route_length(points, []) == 0
+
+
+def test_nearest_neighbour_route():
+    points = [(10, 0), (1, 0), (5, 0)]
+    assert nearest_neighbour_route(points) == [0, 2, 1]  # starts at the first point without a start
+    assert nearest_neighbour_route(points, start=(0, 0)) == [1, 2, 0]
+
+
+def test_two_opt_untangles_crossing():
+    # visiting the corners of a square diagonally crosses the route over itself
+    points = [(0, 0), (10, 10), (10, 0), (0, 10)]
+    route = two_opt(points, [0, 1, 2, 3], start=(0, 0))
+    assert route[0] == 0
+    assert route_length(points, route, (0, 0)) == pytest.approx(30)
+
+
+def test_two_opt_keeps_a_route_without_start():
+    points = [(0, 0), (1, 0), (2, 0)]
+    assert route_length(points, two_opt(points, [1, 0, 2])) == pytest.approx(2)
+
+
+def test_plan_route_is_short():
+    rng = random.Random(7)
+    points = [Point(rng.uniform(0, 100), rng.uniform(0, 100)) for _ in range(7)]
+    route = plan_route(points, start=(0, 0))
+    assert sorted(route) == list(range(len(points)))
+
+    best = min(route_length(points, order, (0, 0)) for order in itertools.permutations(range(len(points))))
+    assert route_length(points, route, (0, 0)) <= route_length(points, nearest_neighbour_route(points, (0, 0)),
+                                                               (0, 0))
+    assert route_length(points, route, (0, 0)) <= best * 1.1
+
+
+def test_plan_route_empty():
+    assert plan_route([]) == []
@@ -0,0 +1,52 @@
+import pytest
+
+from SurfaceMap import SurfaceMap, grid_values
+
+
+def plane(x, y):
+    return 50 + .02 * x - .01 * y
+
+
+@pytest.fixture
+def surface_map():
+    x_values = grid_values(0, 150, 3, .1)
+    y_values = grid_values(0, 100, 3, .1)
+    return SurfaceMap(x_values, y_values, [[plane(x, y) for y in y_values] for x in x_values])
+
+
+def test_grid_values():
+    assert grid_values(0, 10, 3) == pytest.approx([0, 5, 10])
+    assert grid_values(0, 10, 3, .1) == pytest.approx([1, 5, 9])
+    assert grid_values(0, 10, 1) == pytest.approx([5])
+
+
+def test_get_height_interpolates(surface_map):
+    # bilinear interpolation of a plane is exact anywhere on the grid
+    for x, y in [(15, 10), (75, 50), (100, 33), (135, 90)]:
+        assert surface_map.get_height(x, y) == pytest.approx(plane(x, y))
+
+
+def test_get_height_off_grid_uses_edge(surface_map):
+    assert surface_map.get_height(0, 0) == pytest.approx(plane(15, 10))
+    assert surface_map.get_height(200, 50) == pytest.approx(plane(135, 50))
+
+
+def test_get_range(surface_map):
+    assert surface_map.get_range() == pytest.approx((plane(15, 90), plane(135, 10)))
+
+
+def test_get_grid_is_a_copy(surface_map):
+    x_values, y_values, heights = surface_map.get_grid()
+    heights[0][0] = 0
+    assert surface_map.get_grid()[2][0][0] == pytest.approx(plane(15, 10))
+
+
+def test_single_point_grid():
+    assert SurfaceMap([5], [5], [[42]]).get_height(100, -3) == 42
+
+
+def test_heights_must_match_grid():
+    with pytest.raises(ValueError):
+        SurfaceMap([0, 1], [0, 1], [[0, 0]])
+    with pytest.raises(ValueError):
+        SurfaceMap([0, 1], [0, 1], [[0, 0], [0]])
@@ -0,0 +1,139 @@
+import pytest
+
+import ExcelSaver
+import errors
+import TestManager
+from DXFReader import Point
+from MaxTouchSimulator import SimulatedMaxTouchDevice
+from SurfaceMap import SurfaceMap
+from TouchController import TouchController
+
+
+@pytest.fixture
+def device():
+    return SimulatedMaxTouchDevice(num_x_nodes=12, num_y_nodes=9, noise_model='none')
+
+
+@pytest.fixture
+def test_manager(device):
+    return TestManager.TestManager(None, TouchController(device=device))
+
+
+def test_results_report_reset_latencies(device, test_manager, tmp_path, monkeypatch):
+    device.reset_time = .02
+    test_manager.reset_touch_controller()
+    latencies = test_manager.get_reset_latencies()
+    assert len(latencies) == 2  # the constructor resets the controller too
+    assert latencies[-1] >= .02
+
+    written = dict()
+    save_final_sheet = ExcelSaver.ExcelSaver.save_final_sheet
+
+    def record(self, book, **kwargs):
+        written.update(kwargs)
+        save_final_sheet(self, book, **kwargs)
+
+    monkeypatch.setattr(ExcelSaver.ExcelSaver, "save_final_sheet", record)
+    test_manager.save_results(str(tmp_path / "results.xls"), "sensor", "config")
+    assert written['reset_latencies'] == latencies
+    assert (tmp_path / "results.xls").exists()
+
+
+def test_snr_read_deltas_needs_a_delta_read(test_manager, monkeypatch):
+    monkeypatch.setattr(test_manager.touch_controller, "has_capability", lambda capability: False)
+    with pytest.raises(errors.UnsupportedCapability):
+        test_manager.snr_read_deltas(4, 4, 1)
+
+
+class ParkedRobot:
+    """
+    robot that stays where it is
+    """
+
+    def get_position(self):
+        return 100, 100, 40
+
+
+def test_plan_touch_route_maps_back_to_points(test_manager):
+    test_manager.robot_controller = ParkedRobot()
+    point_groups = [[Point(0, 0), Point(100, 90)], [Point(50, 50)]]
+    # starts next to the robot, and keeps which group and point each stop is
+    assert test_manager.plan_touch_route(point_groups) == [(0, 1), (1, 0), (0, 0)]
+    assert test_manager.plan_touch_route([[], []]) == list()
+
+
+class ActiveArea:
+    """
+    active area of a DXF with only its corners
+    """
+
+    def get_points(self):
+        return [Point(0, 0), Point(100, 0), Point(100, 50), Point(0, 50)]
+
+
+class PartDrawing:
+    """
+    DXF reader that only knows the part's active area
+    """
+
+    def get_active_area(self):
+        return ActiveArea()
+
+
+@pytest.fixture
+def surface_manager(device, sim_robot, test_manager, monkeypatch):
+    """
+    test manager driving the simulated robot over a part that the simulated touch controller sees the finger
+    reach at a height of 37 mm on its left half and 38 mm on its right half
+    """
+    monkeypatch.setattr(TestManager, "SURFACE_PROBE_SETTLE", 0)
+    move = sim_robot.move
+
+    def move_onto_part(x, y, z, *args, **kwargs):
+        moved = move(x, y, z, *args, **kwargs)
+        if z >= (37 if x < 50 else 38):
+            device.inject_touch(100, 100, num_reports=1)
+        return moved
+
+    monkeypatch.setattr(sim_robot, "move", move_onto_part)
+    test_manager.robot_controller = sim_robot
+    test_manager.set_dxf_reader(PartDrawing())
+    test_manager.set_z_start(40)
+    return test_manager
+
+
+def probed_heights(simulator) -> list:
+    """
+    :return: Z coordinate of every absolute move sent to the simulator
+    """
+    return [float(command.split(",")[2]) for command in simulator.commands if command.startswith("MA")]
+
+
+def test_surface_probe_stops_at_the_surface(surface_manager, simulator):
+    assert surface_manager.surface_probe(20, 20) == 37
+    assert surface_manager.surface_probe(80, 20) == 38
+    # lifts back to the hover height after each probe
+    assert probed_heights(simulator)[-1] == 40 - TestManager.Z_OFFSET
+
+
+def test_surface_probe_never_presses_past_the_z_start(surface_manager, simulator):
+    surface_manager.set_z_start(36)
+    with pytest.raises(errors.NoInputFromController):
+        surface_manager.surface_probe(20, 20)
+    heights = probed_heights(simulator)
+    assert max(heights) == 36
+    assert min(heights) == 36 - TestManager.Z_OFFSET
+
+
+def test_map_surface_sets_touch_heights(surface_manager, monkeypatch):
+    monkeypatch.setattr(TestManager, "SURFACE_PROBE_STEP", 1)  # still lands on both heights
+    # nothing is pressed relative to the surface until it is mapped
+    assert surface_manager.press_height(10, 5) == 40
+    assert surface_manager.hover_height(10, 5) == 40 - TestManager.Z_OFFSET
+
+    surface_map = surface_manager.map_surface(grid_size=2, press_depth=.5)
+    assert isinstance(surface_map, SurfaceMap)
+    assert surface_map.get_range() == (37, 38)
+    assert surface_manager.press_height(10, 5) == 37.5
+    assert surface_manager.press_height(90, 45) == 38.5
+    assert surface_manager.hover_height(10, 5) == 37 - surface_manager.get_hover_clearance()
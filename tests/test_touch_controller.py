@@ -0,0 +1,611 @@
+import json
+import threading
+import time
+
+import numpy as np
+import pytest
+import usb.core
+
+import TouchController as TouchController_module
+from errors import InvalidInput, NoInputFromController, ReadFailError, UnsupportedCapability, ZeroIndexInvalid
+from MaxTouchSimulator import SimulatedMaxTouchDevice
+from TouchController import (CAPABILITY_FRAME_READ, CAPABILITY_NODE_READ, MAX_BACKOFF, MAX_USB_TIMEOUT,
+                             MIN_USB_TIMEOUT, RETRY_BACKOFF, T37_DELTA_MODE, T37_PAGE_DOWN, T37_PAGE_UP,
+                             T37_REFERENCE_MODE, T37_SIGNAL_MODE, TOUCH_REPORT_DTYPE, T37Navigator, TouchController,
+                             TouchDriver, TouchReportBuffer, TransportPolicy, decode_t37_page, decode_t5_messages,
+                             load_frame_stream, read_command, register_touch_driver, twos_complement_to_decimal,
+                             write_command)
+
+# addresses of the simulated controller's T6 diagnostic byte and T37 object
+T6_DIAGNOSTIC = 0x0194 + 5
+T37_ADDRESS = 0x0106
+T37_SIZE = 130
+# report IDs and message size of the T100 messages used by the decoder tests
+STATUS_REPORT_ID = 40
+FIRST_TOUCH_ID = 42
+MESSAGE_SIZE = 10
+
+
+def reports(first, last):
+    """
+    :return: touch reports with the x values first to last - 1
+    """
+    ret = np.zeros(last - first, dtype=TOUCH_REPORT_DTYPE)
+    ret['x'] = np.arange(first, last)
+    return ret
+
+
+def t5_message(report_id, event, x, y, amplitude=30, area=12):
+    """
+    :return: T5 response holding one T100 message
+    """
+    return bytes([0x00, MESSAGE_SIZE, report_id, 0x80 | event, x & 0xFF, x >> 8, y & 0xFF, y >> 8,
+                  amplitude, area, 0, 0])
+
+
+def transact(device, message):
+    """
+    :return: response of the device to a message
+    """
+    device.write(0x02, message)
+    return device.read(0x81, 64)
+
+
+class PointDriver(TouchDriver):
+    """
+    driver for a controller that only reports touch points
+    """
+
+    def clear_buffer(self):
+        pass
+
+    def get_range(self, debug=False):
+        return 100, 100
+
+    def get_touch_coordinate(self):
+        return [10, 20]
+
+    def num_messages_to_read(self):
+        return 0
+
+    def read_reports(self):
+        return reports(0, 1)
+
+    def read_touch_point(self, num_messages_to_read, debug=False):
+        return [10, 20]
+
+    def reset(self):
+        return .001
+
+    def write_and_read(self, message, timeout=None, debug=False):
+        return memoryview(bytes(64))
+
+
+class RecordingTransport:
+    """
+    write_and_read for a T37Navigator that records every message sent to the device
+    """
+
+    def __init__(self, device):
+        self.device = device
+        self.messages = list()
+
+    def __call__(self, message, timeout=None, debug=False):
+        self.messages.append(bytes(message))
+        return transact(self.device, message)
+
+    def count(self, value):
+        """
+        :return: number of messages that wrote a value to the diagnostic byte
+        """
+        return self.messages.count(bytes(write_command(T6_DIAGNOSTIC, [value])))
+
+
+@pytest.fixture
+def device():
+    return SimulatedMaxTouchDevice(num_x_nodes=12, num_y_nodes=9, noise_model='none', seed=3)
+
+
+@pytest.fixture
+def touch_controller(device):
+    return TouchController(device=device)
+
+
+def test_decode_t37_page_little_endian():
+    page = np.array([-2, 300, 0, 32767, -32768], dtype='<i2').tobytes()
+    np.testing.assert_array_equal(decode_t37_page(page), [-2, 300, 0, 32767, -32768])
+    np.testing.assert_array_equal(decode_t37_page(bytearray(b'\x34\x12'), '<u2'), [0x1234])
+    np.testing.assert_array_equal(decode_t37_page([0xFE, 0xFF]), [-2])  # list of ints from an old response
+
+
+def test_decode_t37_page_matches_bit_strings():
+    page = bytes(np.random.RandomState(1).randint(0, 256, 128, dtype=np.uint8))
+    expected = [twos_complement_to_decimal(format(page[i + 1], '08b') + format(page[i], '08b'))
+                for i in range(0, len(page), 2)]
+    np.testing.assert_array_equal(decode_t37_page(page), expected)
+
+
+def test_delta_frame_shape(device, touch_controller):
+    frame = touch_controller.get_delta_frame()
+    assert frame.shape == (12, 9)
+    assert frame.dtype == np.int16
+    np.testing.assert_array_equal(frame, device.baseline)  # without noise the deltas are the baseline
+
+
+def test_delta_frame_matches_single_nodes(touch_controller):
+    touch_controller.update_number_of_nodes(12, 9)
+    frame = touch_controller.get_delta_frame()
+    for x, y in [(0, 0), (5, 7), (11, 8)]:
+        assert touch_controller.get_delta_at(x, y) == frame[x, y]
+
+
+def test_delta_frame_shows_touch(device, touch_controller):
+    device.inject_touch(100, 100, node=(4, 6), num_reports=1)
+    frame = touch_controller.get_delta_frame()
+    assert np.unravel_index(np.argmax(frame), frame.shape) == (4, 6)
+
+
+def test_burst_read_gets_every_message(device, touch_controller):
+    num_reports = 50  # more than fit in one transaction
+    device.inject_touch(321, 654, num_reports=num_reports)
+    transactions = device.transactions
+
+    reports = touch_controller.read_all_reports()
+    assert len(reports) == num_reports
+    assert reports['event'][0] == 4 and reports['event'][-1] == 5  # DOWN first, UP last
+    assert set(reports['x']) == {321} and set(reports['y']) == {654}
+    assert device.transactions - transactions < num_reports / 4  # several messages per transaction
+    assert len(touch_controller.read_all_reports()) == 0
+
+
+def test_burst_read_without_messages_is_one_transaction(device, touch_controller):
+    transactions = device.transactions
+    assert len(touch_controller.read_all_reports()) == 0
+    assert device.transactions - transactions == 1
+
+
+def test_report_buffer_wraps():
+    buffer = TouchReportBuffer(capacity=8)
+    buffer.extend(reports(0, 6))
+    assert list(buffer.drain()['x']) == list(range(6))
+    buffer.extend(reports(6, 10))  # wraps around the end of the storage
+    buffer.extend(reports(10, 12))
+    assert len(buffer) == 6
+    assert list(buffer.drain()['x']) == list(range(6, 12))
+    assert buffer.get_dropped() == 0
+    assert len(buffer.drain()) == 0
+
+
+def test_report_buffer_drops_oldest():
+    buffer = TouchReportBuffer(capacity=8)
+    buffer.extend(reports(0, 5))
+    buffer.extend(reports(5, 11))
+    assert buffer.get_dropped() == 3
+    assert list(buffer.drain()['x']) == list(range(3, 11))
+
+    buffer.extend(reports(0, 2))
+    buffer.extend(reports(100, 120))  # more than the capacity in one go
+    assert buffer.get_dropped() == 3 + 2 + 12
+    assert list(buffer.drain()['x']) == list(range(112, 120))
+
+    buffer.extend(reports(0, 4))
+    buffer.clear()
+    assert len(buffer.drain()) == 0
+
+
+def test_report_buffer_drain_waits():
+    buffer = TouchReportBuffer()
+    assert len(buffer.drain(timeout=.01)) == 0
+    threading.Timer(.01, buffer.extend, (reports(0, 1),)).start()
+    assert list(buffer.drain(timeout=2)['x']) == [0]
+
+
+def test_background_reader(device, touch_controller):
+    touch_controller.start_background_reader()
+    try:
+        assert touch_controller.is_background_reading()
+        device.hold_touch(1000, 2000)
+        assert touch_controller.get_touch_coordinate() == [1000, 2000]
+        device.release_touch()
+        touch_controller.clear_buffer()
+        device.inject_touch(5, 6, num_reports=3)
+        points = list()
+        deadline = time.monotonic() + 2
+        while len(points) < 3 and time.monotonic() < deadline:
+            points.extend(touch_controller.read_all_points())
+        assert [(point[0], point[1]) for point in points] == [(5, 6)] * 3
+    finally:
+        touch_controller.stop_background_reader()
+    assert not touch_controller.is_background_reading()
+
+    device.inject_touch(7, 8, num_reports=2)  # read straight from the controller again
+    assert len(touch_controller.read_all_reports()) == 2
+
+
+def test_background_reader_error_is_raised(device, touch_controller, monkeypatch):
+    touch_controller.start_background_reader()
+
+    def write(*args, **kwargs):
+        raise usb.core.USBError("device unplugged")
+
+    monkeypatch.setattr(device, "write", write)
+    with pytest.raises(usb.core.USBError):
+        deadline = time.monotonic() + 2
+        while time.monotonic() < deadline:
+            touch_controller.read_all_reports()
+    assert not touch_controller.is_background_reading()
+
+
+def test_object_table_is_cached(cache_files):
+    first = SimulatedMaxTouchDevice(num_x_nodes=12, num_y_nodes=9)
+    TouchController(device=first)
+    with open(str(cache_files / "object_table_cache.json")) as f:
+        cache = json.load(f)
+    assert len(cache) == 1
+    assert cache[next(iter(cache))]['T5'] == {'address': 0x0189, 'size': 11, 'instances': 1, 'first_report_id': 0,
+                                              'num_report_ids': 0}
+
+    second = SimulatedMaxTouchDevice(num_x_nodes=12, num_y_nodes=9)
+    TouchController(device=second)
+    assert second.transactions < first.transactions  # the object table wasn't read again
+
+
+def test_object_table_cache_is_keyed_by_panel(cache_files):
+    TouchController(device=SimulatedMaxTouchDevice(num_x_nodes=12, num_y_nodes=9))
+    other = SimulatedMaxTouchDevice(num_x_nodes=10, num_y_nodes=8)  # changes the information block CRC
+    touch_controller = TouchController(device=other)
+    with open(str(cache_files / "object_table_cache.json")) as f:
+        assert len(json.load(f)) == 2
+    assert touch_controller.get_delta_frame().shape == (10, 8)
+
+
+def test_corrupt_object_table_cache_is_ignored(cache_files):
+    (cache_files / "object_table_cache.json").write_text("{not json")
+    touch_controller = TouchController(device=SimulatedMaxTouchDevice(num_x_nodes=12, num_y_nodes=9))
+    assert touch_controller.get_delta_frame().shape == (12, 9)
+    with open(str(cache_files / "object_table_cache.json")) as f:
+        assert len(json.load(f)) == 1  # replaced by a readable cache
+
+
+def test_navigator_takes_shortest_path(device):
+    transport = RecordingTransport(device)
+    navigator = T37Navigator(transport, T6_DIAGNOSTIC, T37_ADDRESS, T37_SIZE)
+    pages = [decode_t37_page(navigator.read_page(page_num)) for page_num in (0, 1)]
+    np.testing.assert_array_equal(np.concatenate(pages)[:12 * 9], device.baseline.flatten())
+
+    navigator.read_page(0)
+    assert transport.count(T37_DELTA_MODE) == 1  # the mode stays enabled between reads
+    assert transport.count(T37_PAGE_UP) == 1
+    assert transport.count(T37_PAGE_DOWN) == 1
+    assert navigator.get_mode() == T37_DELTA_MODE
+
+
+def test_navigator_resyncs_after_leaving_mode(device):
+    transport = RecordingTransport(device)
+    navigator = T37Navigator(transport, T6_DIAGNOSTIC, T37_ADDRESS, T37_SIZE)
+    navigator.capture(T37_REFERENCE_MODE)
+    transact(device, write_command(T6_DIAGNOSTIC, [0x00]))  # disabled behind the navigator's back
+
+    page = decode_t37_page(navigator.read_page(1), '<u2')
+    np.testing.assert_array_equal(page[:12 * 9 - 64], device.references.flatten()[64:])
+    assert transport.count(T37_REFERENCE_MODE) == 2
+
+
+def test_navigator_release(device):
+    transport = RecordingTransport(device)
+    navigator = T37Navigator(transport, T6_DIAGNOSTIC, T37_ADDRESS, T37_SIZE)
+    navigator.release()  # the mode is unknown, so it's disabled
+    navigator.release()
+    assert transport.count(0x00) == 1
+    navigator.read_page(1)
+    navigator.release()
+    assert transport.count(0x00) == 2
+    assert transact(device, read_command(T37_ADDRESS, 2))[2:4].tolist() == [0, 0]
+
+
+def test_failed_capture_is_released(device, touch_controller, monkeypatch):
+    def read_page(*args, **kwargs):
+        raise ReadFailError("page read failed")
+
+    monkeypatch.setattr(T37Navigator, "read_page", read_page)
+    touch_controller.update_number_of_nodes(12, 9)
+    for read in (touch_controller.get_delta_frame, lambda: touch_controller.nine_point_read(5, 5, 2, 0)):
+        with pytest.raises(ReadFailError):
+            read()
+        assert transact(device, read_command(T37_ADDRESS, 1))[2] == 0  # diagnostic mode was disabled
+
+
+def test_reset_polls_until_ready(device, touch_controller):
+    device.reset_time = .05
+    assert touch_controller.reset()
+    assert .05 <= touch_controller.get_reset_latencies()[-1] < 1
+    assert len(touch_controller.get_reset_latencies()) == 2
+
+
+def test_reset_times_out(device, touch_controller, monkeypatch):
+    monkeypatch.setattr(TouchController_module, "RESET_TIMEOUT", .05)
+    device.reset_time = 1
+    with pytest.raises(NoInputFromController):
+        touch_controller.reset()
+
+
+def test_decode_t5_messages():
+    messages = [t5_message(FIRST_TOUCH_ID, 4, 100, 200),
+                t5_message(STATUS_REPORT_ID, 0, 5, 5),  # screen status
+                t5_message(FIRST_TOUCH_ID + 1, 1, 0, 0),  # no coordinate
+                t5_message(FIRST_TOUCH_ID + 1, 5, 4095, 2559, amplitude=7, area=3)]
+    reports = decode_t5_messages(messages, STATUS_REPORT_ID, FIRST_TOUCH_ID, MESSAGE_SIZE, timestamp_ns=99)
+    assert list(reports['x']) == [100, 4095]
+    assert list(reports['y']) == [200, 2559]
+    assert list(reports['event']) == [4, 5]
+    assert list(reports['touch_id']) == [0, 1]
+    assert list(reports['amplitude']) == [30, 7]
+    assert list(reports['area']) == [12, 3]
+    assert set(reports['timestamp']) == {99}
+
+    array_reports = decode_t5_messages(np.frombuffer(b''.join(messages), dtype=np.uint8).reshape(4, -1),
+                                       STATUS_REPORT_ID, FIRST_TOUCH_ID, MESSAGE_SIZE, timestamp_ns=99)
+    np.testing.assert_array_equal(array_reports, reports)
+    assert len(decode_t5_messages([], STATUS_REPORT_ID, FIRST_TOUCH_ID, MESSAGE_SIZE)) == 0
+
+
+def test_read_all_points_matches_reports(device, touch_controller):
+    for i in range(4):
+        device.inject_touch(10 * i, 20 * i + 1, num_reports=1)
+    points = touch_controller.read_all_points()
+    assert [(point[0], point[1]) for point in points] == [(10 * i, 20 * i + 1) for i in range(4)]
+
+
+def test_transport_policy_timeout():
+    policy = TransportPolicy(p99_multiple=10)
+    for rtt in [.001] * 31:
+        policy.record(rtt)
+    assert policy.get_timeout() == 2000  # not enough round trips timed yet
+    policy.record(.001)
+    assert policy.get_timeout() == MIN_USB_TIMEOUT
+    for rtt in [.02] * 32:
+        policy.record(rtt)
+    assert policy.get_timeout() == 200  # 10 times the 99th percentile
+    for rtt in [.5] * 32:
+        policy.record(rtt)
+    assert policy.get_timeout() == MAX_USB_TIMEOUT
+    assert policy.get_stats()['round_trips'] == 96
+
+
+def test_transport_policy_backoff():
+    policy = TransportPolicy()
+    assert [policy.get_backoff(attempt) for attempt in range(3)] == pytest.approx(
+        [RETRY_BACKOFF, 2 * RETRY_BACKOFF, 4 * RETRY_BACKOFF])
+    assert policy.get_backoff(100) == MAX_BACKOFF
+
+    policy.count_retry(usb.core.USBTimeoutError("timed out"))
+    policy.count_retry(usb.core.USBTimeoutError("timed out"))
+    policy.count_failure(ZeroIndexInvalid("bad response"))
+    stats = policy.get_stats()
+    assert stats['retries'] == {'USBTimeoutError': 2}
+    assert stats['failures'] == {'ZeroIndexInvalid': 1}
+
+
+def test_frames_survive_timeouts(device, touch_controller):
+    device.timeout_rate = .2
+    for _ in range(64):
+        np.testing.assert_array_equal(touch_controller.get_delta_frame(), device.baseline)
+    assert touch_controller.get_transport_stats()['retries']['USBTimeoutError'] > 0
+    assert touch_controller.get_transport_stats()['failures'] == dict()
+
+
+def test_timed_out_messages_are_not_read_twice(device, touch_controller):
+    # reading the T5 object pops its messages, so sending a timed out read again would lose them
+    device.timeout_rate = .3
+    for i in range(100):
+        device.inject_touch(i + 1, 2 * i + 1, num_reports=1)
+    reports = np.concatenate([touch_controller.read_all_reports() for _ in range(20)])
+    assert list(reports['x']) == [i + 1 for i in range(100)]
+    assert list(reports['y']) == [2 * i + 1 for i in range(100)]
+
+
+def test_timeout_gives_up_without_sending_again(device, touch_controller, monkeypatch):
+    touch_controller._transport_policy.give_up_time = .05
+    device.timeout_rate = 1
+    transactions = device.transactions
+    start = time.monotonic()
+    with pytest.raises(usb.core.USBTimeoutError):
+        touch_controller.write_and_read(read_command(4, 2))
+    assert time.monotonic() - start < 1
+    assert device.transactions - transactions == 1
+    assert touch_controller.get_transport_stats()['failures'] == {'USBTimeoutError': 1}
+
+    # the late response is read and thrown away before the next message is sent
+    device.timeout_rate = 0
+    reads = list()
+    read = device.read
+    monkeypatch.setattr(device, "read", lambda *args: (reads.append(device.transactions), read(*args))[1])
+    assert touch_controller.write_and_read(read_command(4, 2))[2:4].tolist() == [12, 9]
+    assert reads == [transactions + 1, transactions + 2]
+    touch_controller.write_and_read(read_command(4, 2))
+    assert len(reads) == 3
+
+
+def test_bad_response_is_only_read_again_when_safe(device, touch_controller, monkeypatch):
+    bad_responses = list()
+    read = device.read
+
+    def read_bad_response(endpoint, buffer, timeout=None):
+        num_read = read(endpoint, buffer, timeout)
+        if bad_responses:
+            bad_responses.pop()
+            buffer[0] = 0x01
+        return num_read
+
+    monkeypatch.setattr(device, "read", read_bad_response)
+    bad_responses.append(True)
+    transactions = device.transactions
+    assert touch_controller.write_and_read(read_command(4, 2))[2:4].tolist() == [12, 9]
+    assert device.transactions - transactions == 2
+
+    device.inject_touch(5, 6, num_reports=1)
+    bad_responses.append(True)
+    transactions = device.transactions
+    with pytest.raises(ZeroIndexInvalid):
+        touch_controller.write_and_read(read_command(0x0189, 10))  # T5
+    assert device.transactions - transactions == 1
+
+
+def test_clear_buffer_drains_every_message(device, touch_controller):
+    device.inject_touch(10, 20, num_reports=60)
+    transactions = device.transactions
+    touch_controller.clear_buffer()
+    assert device.transactions - transactions <= 60 // 6  # six messages per transaction
+    assert touch_controller.num_messages_to_read() == 0
+    assert len(touch_controller.read_all_reports()) == 0
+
+
+def test_clear_buffer_empties_background_buffer(device, touch_controller):
+    touch_controller.start_background_reader()
+    try:
+        device.inject_touch(10, 20, num_reports=5)
+        deadline = time.monotonic() + 2
+        while touch_controller.num_messages_to_read() and time.monotonic() < deadline:
+            time.sleep(.001)
+        time.sleep(.01)  # let the reader put the reports in the buffer
+        touch_controller.clear_buffer()
+        assert len(touch_controller.read_all_reports()) == 0
+    finally:
+        touch_controller.stop_background_reader()
+
+
+def test_reference_and_signal_frames(device, touch_controller):
+    references = touch_controller.get_reference_frame()
+    assert references.dtype == np.uint16
+    np.testing.assert_array_equal(references, device.references)
+
+    device.inject_touch(100, 100, node=(3, 2), num_reports=1)
+    signals = touch_controller.get_signal_frame()
+    assert signals.dtype == np.uint16
+    # the signal is the reference minus the delta, so a touch lowers it
+    np.testing.assert_array_equal(references.astype(int) - signals, touch_controller.get_delta_frame())
+    assert references[3, 2] - signals[3, 2] > 200
+
+
+def test_stream_frames(device, touch_controller, tmp_path):
+    filepath = str(tmp_path / "frames.t37")
+    assert touch_controller.stream_frames(filepath, 5, 100) == 5
+    header, timestamps, frames = load_frame_stream(filepath)
+    assert header['mode'] == T37_DELTA_MODE
+    assert (header['x_nodes'], header['y_nodes']) == (12, 9)
+    assert header['frames_per_second'] == pytest.approx(100)
+    assert frames.shape == (5, 12, 9)
+    for frame in frames:
+        np.testing.assert_array_equal(frame, device.baseline)
+    # frames are scheduled 10 ms apart
+    assert np.all(np.diff(timestamps) > 5e6)
+
+    touch_controller.stream_frames(filepath, 2, 1000, mode=T37_SIGNAL_MODE)
+    header, timestamps, frames = load_frame_stream(filepath)
+    assert header['mode'] == T37_SIGNAL_MODE and frames.dtype == np.uint16
+    np.testing.assert_array_equal(frames[0], device.references - device.baseline)
+
+
+def test_load_frame_stream_checks_magic(tmp_path):
+    filepath = tmp_path / "frames.t37"
+    filepath.write_bytes(b'not a frame stream')
+    with pytest.raises(InvalidInput):
+        load_frame_stream(str(filepath))
+    filepath.write_bytes(b'')
+    with pytest.raises(InvalidInput):
+        load_frame_stream(str(filepath))
+
+
+def test_write_and_read_view_is_reused(touch_controller):
+    ans = touch_controller.write_and_read(read_command(4, 2))
+    kept = bytes(ans)
+    assert kept[2:4] == bytes([12, 9])
+    touch_controller.write_and_read(read_command(0x019A, 1))  # T7
+    assert bytes(ans) != kept  # overwritten by the next transaction, so callers copy what they keep
+    assert ans[2] == 32
+
+    # each thread has its own buffer
+    thread = threading.Thread(target=touch_controller.write_and_read, args=(read_command(4, 2),))
+    thread.start()
+    thread.join()
+    assert ans[2] == 32
+
+
+@pytest.fixture
+def point_controller(device, monkeypatch):
+    # registered into copies, so the driver doesn't leak into other tests
+    monkeypatch.setattr(TouchController_module, "TOUCH_DRIVERS", dict(TouchController_module.TOUCH_DRIVERS))
+    monkeypatch.setattr(TouchController_module, "CONTROLLER_IDS", dict(TouchController_module.CONTROLLER_IDS))
+    register_touch_driver("Point Controller", PointDriver, (0x1234, 0x5678))
+    return TouchController(device=device, controller_name="Point Controller")
+
+
+def test_register_touch_driver(point_controller):
+    assert point_controller.get_touch_controller_type() == "Point Controller"
+    assert TouchController_module.CONTROLLER_IDS["Point Controller"] == (0x1234, 0x5678)
+    assert point_controller.get_capabilities() == frozenset()
+    assert point_controller.get_touch_coordinate() == [10, 20]
+    assert point_controller.get_reset_latencies() == [.001]
+    assert len(point_controller.read_all_points()) == 1
+
+
+def test_unknown_touch_controller(device, touch_controller):
+    with pytest.raises(ValueError):
+        TouchController(device=device, controller_name="Unknown Controller")
+    with pytest.raises(ValueError):
+        touch_controller.set_touch_controller("Unknown Controller")
+    assert touch_controller.get_touch_controller_type() == "Microchip ATMXT1066T2"
+
+
+def test_unsupported_capabilities_raise(point_controller, tmp_path):
+    with pytest.raises(UnsupportedCapability):
+        point_controller.get_delta_frame()
+    with pytest.raises(UnsupportedCapability):
+        point_controller.get_delta_at(1, 1)
+    point_controller.update_number_of_nodes(12, 9)
+    with pytest.raises(UnsupportedCapability):
+        point_controller.nine_point_read(4, 4, 1, 0)
+    with pytest.raises(UnsupportedCapability):
+        point_controller.stream_frames(str(tmp_path / "frames.bin"), 1, 10)
+    with pytest.raises(UnsupportedCapability):
+        point_controller.start_background_reader()
+    with pytest.raises(UnsupportedCapability):
+        point_controller.start_raw_rate_mode()
+    assert not point_controller.is_background_reading()
+    assert not point_controller.is_raw_rate_mode()
+
+
+def test_advertised_capabilities_are_checked(device, monkeypatch):
+    class FrameDriver(PointDriver):
+        def __init__(self, device, transport_policy):
+            super().__init__(device, transport_policy)
+            self.capabilities = frozenset({CAPABILITY_FRAME_READ})
+
+    monkeypatch.setitem(TouchController_module.TOUCH_DRIVERS, "Frame Controller", FrameDriver)
+    with pytest.raises(UnsupportedCapability):
+        TouchController(device=device, controller_name="Frame Controller")
+
+
+def test_set_touch_controller_rebinds_driver(device, point_controller):
+    point_controller.set_touch_controller("Microchip ATMXT1066T2")
+    assert point_controller.has_capability(CAPABILITY_NODE_READ)
+    assert point_controller.get_delta_frame().shape == (12, 9)
+    point_controller.set_touch_controller("Point Controller")
+    with pytest.raises(UnsupportedCapability):
+        point_controller.get_delta_frame()
+
+
+def test_raw_rate_mode_saves_and_restores_settings(device, touch_controller):
+    movement = 0x06FC + 44  # T100 MOVFILTER
+    assert list(transact(device, read_command(0x019A, 3))[2:5]) == [32, 10, 50]
+    saved_movement = list(transact(device, read_command(movement, 7))[2:9])
+
+    touch_controller.start_raw_rate_mode()
+    assert touch_controller.is_raw_rate_mode()
+    assert list(transact(device, read_command(0x019A, 3))[2:5]) == [255, 255, 255]
+    assert list(transact(device, read_command(movement, 7))[2:9]) == [0] * 7
+
+    touch_controller.stop_raw_rate_mode()
+    assert not touch_controller.is_raw_rate_mode()
+    assert list(transact(device, read_command(0x019A, 3))[2:5]) == [32, 10, 50]
+    assert list(transact(device, read_command(movement, 7))[2:9]) == saved_movement